@@ -0,0 +1,15 @@
+"""Offline microbenchmarks of the tools' hot paths.
+
+They run from the repository root with ``python -m benchmarks``, outside the
+app's package. The app and the Google API fakes of the tests are put on the
+path here, the way pytest's ``pythonpath`` setting does for the tests.
+"""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for _path in (os.path.join(_ROOT, "tests"), os.path.join(_ROOT, "src", "aura")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
@@ -0,0 +1,138 @@
+"""Run the microbenchmarks: ``python -m benchmarks`` from the repository root.
+
+Every case runs offline against generated (or recorded) API payloads. Pass
+``--json`` to save the results and ``--compare`` to fail when a case got
+slower than a saved baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import timeit
+from typing import Dict, List, Optional
+
+from fakes.payloads import load_payloads
+from rich.console import Console
+from rich.table import Table
+
+from .cases import BENCHMARKS
+
+DEFAULT_REPEAT = 7
+# Median slowdown against the baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.2
+
+
+def run(
+    name_filter: Optional[str], repeat: int, payloads_dir: Optional[str]
+) -> Dict[str, dict]:
+    payloads = load_payloads(payloads_dir)
+    results = {}
+    for case in BENCHMARKS:
+        if name_filter and not re.search(name_filter, case.name):
+            continue
+
+        func = case.setup(payloads)
+        func()  # warm caches the way a running session would
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+        results[case.name] = {
+            "median": statistics.median(timings),
+            "min": min(timings),
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "loops": number,
+        }
+    return results
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.3f}"
+
+
+def report(
+    results: Dict[str, dict], baseline: Optional[Dict[str, dict]], threshold: float
+) -> List[str]:
+    """Print the results and return the names of regressed cases."""
+    table = Table(title="Benchmarks (ms per call)")
+    table.add_column("case")
+    table.add_column("median", justify="right")
+    table.add_column("min", justify="right")
+    table.add_column("stdev", justify="right")
+    table.add_column("loops", justify="right")
+    if baseline is not None:
+        table.add_column("vs baseline", justify="right")
+
+    regressions = []
+    for name, result in results.items():
+        row = [
+            name,
+            _ms(result["median"]),
+            _ms(result["min"]),
+            _ms(result["stdev"]),
+            str(result["loops"]),
+        ]
+        if baseline is not None:
+            before = baseline.get(name)
+            if before is None:
+                row.append("new")
+            else:
+                change = result["median"] / before["median"] - 1
+                style = ""
+                if change > threshold:
+                    regressions.append(name)
+                    style = "red"
+                elif change < -threshold:
+                    style = "green"
+                row.append(
+                    f"[{style}]{change:+.1%}[/{style}]" if style else f"{change:+.1%}"
+                )
+        table.add_row(*row)
+
+    Console().print(table)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "-k", dest="name_filter", help="Only run cases matching this regex."
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--payloads", help="Directory with recorded API payloads.")
+    parser.add_argument(
+        "--json", dest="json_path", help="Write the results to this file."
+    )
+    parser.add_argument("--compare", help="Baseline results written by --json.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown of the median that fails --compare.",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.name_filter, args.repeat, args.payloads)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    regressions = report(results, baseline, args.threshold)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""The benchmarked hot paths.
+
+Each case is a setup function, registered with :func:`benchmark`, that
+prepares its inputs once and returns the zero-argument callable to time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from fakes.google_http import FakeGoogleHttp, fake_service
+from fakes.payloads import SYNC_NOW, TIMEZONE
+
+# Modelled round trip and transfer rate of a Google API request
+NETWORK_LATENCY = 0.05
+NETWORK_BANDWIDTH = 2_000_000
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[Dict[str, Any]], Callable[[], Any]]
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str):
+    def register(setup: Callable[[Dict[str, Any]], Callable[[], Any]]):
+        BENCHMARKS.append(Benchmark(name, setup))
+        return setup
+
+    return register
+
+
+def _all_events(payloads: Dict[str, Any]) -> List[dict]:
+    return [event for events in payloads["calendars"].values() for event in events]
+
+
+def _list_events_tool(payloads: Dict[str, Any], network: bool = False, **fields: Any):
+    from tools.google_calendar.list_calendar_events import GoogleCalendarListEvents
+
+    http = FakeGoogleHttp(payloads["calendars"], payloads["labels"])
+    if network:
+        http.latency, http.bandwidth = NETWORK_LATENCY, NETWORK_BANDWIDTH
+    return GoogleCalendarListEvents(
+        api_resource=fake_service("calendar", "v3", http), **fields
+    )
+
+
+def _mirror_tool(payloads: Dict[str, Any], network: bool = False):
+    from tools.google_calendar.sync import get_sync_engine
+
+    tool = _list_events_tool(
+        payloads, network, use_sync_mirror=True, event_store_path=None
+    )
+    # Place the sync window around the payloads rather than today
+    get_sync_engine(tool.api_resource, None).now = lambda: SYNC_NOW
+    return tool
+
+
+@benchmark("calendar.parse_events")
+def parse_events(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    from tools.google_calendar.list_calendar_events import GoogleCalendarListEvents
+
+    tool = GoogleCalendarListEvents.model_construct(api_resource=None)
+    events = _all_events(payloads)[:1000]
+    return lambda: tool._parse_events(events, TIMEZONE)
+
+
+@benchmark("calendar.parse_and_format_datetime")
+def parse_and_format(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    from tools.google_calendar.utils import parse_and_format_datetime
+
+    def run() -> None:
+        for _ in range(100):
+            parse_and_format_datetime(
+                "2024-01-08T09:00:00", "2024-01-22T18:00:00", TIMEZONE
+            )
+
+    return run
+
+
+@benchmark("calendar.list_events.api")
+def list_events_api(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    # Paged listing of every calendar, k-way merged by start time
+    tool = _list_events_tool(payloads, use_sync_mirror=False)
+    return lambda: tool._run(
+        "2024-01-08T00:00:00", "2024-01-22T00:00:00", 250, TIMEZONE
+    )
+
+
+@benchmark("calendar.list_events.api_full")
+def list_events_api_full(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    # The same listing downloading whole event resources, for comparison
+    tool = _list_events_tool(payloads, use_sync_mirror=False, response_fields=None)
+    return lambda: tool._run(
+        "2024-01-08T00:00:00", "2024-01-22T00:00:00", 250, TIMEZONE
+    )
+
+
+@benchmark("calendar.list_events.mirror")
+def list_events_mirror(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    # Incremental sync with an empty delta, then a range query of the mirrors.
+    # Requests are free here, so this is the client-side cost only: the delta
+    # request plus reading the store, which is no cheaper than the API path.
+    tool = _mirror_tool(payloads)
+    return lambda: tool._run(
+        "2024-01-08T00:00:00", "2024-01-22T00:00:00", 250, TIMEZONE
+    )
+
+
+# The mirror saves network time, which the cases below model: both paths make
+# one request per calendar, but the delta is empty while the API path downloads
+# every event in range.
+
+
+@benchmark("calendar.list_events.api.network")
+def list_events_api_network(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    tool = _list_events_tool(payloads, network=True, use_sync_mirror=False)
+    return lambda: tool._run(
+        "2024-01-08T00:00:00", "2024-01-22T00:00:00", 250, TIMEZONE
+    )
+
+
+@benchmark("calendar.list_events.mirror.network")
+def list_events_mirror_network(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    tool = _mirror_tool(payloads, network=True)
+    return lambda: tool._run(
+        "2024-01-08T00:00:00", "2024-01-22T00:00:00", 250, TIMEZONE
+    )
+
+
+@benchmark("gmail.format_labels")
+def format_labels(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    from tools.gmail.list_labels import GmailListLabels
+
+    tool = GmailListLabels.model_construct(api_resource=None)
+    labels = payloads["labels"]["labels"]
+    return lambda: tool._format_labels(labels)
+
+
+def _conversation(payloads: Dict[str, Any]) -> List[Any]:
+    from autogen_agentchat.base import Response
+    from autogen_agentchat.messages import (
+        TextMessage,
+        ToolCallExecutionEvent,
+        ToolCallRequestEvent,
+    )
+    from autogen_core import FunctionCall
+    from autogen_core.models import FunctionExecutionResult, RequestUsage
+
+    events = _all_events(payloads)[:10]
+    usage = RequestUsage(prompt_tokens=1800, completion_tokens=60)
+    messages: List[Any] = [TextMessage(source="user", content="What's on next week?")]
+    for i in range(5):
+        messages.append(
+            ToolCallRequestEvent(
+                source="aura",
+                models_usage=usage,
+                content=[
+                    FunctionCall(
+                        id=f"call_{i}",
+                        name="list_google_calendar_events",
+                        arguments='{"start_datetime": "2024-01-08T00:00:00", '
+                        '"end_datetime": "2024-01-15T00:00:00"}',
+                    )
+                ],
+            )
+        )
+        messages.append(
+            ToolCallExecutionEvent(
+                source="aura",
+                content=[
+                    FunctionExecutionResult(
+                        call_id=f"call_{i}", content=json.dumps(events)
+                    )
+                ],
+            )
+        )
+
+    answer = "\n".join(
+        f"- **{event['summary']}** on {event['start'].get('dateTime', event['start'].get('date'))}"
+        for event in events
+    )
+    messages.append(
+        Response(
+            chat_message=TextMessage(
+                source="aura", models_usage=usage, content=f"Next week:\n\n{answer}"
+            ),
+            inner_messages=messages[1:],
+        )
+    )
+    return messages
+
+
+@benchmark("console.render")
+def render_console(payloads: Dict[str, Any]) -> Callable[[], Any]:
+    from utils.console import RichConsole
+
+    messages = _conversation(payloads)
+    loop = asyncio.new_event_loop()
+
+    async def stream():
+        for message in messages:
+            yield message
+
+    def run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            loop.run_until_complete(RichConsole(stream()))
+
+    return run
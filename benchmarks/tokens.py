@@ -0,0 +1,108 @@
+"""Prompt tokens of tool outputs, full versus compact: ``python -m benchmarks.tokens``.
+
+Counts use the model's tiktoken encoding when it is available offline and
+otherwise fall back to an estimate of four characters per token.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from fakes.payloads import TIMEZONE, load_payloads
+from rich.console import Console
+from rich.table import Table
+
+from .cases import _list_events_tool
+
+MODEL = "gpt-4o-mini"
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> Any:
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str = MODEL) -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text))
+
+
+def outputs(payloads: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """Return (case, full output, compact output) as the model would see them."""
+    from tools.gmail.list_labels import GmailListLabels
+
+    tool = _list_events_tool(payloads, use_sync_mirror=False, compact_output=False)
+    results = []
+    for max_results in (10, 50, 250):
+        events = tool._run(
+            "2024-01-08T00:00:00", "2024-01-22T00:00:00", max_results, TIMEZONE
+        )
+        # The tool adapter passes results to the model with str()
+        results.append(
+            (
+                f"list_google_calendar_events ({len(events)})",
+                str(events),
+                tool._format_compact(events),
+            )
+        )
+
+    labels = GmailListLabels.model_construct(api_resource=None, compact_output=True)
+    label_list = payloads["labels"]["labels"]
+    full = labels.model_copy(update={"compact_output": False})._format_labels(
+        label_list
+    )
+    results.append(
+        (
+            f"list_gmail_labels ({len(label_list)})",
+            full,
+            labels._format_labels(label_list),
+        )
+    )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.tokens", description=__doc__
+    )
+    parser.add_argument("--payloads", help="Directory with recorded API payloads.")
+    parser.add_argument(
+        "--json", dest="json_path", help="Write the counts to this file."
+    )
+    args = parser.parse_args(argv)
+
+    estimated = _encoding(MODEL) is None
+    table = Table(title=f"Tool output tokens{' (estimated)' if estimated else ''}")
+    table.add_column("output")
+    table.add_column("full", justify="right")
+    table.add_column("compact", justify="right")
+    table.add_column("saved", justify="right")
+
+    counts = {}
+    for case, full, compact in outputs(load_payloads(args.payloads)):
+        before, after = count_tokens(full), count_tokens(compact)
+        counts[case] = {"full": before, "compact": after}
+        table.add_row(case, str(before), str(after), f"{1 - after / before:.0%}")
+    Console().print(table)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(counts, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
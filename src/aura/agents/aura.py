@@ -1,14 +1,19 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from tools.tool_factory import (
-    get_file_system_tools,
-    get_gmail_tools,
-    get_google_calendar_tools,
-    get_utility_tools,
-)
+from autogen_core.models import ChatCompletionClient
+from agents.model_client import TracedOpenAIChatCompletionClient
+from agents.model_context import SummarizingChatCompletionContext
+from agents.tool_executor import ConcurrentToolAgent, ToolCallExecutor
+from tools.lazy import LazyToolGroup
+from tools.tool_factory import SERIALIZED_TOOLS, get_tool_groups
 from tzlocal import get_localzone
+from utils.startup import StartupTimer
+
+logger = logging.getLogger(__name__)
 
 SCOPES = [
     "https://mail.google.com/",
@@ -29,29 +34,97 @@ Guidelines:
 - User your tools available to be aware of the current time and date.
 """
 
+UNAVAILABLE_TOOLS_TEMPLATE = """- These tools failed to start and are unavailable: {groups}. Tell the user when a request needs them.
+"""
+
 
 def _get_timezone() -> ZoneInfo:
     """Get the current system timezone."""
     return ZoneInfo(str(get_localzone()))
 
 
-async def aura() -> AssistantAgent:
-    tools = (
-        get_gmail_tools(SCOPES)
-        + get_google_calendar_tools(SCOPES)
-        + get_utility_tools()
-        + await get_file_system_tools()
+async def _load_tools(
+    groups: List[LazyToolGroup], timer: StartupTimer
+) -> Tuple[List[Any], List[str]]:
+    """Load all tool groups concurrently; a failing group is skipped."""
+
+    async def load(group: LazyToolGroup) -> List[Any]:
+        with timer.phase(f"tools/{group.name}"):
+            return await group.tools()
+
+    results = await asyncio.gather(
+        *(load(group) for group in groups), return_exceptions=True
     )
 
-    assistant = AssistantAgent(
-        name="aura",
-        model_client=OpenAIChatCompletionClient(
+    tools, unavailable = [], []
+    for group, result in zip(groups, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Tools unavailable: {group.name} failed to start: {result}")
+            unavailable.append(group.name)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            tools += result
+    return tools, unavailable
+
+
+@dataclass
+class AuraBackend:
+    """What every Aura agent shares: model client, tools and tool executor.
+
+    Agents built from one backend keep their own conversation but share the
+    tool backends and their caches, and the executor that orders writes.
+    """
+
+    model_client: ChatCompletionClient
+    tools: List[Any]
+    system_message: str
+    tool_executor: ToolCallExecutor
+
+
+async def load_backend(timer: Optional[StartupTimer] = None) -> AuraBackend:
+    timer = timer or StartupTimer()
+
+    # Tools are proxies built on first use whenever their schemas are cached
+    with timer.phase("tools"):
+        tools, unavailable = await _load_tools(get_tool_groups(SCOPES), timer)
+
+    system_message = SYSTEM_PROMPT_TEMPLATE.format(timezone=str(_get_timezone()))
+    if unavailable:
+        system_message += UNAVAILABLE_TOOLS_TEMPLATE.format(
+            groups=", ".join(unavailable)
+        )
+
+    with timer.phase("model client"):
+        model_client = TracedOpenAIChatCompletionClient(
             model="gpt-4o-mini",
             temperature=0.01,
-        ),
+        )
+
+    return AuraBackend(
+        model_client=model_client,
         tools=tools,
-        system_message=SYSTEM_PROMPT_TEMPLATE.format(timezone=str(_get_timezone())),
+        system_message=system_message,
+        tool_executor=ToolCallExecutor(serialized=SERIALIZED_TOOLS),
+    )
+
+
+def create_agent(backend: AuraBackend) -> ConcurrentToolAgent:
+    return ConcurrentToolAgent(
+        name="aura",
+        model_client=backend.model_client,
+        # Older turns are summarized so the prompt stays the same size
+        model_context=SummarizingChatCompletionContext(backend.model_client),
+        tools=backend.tools,
+        system_message=backend.system_message,
         reflect_on_tool_use=True,
+        tool_executor=backend.tool_executor,
     )
 
-    return assistant
+
+async def aura(timer: Optional[StartupTimer] = None) -> ConcurrentToolAgent:
+    timer = timer or StartupTimer()
+    backend = await load_backend(timer)
+
+    with timer.phase("agent"):
+        return create_agent(backend)
@@ -0,0 +1,61 @@
+from typing import Any, Mapping, Optional, Sequence
+
+from autogen_core import CancellationToken
+from autogen_core.models import CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+from opentelemetry.trace import SpanKind
+from utils.tracing import get_tracer
+
+
+class TracedOpenAIChatCompletionClient(OpenAIChatCompletionClient):
+    """OpenAI chat completion client that records a span per model call.
+
+    The span carries the model, the number and total size of the messages
+    sent, the number of tools offered, the token usage and the finish reason.
+    """
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        model = self._create_args.get("model", "")
+        with get_tracer().start_as_current_span(
+            f"chat {model}", kind=SpanKind.CLIENT
+        ) as span:
+            recording = span.is_recording()
+            if recording:
+                span.set_attribute("gen_ai.system", "openai")
+                span.set_attribute("gen_ai.request.model", model)
+                span.set_attribute("aura.model.messages", len(messages))
+                span.set_attribute(
+                    "aura.model.request_size",
+                    sum(len(str(message.content)) for message in messages),
+                )
+                span.set_attribute("aura.model.tools", len(tools))
+
+            result = await super().create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+
+            if recording:
+                span.set_attribute(
+                    "gen_ai.usage.input_tokens", result.usage.prompt_tokens
+                )
+                span.set_attribute(
+                    "gen_ai.usage.output_tokens", result.usage.completion_tokens
+                )
+                span.set_attribute(
+                    "gen_ai.response.finish_reasons", [result.finish_reason]
+                )
+                span.set_attribute("aura.model.cached", result.cached)
+            return result
@@ -0,0 +1,238 @@
+"""Conversation memory that keeps the agent's prompt within a token budget."""
+
+import asyncio
+import logging
+from typing import Any, List, Mapping, Optional
+
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import (
+    AssistantMessage,
+    ChatCompletionClient,
+    FunctionExecutionResult,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    SystemMessage,
+    UserMessage,
+)
+from utils.continuation import truncate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_BUDGET = 8000
+DEFAULT_RECENT_TURNS = 4
+DEFAULT_STALE_RESULT_CHARS = 300
+# Share of the budget that, once exceeded, starts folding older turns
+SUMMARIZE_THRESHOLD = 0.75
+CHARS_PER_TOKEN = 4
+
+SUMMARY_PROMPT = """Summarize the conversation below between a user and their email and calendar assistant.
+Keep what later requests may depend on: the user's goals and preferences, decisions made, and the names, times and IDs of emails, events and labels that were discussed or changed.
+Leave out tool output that no longer matters. Answer with the summary only, in at most 200 words."""
+
+SUMMARY_TEMPLATE = "Summary of the earlier conversation:\n{summary}"
+
+
+def estimate_tokens(messages: List[LLMMessage]) -> int:
+    """Cheap token estimate of messages, about four characters per token."""
+    return sum(len(str(message.content)) // CHARS_PER_TOKEN + 4 for message in messages)
+
+
+def _split_turns(messages: List[LLMMessage]) -> List[List[LLMMessage]]:
+    # A turn starts with a user message and holds everything the agent did for it
+    turns: List[List[LLMMessage]] = []
+    for message in messages:
+        if isinstance(message, UserMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _transcript(messages: List[LLMMessage], result_chars: int) -> str:
+    lines = []
+    for message in messages:
+        if isinstance(message, UserMessage):
+            lines.append(f"User: {message.content}")
+        elif isinstance(message, AssistantMessage):
+            if isinstance(message.content, str):
+                lines.append(f"Assistant: {message.content}")
+            else:
+                for call in message.content:
+                    lines.append(f"Assistant called {call.name}({call.arguments})")
+        elif isinstance(message, FunctionExecutionResultMessage):
+            for result in message.content:
+                lines.append(f"Tool result: {truncate(result.content, result_chars)}")
+    return "\n".join(lines)
+
+
+async def close_pending_tool_calls(
+    context: ChatCompletionContext, content: str
+) -> None:
+    """Answer the tool calls a cancelled turn left without results.
+
+    The model API rejects a conversation whose last tool calls have no
+    results, so each gets ``content`` as its result.
+    """
+    messages = await context.get_messages()
+    if messages and isinstance(messages[-1], AssistantMessage):
+        calls = messages[-1].content
+        if not isinstance(calls, str):
+            await context.add_message(
+                FunctionExecutionResultMessage(
+                    content=[
+                        FunctionExecutionResult(call_id=call.id, content=content)
+                        for call in calls
+                    ]
+                )
+            )
+
+
+class SummarizingChatCompletionContext(ChatCompletionContext):
+    """Keeps recent turns verbatim and older ones as a rolling summary.
+
+    The prompt built from the context stays within ``token_budget``:
+
+    - Tool results of past turns are cut to ``stale_result_chars``; the calls
+      stay, so the model can repeat one when it needs the full result again.
+    - When a turn ends and the context exceeds most of the budget, every turn
+      but the last ``recent_turns`` is folded into the summary by a model call
+      in the background, while the user types the next request. Turns are
+      folded in batches of at least ``recent_turns`` unless the budget is
+      already exceeded, to keep summary calls rare.
+    - Until the summary is ready, and whenever recent turns alone exceed the
+      budget, the oldest turns are left out of the prompt. The current turn is
+      always sent in full.
+
+    Args:
+        model_client: Client used to write the summaries.
+        token_budget: Estimated prompt tokens the context may use.
+        recent_turns: Number of latest turns never summarized.
+        stale_result_chars: Characters kept of each tool result of past turns.
+        initial_messages: Messages to start from.
+    """
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        recent_turns: int = DEFAULT_RECENT_TURNS,
+        stale_result_chars: int = DEFAULT_STALE_RESULT_CHARS,
+        initial_messages: Optional[List[LLMMessage]] = None,
+    ) -> None:
+        super().__init__(initial_messages)
+        self._model_client = model_client
+        self.token_budget = token_budget
+        self.recent_turns = max(1, recent_turns)
+        self.stale_result_chars = stale_result_chars
+        self._summary: Optional[str] = None
+        self._summarizing: Optional[asyncio.Task] = None
+
+    async def add_message(self, message: LLMMessage) -> None:
+        await super().add_message(message)
+        # A text answer ends the turn
+        if isinstance(message, AssistantMessage) and isinstance(message.content, str):
+            self._schedule_summary()
+
+    def _summary_messages(self) -> List[LLMMessage]:
+        if self._summary is None:
+            return []
+        return [SystemMessage(content=SUMMARY_TEMPLATE.format(summary=self._summary))]
+
+    def _strip_results(self, turn: List[LLMMessage]) -> List[LLMMessage]:
+        return [
+            FunctionExecutionResultMessage(
+                content=[
+                    FunctionExecutionResult(
+                        call_id=result.call_id,
+                        content=truncate(result.content, self.stale_result_chars),
+                    )
+                    for result in message.content
+                ]
+            )
+            if isinstance(message, FunctionExecutionResultMessage)
+            else message
+            for message in turn
+        ]
+
+    def _view(self) -> List[List[LLMMessage]]:
+        turns = _split_turns(self._messages)
+        return [self._strip_results(turn) for turn in turns[:-1]] + turns[-1:]
+
+    async def get_messages(self) -> List[LLMMessage]:
+        summary = self._summary_messages()
+        budget = self.token_budget - estimate_tokens(summary)
+
+        kept: List[List[LLMMessage]] = []
+        used = 0
+        for turn in reversed(self._view()):
+            tokens = estimate_tokens(turn)
+            if kept and used + tokens > budget:
+                break
+            kept.append(turn)
+            used += tokens
+
+        messages = summary
+        for turn in reversed(kept):
+            messages += turn
+        return messages
+
+    def _schedule_summary(self) -> None:
+        if self._summarizing is not None and not self._summarizing.done():
+            return
+
+        turns = _split_turns(self._messages)
+        older = len(turns) - self.recent_turns
+        if older <= 0:
+            return
+
+        view = [message for turn in self._view() for message in turn]
+        tokens = estimate_tokens(self._summary_messages() + view)
+        # Fold in batches of recent_turns turns, unless over budget already
+        if tokens <= self.token_budget * SUMMARIZE_THRESHOLD or (
+            older < self.recent_turns and tokens <= self.token_budget
+        ):
+            return
+
+        folded = [message for turn in turns[: -self.recent_turns] for message in turn]
+        self._summarizing = asyncio.create_task(self._summarize(folded))
+
+    async def _summarize(self, folded: List[LLMMessage]) -> None:
+        transcript = _transcript(folded, self.stale_result_chars)
+        if self._summary is not None:
+            transcript = f"Earlier summary: {self._summary}\n\n{transcript}"
+
+        try:
+            result = await self._model_client.create(
+                [
+                    SystemMessage(content=SUMMARY_PROMPT),
+                    UserMessage(content=transcript, source="user"),
+                ]
+            )
+        except Exception as e:
+            # The turns stay and are retried after the next turn
+            logger.warning(f"Failed to summarize the conversation: {e}")
+            return
+
+        # Messages are only appended, unless the context was cleared meanwhile
+        count = len(folded)
+        if (
+            not isinstance(result.content, str)
+            or len(self._messages) < count
+            or any(a is not b for a, b in zip(self._messages, folded))
+        ):
+            return
+        self._summary = result.content
+        del self._messages[:count]
+        logger.info(f"Folded {count} messages into the conversation summary")
+
+    async def clear(self) -> None:
+        if self._summarizing is not None:
+            self._summarizing.cancel()
+        self._summary = None
+        await super().clear()
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {**await super().save_state(), "summary": self._summary}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await super().load_state(state)
+        self._summary = state.get("summary")
@@ -0,0 +1,116 @@
+"""Concurrent execution of the tool calls of one model response."""
+
+import asyncio
+import contextlib
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, TypeVar
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_core import CancellationToken, FunctionCall
+from autogen_core.models import FunctionExecutionResult
+from agents.model_context import close_pending_tool_calls
+from utils.continuation import ContinuationStore, use_continuation_store
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TOOL_TIMEOUT = 60.0
+CANCELLED_RESULT = "Error: the user cancelled this call."
+
+
+class ToolCallExecutor:
+    """Runs tool calls concurrently with a bound, a timeout and opt-in ordering.
+
+    At most ``max_concurrency`` calls run at once, which also bounds the
+    worker threads taken by tools that only have a sync implementation. A
+    call running longer than ``timeout`` seconds fails with ``TimeoutError``;
+    a sync tool's thread cannot be interrupted and finishes in the background.
+
+    Tools named in ``serialized`` map to the resource they write. Calls of
+    tools sharing a resource run one at a time, in the order they were
+    submitted, while other calls keep running alongside them.
+
+    Args:
+        max_concurrency: Number of calls running at once.
+        timeout: Seconds a call may take, or None to wait indefinitely.
+        serialized: Tool name to the resource whose writes are ordered.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT,
+        serialized: Optional[Mapping[str, str]] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.serialized = dict(serialized or {})
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _ordering(self, name: str) -> Any:
+        resource = self.serialized.get(name)
+        if resource is None:
+            return contextlib.nullcontext()
+        return self._locks.setdefault(resource, asyncio.Lock())
+
+    async def run(self, name: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call``, the invocation of tool ``name``, within the limits."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Wait for the resource first, so queued writes hold no pool slot
+        async with self._ordering(name), self._semaphore:
+            try:
+                return await asyncio.wait_for(call(), self.timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"The tool '{name}' did not finish within {self.timeout:g} seconds."
+                ) from None
+
+
+class ConcurrentToolAgent(AssistantAgent):
+    """Assistant agent whose tool calls run through a :class:`ToolCallExecutor`.
+
+    The agent already starts every call of a response at once and collects
+    the results in call order; the executor adds the concurrency bound, the
+    per-call timeout and the ordering of writes. A failed or timed out call
+    is reported to the model as an error result, like any other tool error.
+
+    Each agent keeps its own :class:`ContinuationStore`, so the handles of
+    shortened tool results are only readable within its conversation.
+
+    Args:
+        tool_executor: Executor of the tool calls.
+        **kwargs: Arguments of :class:`AssistantAgent`.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        tool_executor: Optional[ToolCallExecutor] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self._tool_executor = tool_executor or ToolCallExecutor()
+        self._continuations = ContinuationStore()
+
+    async def _execute_tool_call(
+        self, tool_call: FunctionCall, cancellation_token: CancellationToken
+    ) -> FunctionExecutionResult:
+        execute = super()._execute_tool_call
+
+        def call() -> Awaitable[FunctionExecutionResult]:
+            # Cancelling the turn's token cancels its running tool calls too
+            return cancellation_token.link_future(
+                asyncio.ensure_future(execute(tool_call, cancellation_token))
+            )
+
+        try:
+            with use_continuation_store(self._continuations):
+                return await self._tool_executor.run(tool_call.name, call)
+        except TimeoutError as e:
+            return FunctionExecutionResult(content=f"Error: {e}", call_id=tool_call.id)
+
+    async def close_cancelled_turn(self) -> None:
+        """Answer the tool calls of a cancelled turn, keeping the context valid."""
+        await close_pending_tool_calls(self._model_context, CANCELLED_RESULT)
@@ -1,35 +1,122 @@
 import asyncio
+import os
+import sys
+from importlib import import_module
 
-from autogen_agentchat.messages import TextMessage
-from autogen_core import CancellationToken
 from dotenv import load_dotenv
-from agents.aura import aura
 
-from utils.console import RichConsole
+from utils.repl import AsyncInput, Interrupted, Interrupts
+from utils.startup import StartupTimer
 
+# autogen, langchain and the Google clients take seconds to import, so they are
+# loaded in a worker thread while the first prompt is already shown.
+PRELOAD_MODULES = ["agents.aura", "utils.console"]
 
-async def main():
-    agent = await aura()
 
-    while True:
-        try:
-            user_input = input("> ")
+def preload() -> None:
+    for module in PRELOAD_MODULES:
+        import_module(module)
+
+
+async def load_agent(timer: StartupTimer):
+    """Import the heavy modules off the loop, then build the agent."""
+    with timer.phase("imports"):
+        await asyncio.to_thread(preload)
+
+    from agents.aura import aura
+    from utils.tracing import configure_tracing
+
+    configure_tracing()
+    return await aura(timer)
+
+
+async def shutdown() -> None:
+    """Stop the MCP servers and flush the traces, whether or not a turn ran.
+
+    Only what the build imported is shut down; a cancelled build may still
+    have started the MCP servers.
+    """
+    mcp_session = sys.modules.get("tools.mcp_session")
+    if mcp_session is not None:
+        await mcp_session.get_mcp_session_pool().close()
+    tracing = sys.modules.get("utils.tracing")
+    if tracing is not None:
+        tracing.shutdown_tracing()
+
+
+async def chat(build: asyncio.Task, timer: StartupTimer):
+    # The prompt is awaited, so the build keeps running while it shows
+    read_input = AsyncInput()
+    agent = None
+    with Interrupts() as interrupts:
+        while True:
+            try:
+                user_input = await interrupts.run(read_input("> "))
+            except (Interrupted, EOFError):
+                print("\nGoodbye! 👋")
+                break
 
             if user_input == "exit":
                 break
 
-            await RichConsole(
-                stream=agent.on_messages_stream(
-                    [TextMessage(content=user_input, source="user")],
-                    cancellation_token=CancellationToken(),
-                ),
-                show_intermediate=True,
-            )
-        except KeyboardInterrupt:
-            print("\nGoodbye! 👋")
-            break
+            first_turn = agent is None
+            if first_turn:
+                try:
+                    agent = await interrupts.run(build)
+                except Interrupted:
+                    print("\nGoodbye! 👋")
+                    break
+
+            # Imported by the build already, never alongside it
+            from autogen_agentchat.messages import TextMessage
+            from autogen_core import CancellationToken
+            from rich.console import Console
+            from utils.console import RichConsole
+            from utils.tracing import get_tracer
+
+            if first_turn:
+                Console().print(f"Startup: {timer.report()}", style="dim cyan")
+
+            # Ctrl-C during the turn cancels it and returns to the prompt
+            cancellation_token = CancellationToken()
+            with get_tracer().start_as_current_span("aura turn") as span:
+                span.set_attribute("aura.turn.input_size", len(user_input))
+                try:
+                    stats = await interrupts.run(
+                        RichConsole(
+                            stream=agent.on_messages_stream(
+                                [TextMessage(content=user_input, source="user")],
+                                cancellation_token=cancellation_token,
+                            ),
+                            show_intermediate=True,
+                            stats_file=os.environ.get("AURA_STATS_FILE"),
+                        ),
+                        cancellation_token,
+                    )
+                except Interrupted:
+                    span.set_attribute("aura.turn.cancelled", True)
+                    await agent.close_cancelled_turn()
+                    Console().print("\nTurn cancelled.", style="dim cyan")
+                    continue
+                span.set_attribute("gen_ai.usage.input_tokens", stats.prompt_tokens)
+                span.set_attribute(
+                    "gen_ai.usage.output_tokens", stats.completion_tokens
+                )
+
+
+async def main(timer: StartupTimer):
+    # The single build starts now and is awaited when the first input arrives
+    build = asyncio.create_task(load_agent(timer))
+    timer.mark("first prompt")
+    try:
+        await chat(build, timer)
+    finally:
+        if not build.done():
+            build.cancel()
+        await shutdown()
 
 
 if __name__ == "__main__":
+    timer = StartupTimer()
     load_dotenv()
-    asyncio.run(main())
+    asyncio.run(main(timer))
@@ -0,0 +1 @@
+"""Headless mode: Aura served over a local HTTP and WebSocket API."""
@@ -0,0 +1,93 @@
+"""Serve Aura headless: ``python -m server`` from ``src/aura``.
+
+Binds to localhost by default. The API has no authentication beyond the
+unguessable session IDs, so put it behind an authenticating proxy before
+exposing it to a network.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from .sessions import (
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_QUEUED_TURNS,
+    DEFAULT_MAX_RUNNING_TURNS,
+    DEFAULT_MAX_SESSIONS,
+    SessionManager,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m server", description=__doc__)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=DEFAULT_MAX_SESSIONS,
+        help="Open sessions at once.",
+    )
+    parser.add_argument(
+        "--max-running-turns",
+        type=int,
+        default=DEFAULT_MAX_RUNNING_TURNS,
+        help="Turns running at once across sessions.",
+    )
+    parser.add_argument(
+        "--max-queued-turns",
+        type=int,
+        default=DEFAULT_MAX_QUEUED_TURNS,
+        help="Turns waiting for a slot before new ones are refused.",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Seconds after which an unused session may be closed.",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        from aiohttp import web
+    except ImportError:
+        print(
+            "The server needs aiohttp; install it with `pip install aura[server]`.",
+            file=sys.stderr,
+        )
+        return 1
+
+    from agents.aura import load_backend
+    from utils.tracing import configure_tracing
+
+    from .app import create_app
+
+    logging.basicConfig(level=logging.INFO)
+    load_dotenv()
+    configure_tracing()
+
+    async def app() -> web.Application:
+        manager = SessionManager(
+            await load_backend(),
+            max_sessions=args.max_sessions,
+            max_running_turns=args.max_running_turns,
+            max_queued_turns=args.max_queued_turns,
+            idle_timeout=args.idle_timeout,
+        )
+        return create_app(manager)
+
+    # The backend is loaded on the server's own event loop
+    web.run_app(app(), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
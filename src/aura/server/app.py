@@ -0,0 +1,230 @@
+"""HTTP and WebSocket API of the headless server.
+
+Routes:
+
+- ``POST /sessions`` opens a session and returns its ``id``.
+- ``DELETE /sessions/{id}`` closes it, cancelling a running turn.
+- ``POST /sessions/{id}/messages`` with ``{"content": ...}`` runs a turn and
+  streams its messages as newline-delimited JSON, the last being the
+  ``Response`` (or ``TurnCancelled``).
+- ``POST /sessions/{id}/cancel`` cancels the running turn.
+- ``GET /sessions/{id}/ws`` is a WebSocket taking ``{"type": "message",
+  "content": ...}`` and ``{"type": "cancel"}`` and sending the same
+  messages as the stream, plus ``Error`` messages.
+- ``GET /health`` reports the open sessions and running and queued turns.
+
+Messages are written as fast as the client reads them; the agent's stream
+is only advanced after the previous message was sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from aiohttp import WSMsgType, web
+from autogen_agentchat.base import Response
+from utils.tracing import get_tracer
+
+from .sessions import ServerBusy, Session, SessionBusy, SessionManager, SessionNotFound
+
+logger = logging.getLogger(__name__)
+
+MANAGER_KEY = web.AppKey("manager", SessionManager)
+# Seconds a client refused with 429 is asked to wait
+RETRY_AFTER = 5
+
+
+def _event(message: Any) -> Dict[str, Any]:
+    if isinstance(message, Response):
+        return {
+            "type": "Response",
+            "chat_message": message.chat_message.model_dump(mode="json"),
+        }
+    return message.model_dump(mode="json")
+
+
+def _error(status: int, error: str) -> Dict[str, Any]:
+    return {"type": "Error", "status": status, "error": error}
+
+
+@web.middleware
+async def _errors(request: web.Request, handler: Any) -> web.StreamResponse:
+    try:
+        return await handler(request)
+    except SessionNotFound as e:
+        return web.json_response(
+            _error(404, f"Unknown session {e.args[0]}."), status=404
+        )
+    except SessionBusy as e:
+        return web.json_response(_error(409, str(e)), status=409)
+    except ServerBusy as e:
+        return web.json_response(
+            _error(429, str(e)), status=429, headers={"Retry-After": str(RETRY_AFTER)}
+        )
+
+
+async def _content(request: web.Request) -> str:
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        body = None
+    if not isinstance(body, dict) or not isinstance(body.get("content"), str):
+        raise web.HTTPBadRequest(
+            text=json.dumps(_error(400, 'Expected {"content": "..."}.')),
+            content_type="application/json",
+        )
+    return body["content"]
+
+
+async def create_session(request: web.Request) -> web.Response:
+    session = request.app[MANAGER_KEY].create()
+    return web.json_response({"id": session.id}, status=201)
+
+
+async def close_session(request: web.Request) -> web.Response:
+    request.app[MANAGER_KEY].close(request.match_info["id"])
+    return web.Response(status=204)
+
+
+async def cancel_turn(request: web.Request) -> web.Response:
+    session = request.app[MANAGER_KEY].get(request.match_info["id"])
+    return web.json_response({"cancelled": session.cancel()})
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response(request.app[MANAGER_KEY].stats())
+
+
+async def post_message(request: web.Request) -> web.StreamResponse:
+    manager = request.app[MANAGER_KEY]
+    session = manager.get(request.match_info["id"])
+    content = await _content(request)
+
+    # Admission raises before the response starts, so refusals keep their status
+    async with manager.turn(session) as token:
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        stream = session.stream(content, token)
+        with get_tracer().start_as_current_span("aura turn") as span:
+            span.set_attribute("aura.session.id", session.id)
+            span.set_attribute("aura.turn.input_size", len(content))
+            try:
+                async for message in stream:
+                    await response.write(json.dumps(_event(message)).encode() + b"\n")
+                if token.is_cancelled():
+                    span.set_attribute("aura.turn.cancelled", True)
+                    await response.write(b'{"type": "TurnCancelled"}\n')
+                await response.write_eof()
+            except ConnectionResetError:
+                # The client is gone, so nothing more can be written to it
+                span.set_attribute("aura.turn.disconnected", True)
+                logger.info(f"Client of session {session.id} left during a turn")
+            except Exception as e:
+                # The status is sent already, so the error ends the stream instead
+                logger.exception(f"Turn of session {session.id} failed")
+                with contextlib.suppress(ConnectionResetError):
+                    await response.write(
+                        json.dumps(_error(500, str(e))).encode() + b"\n"
+                    )
+                    await response.write_eof()
+            finally:
+                # Stops a turn nobody reads and answers its pending tool calls
+                await stream.aclose()
+        return response
+
+
+async def _run_ws_turn(
+    manager: SessionManager, session: Session, content: str, ws: web.WebSocketResponse
+) -> None:
+    try:
+        async with manager.turn(session) as token:
+            with get_tracer().start_as_current_span("aura turn") as span:
+                span.set_attribute("aura.session.id", session.id)
+                span.set_attribute("aura.turn.input_size", len(content))
+                async for message in session.stream(content, token):
+                    await ws.send_json(_event(message))
+                if token.is_cancelled():
+                    span.set_attribute("aura.turn.cancelled", True)
+                    await ws.send_json({"type": "TurnCancelled"})
+    except SessionBusy as e:
+        await ws.send_json(_error(409, str(e)))
+    except ServerBusy as e:
+        await ws.send_json(_error(429, str(e)))
+    except Exception as e:
+        logger.exception(f"Turn of session {session.id} failed")
+        if not ws.closed:
+            await ws.send_json(_error(500, str(e)))
+
+
+async def session_ws(request: web.Request) -> web.WebSocketResponse:
+    manager = request.app[MANAGER_KEY]
+    session = manager.get(request.match_info["id"])
+
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    turn: Optional[asyncio.Task] = None
+    try:
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            try:
+                data = json.loads(msg.data)
+            except json.JSONDecodeError:
+                data = None
+
+            if isinstance(data, dict) and data.get("type") == "cancel":
+                session.cancel()
+            elif (
+                isinstance(data, dict)
+                and data.get("type") == "message"
+                and isinstance(data.get("content"), str)
+            ):
+                # The session is busy from the moment its turn task exists
+                if turn is not None and not turn.done():
+                    await ws.send_json(_error(409, "A turn is already running."))
+                    continue
+                turn = asyncio.create_task(
+                    _run_ws_turn(manager, session, data["content"], ws)
+                )
+            else:
+                await ws.send_json(
+                    _error(
+                        400,
+                        'Expected {"type": "message", "content": "..."} or {"type": "cancel"}.',
+                    )
+                )
+    finally:
+        # The client left; stop its turn
+        if turn is not None and not turn.done():
+            turn.cancel()
+    return ws
+
+
+async def _shutdown(app: web.Application) -> None:
+    from tools.mcp_session import get_mcp_session_pool
+    from utils.tracing import shutdown_tracing
+
+    await get_mcp_session_pool().close()
+    shutdown_tracing()
+
+
+def create_app(manager: SessionManager) -> web.Application:
+    app = web.Application(middlewares=[_errors])
+    app[MANAGER_KEY] = manager
+    app.add_routes(
+        [
+            web.post("/sessions", create_session),
+            web.delete("/sessions/{id}", close_session),
+            web.post("/sessions/{id}/messages", post_message),
+            web.post("/sessions/{id}/cancel", cancel_turn),
+            web.get("/sessions/{id}/ws", session_ws),
+            web.get("/health", health),
+        ]
+    )
+    app.on_cleanup.append(_shutdown)
+    return app
@@ -0,0 +1,207 @@
+"""Agent sessions of the headless server and their admission control."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import time
+from contextlib import aclosing, asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Optional
+
+from autogen_agentchat.messages import TextMessage
+from autogen_core import CancellationToken
+
+if TYPE_CHECKING:
+    from agents.aura import AuraBackend
+    from agents.tool_executor import ConcurrentToolAgent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 64
+DEFAULT_MAX_RUNNING_TURNS = 8
+DEFAULT_MAX_QUEUED_TURNS = 32
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+
+class SessionNotFound(KeyError):
+    """No session has the requested ID, or it was closed."""
+
+
+class SessionBusy(Exception):
+    """The session is already running a turn."""
+
+
+class ServerBusy(Exception):
+    """The server is at its session or turn limit; retry later."""
+
+
+class Session:
+    """One conversation with its own agent.
+
+    Args:
+        id: The session ID, also its access key.
+        agent: The session's agent.
+        clock: Time source, overridable for tests.
+    """
+
+    def __init__(self, id: str, agent: ConcurrentToolAgent, clock: Callable[[], float]):
+        self.id = id
+        self.agent = agent
+        self.last_used = clock()
+        self.token: Optional[CancellationToken] = None
+
+    @property
+    def busy(self) -> bool:
+        return self.token is not None
+
+    def cancel(self) -> bool:
+        """Cancel the running turn; return whether one was running."""
+        if self.token is None:
+            return False
+        self.token.cancel()
+        return True
+
+    async def stream(
+        self, content: str, token: CancellationToken
+    ) -> AsyncIterator[Any]:
+        """Send ``content`` and yield the agent's messages, like ``on_messages_stream``.
+
+        A turn cancelled through ``token`` ends early without error; one whose
+        task is cancelled, e.g. by a client disconnecting, re-raises. A turn
+        that does not finish, including one whose stream is closed early,
+        has its pending tool calls answered so the next turn can run.
+        """
+        messages = self.agent.on_messages_stream(
+            [TextMessage(content=content, source="user")], token
+        )
+        finished = False
+        try:
+            async with aclosing(messages):
+                async for message in messages:
+                    yield message
+            finished = True
+        except asyncio.CancelledError:
+            if not token.is_cancelled() or asyncio.current_task().cancelling():
+                raise
+        finally:
+            if not finished:
+                await self.agent.close_cancelled_turn()
+
+
+class SessionManager:
+    """Creates sessions on a shared backend and bounds the work they do.
+
+    Every session gets its own agent and conversation, while the model
+    client, the tools, their caches and the tool executor are shared.
+
+    - At most ``max_sessions`` sessions exist. Sessions idle for longer than
+      ``idle_timeout`` seconds are closed when a new one needs their slot.
+    - At most ``max_running_turns`` turns run at once across sessions, and at
+      most ``max_queued_turns`` more wait for a slot; beyond that a turn is
+      refused with :class:`ServerBusy` rather than queued without bound.
+    - A session runs one turn at a time.
+
+    Args:
+        backend: What every session's agent is built from.
+        max_sessions: Number of open sessions.
+        max_running_turns: Number of turns running at once.
+        max_queued_turns: Number of turns waiting to run.
+        idle_timeout: Seconds after which an unused session may be closed.
+        clock: Time source, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        backend: AuraBackend,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        max_running_turns: int = DEFAULT_MAX_RUNNING_TURNS,
+        max_queued_turns: int = DEFAULT_MAX_QUEUED_TURNS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.backend = backend
+        self.max_sessions = max_sessions
+        self.max_running_turns = max(1, max_running_turns)
+        self.max_queued_turns = max_queued_turns
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._sessions: Dict[str, Session] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running = 0
+        self._queued = 0
+
+    def _close_idle(self) -> None:
+        now = self._clock()
+        for session in list(self._sessions.values()):
+            if not session.busy and now - session.last_used > self.idle_timeout:
+                logger.info(f"Closing idle session {session.id}")
+                del self._sessions[session.id]
+
+    def create(self) -> Session:
+        """Open a session; raises :class:`ServerBusy` at the session limit."""
+        from agents.aura import create_agent
+
+        if len(self._sessions) >= self.max_sessions:
+            self._close_idle()
+        if len(self._sessions) >= self.max_sessions:
+            raise ServerBusy(f"All {self.max_sessions} sessions are in use.")
+
+        session = Session(
+            secrets.token_urlsafe(16), create_agent(self.backend), self._clock
+        )
+        self._sessions[session.id] = session
+        return session
+
+    def get(self, session_id: str) -> Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise SessionNotFound(session_id)
+        return session
+
+    def close(self, session_id: str) -> None:
+        """Close a session, cancelling its running turn."""
+        self.get(session_id).cancel()
+        del self._sessions[session_id]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self._sessions),
+            "running_turns": self._running,
+            "queued_turns": self._queued,
+        }
+
+    @asynccontextmanager
+    async def turn(self, session: Session) -> AsyncIterator[CancellationToken]:
+        """Admit a turn of ``session`` and wait for a slot to run it.
+
+        Raises :class:`SessionBusy` or :class:`ServerBusy` right away when the
+        turn cannot be admitted, so callers can refuse it before responding.
+
+        Yields:
+            The token that cancels the turn.
+        """
+        if session.busy:
+            raise SessionBusy(f"Session {session.id} is already running a turn.")
+        if self._queued >= self.max_queued_turns:
+            raise ServerBusy(f"{self._queued} turns are already waiting to run.")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_running_turns)
+
+        token = session.token = CancellationToken()
+        try:
+            self._queued += 1
+            try:
+                await self._slots.acquire()
+            finally:
+                self._queued -= 1
+
+            self._running += 1
+            try:
+                yield token
+            finally:
+                self._running -= 1
+                self._slots.release()
+        finally:
+            session.token = None
+            session.last_used = self._clock()
@@ -7,6 +7,9 @@ from autogen_core import TRACE_LOGGER_NAME
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from langchain_google_community.gmail.base import GmailBaseTool
 from pydantic import BaseModel, Field
+from utils.google_api import execute_async
+
+from .label_index import LABEL_FIELDS, get_label_index, invalidate_on_stale
 
 
 class CreateLabelSchema(BaseModel):
@@ -34,9 +37,28 @@ class GmailCreateLabel(GmailBaseTool):
         "You can specify the label name and visibility settings."
     )
     args_schema: type[BaseModel] = CreateLabelSchema
+    response_fields: Optional[str] = Field(
+        default=LABEL_FIELDS,
+        description="Fields of the created label to download. None returns all of them.",
+    )
 
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
+    def _create_request(
+        self, name: str, message_list_visibility: str, label_list_visibility: str
+    ):
+        label = {
+            "name": name,
+            "messageListVisibility": message_list_visibility,
+            "labelListVisibility": label_list_visibility,
+        }
+
+        return (
+            self.api_resource.users()
+            .labels()
+            .create(userId="me", body=label, fields=self.response_fields)
+        )
+
     def _run(
         self,
         name: str,
@@ -45,23 +67,16 @@ class GmailCreateLabel(GmailBaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
         try:
-            label = {
-                "name": name,
-                "messageListVisibility": message_list_visibility,
-                "labelListVisibility": label_list_visibility,
-            }
-
-            result = (
-                self.api_resource.users()
-                .labels()
-                .create(userId="me", body=label)
-                .execute()
-            )
+            result = self._create_request(
+                name, message_list_visibility, label_list_visibility
+            ).execute()
+            get_label_index(self.api_resource).upsert(result)
 
             return f"Label created successfully. ID: {result['id']}, Name: {result['name']}"
 
         except Exception as e:
             self._logger.error(f"Failed to create label: {str(e)}")
+            invalidate_on_stale(self.api_resource, e)
             raise
 
     async def _arun(
@@ -71,4 +86,17 @@ class GmailCreateLabel(GmailBaseTool):
         label_list_visibility: str = "labelShow",
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        raise NotImplementedError("Async version of this tool is not implemented.")
+        try:
+            result = await execute_async(
+                self._create_request(
+                    name, message_list_visibility, label_list_visibility
+                )
+            )
+            get_label_index(self.api_resource).upsert(result)
+
+            return f"Label created successfully. ID: {result['id']}, Name: {result['name']}"
+
+        except Exception as e:
+            self._logger.error(f"Failed to create label: {str(e)}")
+            invalidate_on_stale(self.api_resource, e)
+            raise
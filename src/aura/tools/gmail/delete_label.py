@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from autogen_core import TRACE_LOGGER_NAME
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from langchain_google_community.gmail.base import GmailBaseTool
 from pydantic import BaseModel, Field
+from utils.google_api import execute_async
+from utils.google_batch import BatchResult, GoogleApiBatch
+
+from .label_index import get_label_index, invalidate_on_stale
 
 
 class DeleteLabelSchema(BaseModel):
-    label_id: str = Field(description="The ID of the label to delete")
+    label_id: Optional[str] = Field(
+        default=None, description="The ID of the label to delete"
+    )
+    label_ids: Optional[List[str]] = Field(
+        default=None,
+        description="IDs of several labels to delete at once, instead of label_id.",
+    )
 
 
 class GmailDeleteLabel(GmailBaseTool):
@@ -23,31 +33,85 @@ class GmailDeleteLabel(GmailBaseTool):
     name: str = "delete_gmail_label"
     description: str = (
         "Use this tool to delete a label from Gmail. "
+        "To delete several labels at once, pass their IDs in label_ids. "
         "Note: System labels cannot be deleted."
     )
     args_schema: type[BaseModel] = DeleteLabelSchema
 
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
+    def _batch(self, label_ids: List[str]) -> GoogleApiBatch:
+        batch = GoogleApiBatch(self.api_resource)
+        for label_id in dict.fromkeys(label_ids):
+            batch.add(
+                self.api_resource.users().labels().delete(userId="me", id=label_id),
+                request_id=label_id,
+            )
+        return batch
+
+    def _format_batch_results(self, results: List[BatchResult]) -> str:
+        index = get_label_index(self.api_resource)
+        lines = []
+        for result in results:
+            if result.ok:
+                index.remove(result.request_id)
+                lines.append(f"Label {result.request_id} deleted successfully.")
+            else:
+                self._logger.error(
+                    f"Failed to delete label {result.request_id}: {result.error}"
+                )
+                invalidate_on_stale(self.api_resource, result.error)
+                lines.append(
+                    f"Failed to delete label {result.request_id}: {result.error}"
+                )
+        return "\n".join(lines)
+
     def _run(
         self,
-        label_id: str,
+        label_id: Optional[str] = None,
+        label_ids: Optional[List[str]] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
+        if label_ids:
+            batch = self._batch(([label_id] if label_id else []) + label_ids)
+            return self._format_batch_results(batch.execute())
+        if not label_id:
+            raise ValueError("Either label_id or label_ids must be provided.")
+
         try:
             self.api_resource.users().labels().delete(
                 userId="me", id=label_id
             ).execute()
+            get_label_index(self.api_resource).remove(label_id)
 
             return f"Label {label_id} deleted successfully."
 
         except Exception as e:
             self._logger.error(f"Failed to delete label: {str(e)}")
+            invalidate_on_stale(self.api_resource, e)
             raise
 
     async def _arun(
         self,
-        label_id: str,
+        label_id: Optional[str] = None,
+        label_ids: Optional[List[str]] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        raise NotImplementedError("Async version of this tool is not implemented.")
+        if label_ids:
+            batch = self._batch(([label_id] if label_id else []) + label_ids)
+            return self._format_batch_results(await batch.execute_async())
+        if not label_id:
+            raise ValueError("Either label_id or label_ids must be provided.")
+
+        try:
+            await execute_async(
+                self.api_resource.users().labels().delete(userId="me", id=label_id)
+            )
+            get_label_index(self.api_resource).remove(label_id)
+
+            return f"Label {label_id} deleted successfully."
+
+        except Exception as e:
+            self._logger.error(f"Failed to delete label: {str(e)}")
+            invalidate_on_stale(self.api_resource, e)
+            raise
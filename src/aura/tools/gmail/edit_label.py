@@ -7,6 +7,9 @@ from autogen_core import TRACE_LOGGER_NAME
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from langchain_google_community.gmail.base import GmailBaseTool
 from pydantic import BaseModel, Field
+from utils.google_api import execute_async
+
+from .label_index import LABEL_FIELDS, get_label_index, invalidate_on_stale
 
 
 class EditLabelSchema(BaseModel):
@@ -27,7 +30,8 @@ class GmailEditLabel(GmailBaseTool):
     """Tool for editing existing Gmail labels.
 
     This tool allows modification of existing labels including their name
-    and visibility settings.
+    and visibility settings. Only the changed fields are sent, with a
+    single ``labels.patch`` call.
     """
 
     name: str = "edit_gmail_label"
@@ -37,8 +41,41 @@ class GmailEditLabel(GmailBaseTool):
     )
     args_schema: type[BaseModel] = EditLabelSchema
 
+    response_fields: Optional[str] = Field(
+        default=LABEL_FIELDS,
+        description="Fields of the edited label to download. None returns all of them.",
+    )
+
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
+    def _label_changes(
+        self,
+        new_name: Optional[str],
+        message_list_visibility: Optional[str],
+        label_list_visibility: Optional[str],
+    ) -> dict:
+        # Send only the provided fields; patch leaves the others untouched
+        changes = {}
+        if new_name is not None:
+            changes["name"] = new_name
+        if message_list_visibility is not None:
+            changes["messageListVisibility"] = message_list_visibility
+        if label_list_visibility is not None:
+            changes["labelListVisibility"] = label_list_visibility
+        return changes
+
+    def _patch_request(self, label_id: str, changes: dict):
+        return (
+            self.api_resource.users()
+            .labels()
+            .patch(userId="me", id=label_id, body=changes, fields=self.response_fields)
+        )
+
+    def _update_index(self, label_id: str, result: dict) -> None:
+        # Keep indexed fields the partial response left out
+        index = get_label_index(self.api_resource)
+        index.upsert({**(index.get(label_id) or {}), **result})
+
     def _run(
         self,
         label_id: str,
@@ -48,33 +85,17 @@ class GmailEditLabel(GmailBaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
         try:
-            # Get current label to update only changed fields
-            current_label = (
-                self.api_resource.users()
-                .labels()
-                .get(userId="me", id=label_id)
-                .execute()
-            )
-
-            # Update only provided fields
-            if new_name is not None:
-                current_label["name"] = new_name
-            if message_list_visibility is not None:
-                current_label["messageListVisibility"] = message_list_visibility
-            if label_list_visibility is not None:
-                current_label["labelListVisibility"] = label_list_visibility
-
-            result = (
-                self.api_resource.users()
-                .labels()
-                .update(userId="me", id=label_id, body=current_label)
-                .execute()
+            changes = self._label_changes(
+                new_name, message_list_visibility, label_list_visibility
             )
+            result = self._patch_request(label_id, changes).execute()
+            self._update_index(label_id, result)
 
             return f"Label updated successfully. ID: {result['id']}, Name: {result['name']}"
 
         except Exception as e:
             self._logger.error(f"Failed to edit label: {str(e)}")
+            invalidate_on_stale(self.api_resource, e)
             raise
 
     async def _arun(
@@ -85,4 +106,16 @@ class GmailEditLabel(GmailBaseTool):
         label_list_visibility: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        raise NotImplementedError("Async version of this tool is not implemented.")
+        try:
+            changes = self._label_changes(
+                new_name, message_list_visibility, label_list_visibility
+            )
+            result = await execute_async(self._patch_request(label_id, changes))
+            self._update_index(label_id, result)
+
+            return f"Label updated successfully. ID: {result['id']}, Name: {result['name']}"
+
+        except Exception as e:
+            self._logger.error(f"Failed to edit label: {str(e)}")
+            invalidate_on_stale(self.api_resource, e)
+            raise
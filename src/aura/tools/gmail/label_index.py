@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from utils.cache import TTLCache
+from utils.google_api import account_key
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource  # type: ignore[import]
+
+# Label fields the index keeps; requested as a partial response by the tools
+LABEL_FIELDS = "id,name,type,messageListVisibility,labelListVisibility"
+# Seconds an account's index is trusted before labels are listed again, so
+# changes made in the Gmail UI or by other processes are picked up
+LABEL_INDEX_TTL = 5 * 60
+# Statuses of label writes that mean the index no longer matches Gmail
+STALE_INDEX_STATUSES = (404, 409)
+
+
+class LabelIndex:
+    """In-memory index of a Gmail account's labels, keyed by ID.
+
+    The index is filled from a single ``labels.list`` call and afterwards kept
+    current by the label tools themselves: creates, edits and deletes are
+    written through instead of forcing a refetch. Changes made elsewhere are
+    picked up when the index expires after ``LABEL_INDEX_TTL`` seconds, or
+    sooner when a write finds a label missing or its name taken.
+
+    Every write is numbered with a version. A listing records the version it
+    started at, and writes made while it was in flight are merged into it
+    rather than lost when it is loaded.
+    """
+
+    def __init__(self) -> None:
+        self._by_id: Dict[str, dict] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._versions = itertools.count(1)
+        self._version = 0
+        self._invalidated = 0
+        # Label ID to the version of its last write and the label, or None if
+        # deleted; one entry per label, kept for listings still in flight
+        self._writes: Dict[str, Tuple[int, Optional[dict]]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index holds the account's full label list."""
+        return self._loaded
+
+    @property
+    def version(self) -> int:
+        """Version of the latest write; pass it to :meth:`load` with the listing."""
+        with self._lock:
+            return self._version
+
+    def load(self, labels: List[dict], since: int = 0) -> None:
+        """Replace the index contents with a full label listing.
+
+        Args:
+            labels: The labels returned by ``labels.list``.
+            since: :attr:`version` when the listing was requested. Writes
+                made after it take precedence over the listing, and the index
+                stays unloaded if it was invalidated meanwhile.
+        """
+        with self._lock:
+            self._by_id.clear()
+            for label in labels:
+                self._by_id[label["id"]] = label
+            for label_id, (version, label) in self._writes.items():
+                if version <= since:
+                    continue
+                if label is None:
+                    self._by_id.pop(label_id, None)
+                else:
+                    self._by_id[label_id] = label
+            self._loaded = self._invalidated <= since
+
+    def labels(self) -> List[dict]:
+        """Return all indexed labels in insertion order."""
+        with self._lock:
+            return list(self._by_id.values())
+
+    def get(self, label_id: str) -> Optional[dict]:
+        """Return a copy of the label with the given ID, if indexed."""
+        with self._lock:
+            label = self._by_id.get(label_id)
+            return dict(label) if label is not None else None
+
+    def upsert(self, label: dict) -> None:
+        """Insert or replace a label after a create or edit."""
+        with self._lock:
+            self._by_id[label["id"]] = label
+            self._record(label["id"], label)
+
+    def remove(self, label_id: str) -> None:
+        """Drop a label after it was deleted."""
+        with self._lock:
+            self._by_id.pop(label_id, None)
+            self._record(label_id, None)
+
+    def invalidate(self) -> None:
+        """Forget all labels so the next read refetches them."""
+        with self._lock:
+            self._by_id.clear()
+            self._writes.clear()
+            self._loaded = False
+            self._version = self._invalidated = next(self._versions)
+
+    def _record(self, label_id: str, label: Optional[dict]) -> None:
+        self._version = next(self._versions)
+        self._writes[label_id] = (self._version, label)
+
+
+_indexes: TTLCache[str, LabelIndex] = TTLCache(ttl=LABEL_INDEX_TTL)
+_indexes_lock = threading.Lock()
+
+
+def get_label_index(api_resource: Resource) -> LabelIndex:
+    """Return the label index shared by all tools using the same account.
+
+    An expired index is replaced by an empty one, which the next listing
+    fills again.
+    """
+    key = account_key(api_resource)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = LabelIndex()
+            _indexes.set(key, index)
+        return index
+
+
+def invalidate_on_stale(api_resource: Resource, error: Exception) -> None:
+    """Drop the account's index when a write shows it is out of date."""
+    status = getattr(getattr(error, "resp", None), "status", None)
+    if status in STALE_INDEX_STATUSES:
+        get_label_index(api_resource).invalidate()
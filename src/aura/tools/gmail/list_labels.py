@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional, Type
+from typing import List, Optional, Type
 
 from autogen_core import TRACE_LOGGER_NAME
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from langchain_google_community.gmail.base import GmailBaseTool
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from utils.continuation import get_continuation_store
+from utils.google_api import execute_async
+
+from .label_index import LABEL_FIELDS, get_label_index
 
 
 class ListLabelsSchema(BaseModel):
@@ -26,25 +30,78 @@ class GmailListLabels(GmailBaseTool):
         "Returns both system labels and user-created labels with their IDs."
     )
     args_schema: Type[BaseModel] = ListLabelsSchema
+    response_fields: Optional[str] = Field(
+        default=f"labels({LABEL_FIELDS})",
+        description="Partial response of labels.list. None returns whole labels.",
+    )
+
+    compact_output: bool = Field(
+        default=False,
+        description=(
+            "Name system labels once, since their IDs are their names, list "
+            "user labels as ID=name and hold back labels beyond max_labels "
+            "behind a read_more_results handle."
+        ),
+    )
+    max_labels: int = Field(
+        default=100,
+        description="User labels listed in compact output before the rest is held back.",
+    )
 
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
+    def _format_labels(self, labels: List[dict]) -> str:
+        if not labels:
+            return "No labels found."
+        if self.compact_output:
+            return self._format_compact(labels)
+
+        label_info = []
+        for label in labels:
+            label_info.append(f"ID: {label['id']} - Name: {label['name']}")
+
+        return "\n".join(label_info)
+
+    def _format_compact(self, labels: List[dict]) -> str:
+        system = [label["id"] for label in labels if label.get("type") == "system"]
+        user = [label for label in labels if label.get("type") != "system"]
+
+        lines = []
+        if system:
+            lines.append(f"System labels (ID is the name): {', '.join(system)}")
+        if user:
+            lines.append("User labels (ID=name):")
+            lines += [
+                f"{label['id']}={label['name']}" for label in user[: self.max_labels]
+            ]
+
+        held_back = user[self.max_labels :]
+        if held_back:
+            handle = get_continuation_store().put(
+                [{"id": label["id"], "name": label["name"]} for label in held_back]
+            )
+            lines.append(
+                f'{len(held_back)} more user labels: read_more_results(handle="{handle}").'
+            )
+        return "\n".join(lines)
+
     def _run(
         self,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
         try:
-            results = self.api_resource.users().labels().list(userId="me").execute()
-            labels = results.get("labels", [])
-
-            if not labels:
-                return "No labels found."
-
-            label_info = []
-            for label in labels:
-                label_info.append(f"ID: {label['id']} - Name: {label['name']}")
+            index = get_label_index(self.api_resource)
+            if not index.loaded:
+                since = index.version
+                results = (
+                    self.api_resource.users()
+                    .labels()
+                    .list(userId="me", fields=self.response_fields)
+                    .execute()
+                )
+                index.load(results.get("labels", []), since)
 
-            return "\n".join(label_info)
+            return self._format_labels(index.labels())
 
         except Exception as e:
             self._logger.error(f"Failed to list labels: {str(e)}")
@@ -54,4 +111,19 @@ class GmailListLabels(GmailBaseTool):
         self,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        raise NotImplementedError("Async version of this tool is not implemented.")
+        try:
+            index = get_label_index(self.api_resource)
+            if not index.loaded:
+                since = index.version
+                results = await execute_async(
+                    self.api_resource.users()
+                    .labels()
+                    .list(userId="me", fields=self.response_fields)
+                )
+                index.load(results.get("labels", []), since)
+
+            return self._format_labels(index.labels())
+
+        except Exception as e:
+            self._logger.error(f"Failed to list labels: {str(e)}")
+            raise
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from autogen_core import TRACE_LOGGER_NAME
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from langchain_google_community.gmail.base import GmailBaseTool
 from pydantic import BaseModel, Field
+from utils.google_api import execute_async
+
+
+# Maximum number of message IDs accepted by a single messages.batchModify call
+BATCH_MODIFY_LIMIT = 1000
 
 
 class ModifyEmailLabelsSchema(BaseModel):
-    message_id: str = Field(
-        description="The ID of the email message to modify labels for."
+    message_id: Optional[str] = Field(
+        default=None,
+        description="The ID of the email message to modify labels for.",
+    )
+    message_ids: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "IDs of many email messages to modify in bulk. Use this instead of "
+            "message_id when applying the same label change to several messages."
+        ),
     )
     add_labels: Optional[List[str]] = Field(
         default=None,
@@ -27,41 +41,156 @@ class GmailModifyEmailLabels(GmailBaseTool):
     """Tool for modifying labels on Gmail email messages.
 
     This tool allows adding and removing labels from existing Gmail email messages.
-    You can modify up to 100 labels at a time.
+    You can modify up to 100 labels at a time. When several message IDs are given,
+    the change is applied with ``messages.batchModify`` in chunks of up to 1000
+    messages and a result is reported for each chunk.
     """
 
     name: str = "modify_gmail_email_labels"
     description: str = (
         "Use this tool to modify the labels on an existing Gmail message. "
         "You can add and/or remove labels using their label IDs. "
-        "You can modify up to 100 labels in a single operation."
+        "You can modify up to 100 labels in a single operation. "
+        "To apply the same change to many messages at once, pass their IDs "
+        "in message_ids instead of calling this tool once per message."
     )
     args_schema: type[BaseModel] = ModifyEmailLabelsSchema
+    response_fields: Optional[str] = Field(
+        default="id,labelIds",
+        description="Fields of the modified message to download. None returns all of them.",
+    )
+    max_concurrency: int = Field(
+        default=2,
+        description=(
+            "Maximum number of batchModify calls in flight at once, to stay "
+            "within Gmail's per-user rate limits."
+        ),
+    )
 
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
-    def _run(
+    def _label_changes(
+        self, add_labels: Optional[List[str]], remove_labels: Optional[List[str]]
+    ) -> dict:
+        # Prepare the modification request
+        body = {}
+        if add_labels:
+            body["addLabelIds"] = add_labels
+        if remove_labels:
+            body["removeLabelIds"] = remove_labels
+        return body
+
+    def _modify_request(
         self,
         message_id: str,
+        add_labels: Optional[List[str]],
+        remove_labels: Optional[List[str]],
+    ):
+        body = self._label_changes(add_labels, remove_labels)
+
+        return (
+            self.api_resource.users()
+            .messages()
+            .modify(userId="me", id=message_id, body=body, fields=self.response_fields)
+        )
+
+    def _batch_modify_request(
+        self,
+        message_ids: List[str],
+        add_labels: Optional[List[str]],
+        remove_labels: Optional[List[str]],
+    ):
+        body = self._label_changes(add_labels, remove_labels)
+        body["ids"] = message_ids
+
+        return self.api_resource.users().messages().batchModify(userId="me", body=body)
+
+    def _chunk_ids(
+        self, message_id: Optional[str], message_ids: Optional[List[str]]
+    ) -> List[List[str]]:
+        ids = list(dict.fromkeys(([message_id] if message_id else []) + message_ids))
+        return [
+            ids[i : i + BATCH_MODIFY_LIMIT]
+            for i in range(0, len(ids), BATCH_MODIFY_LIMIT)
+        ]
+
+    def _format_chunk_results(
+        self, results: List[Tuple[List[str], Optional[Exception]]]
+    ) -> str:
+        lines = []
+        failed = 0
+        for i, (chunk, error) in enumerate(results, start=1):
+            span = f"Chunk {i}/{len(results)} ({len(chunk)} messages, {chunk[0]}..{chunk[-1]})"
+            if error is None:
+                lines.append(f"{span}: labels modified successfully.")
+            else:
+                failed += len(chunk)
+                lines.append(f"{span}: failed - {error}")
+
+        total = sum(len(chunk) for chunk, _ in results)
+        lines.insert(0, f"Modified labels for {total - failed} of {total} messages.")
+        return "\n".join(lines)
+
+    def _run_bulk(
+        self,
+        chunks: List[List[str]],
+        add_labels: Optional[List[str]],
+        remove_labels: Optional[List[str]],
+    ) -> str:
+        results = []
+        for chunk in chunks:
+            try:
+                self._batch_modify_request(chunk, add_labels, remove_labels).execute()
+                results.append((chunk, None))
+            except Exception as e:
+                self._logger.error(f"Failed to modify labels for chunk: {str(e)}")
+                results.append((chunk, e))
+
+        return self._format_chunk_results(results)
+
+    async def _arun_bulk(
+        self,
+        chunks: List[List[str]],
+        add_labels: Optional[List[str]],
+        remove_labels: Optional[List[str]],
+    ) -> str:
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def modify(chunk: List[str]) -> Tuple[List[str], Optional[Exception]]:
+            try:
+                async with semaphore:
+                    await execute_async(
+                        self._batch_modify_request(chunk, add_labels, remove_labels)
+                    )
+                return chunk, None
+            except Exception as e:
+                self._logger.error(f"Failed to modify labels for chunk: {str(e)}")
+                return chunk, e
+
+        results = await asyncio.gather(*(modify(chunk) for chunk in chunks))
+
+        return self._format_chunk_results(results)
+
+    def _run(
+        self,
+        message_id: Optional[str] = None,
+        message_ids: Optional[List[str]] = None,
         add_labels: Optional[List[str]] = None,
         remove_labels: Optional[List[str]] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        try:
-            # Prepare the modification request
-            body = {}
-            if add_labels:
-                body["addLabelIds"] = add_labels
-            if remove_labels:
-                body["removeLabelIds"] = remove_labels
+        if message_ids:
+            return self._run_bulk(
+                self._chunk_ids(message_id, message_ids), add_labels, remove_labels
+            )
+        if not message_id:
+            raise ValueError("Either message_id or message_ids must be provided.")
 
+        try:
             # Execute the modification
-            result = (
-                self.api_resource.users()
-                .messages()
-                .modify(userId="me", id=message_id, body=body)
-                .execute()
-            )
+            result = self._modify_request(
+                message_id, add_labels, remove_labels
+            ).execute()
 
             # Return success message with updated label IDs
             return f"Successfully modified labels for message {message_id}. Current labels: {result.get('labelIds', [])}"
@@ -72,9 +201,26 @@ class GmailModifyEmailLabels(GmailBaseTool):
 
     async def _arun(
         self,
-        message_id: str,
+        message_id: Optional[str] = None,
+        message_ids: Optional[List[str]] = None,
         add_labels: Optional[List[str]] = None,
         remove_labels: Optional[List[str]] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        raise NotImplementedError("Async version of this tool is not implemented.")
+        if message_ids:
+            return await self._arun_bulk(
+                self._chunk_ids(message_id, message_ids), add_labels, remove_labels
+            )
+        if not message_id:
+            raise ValueError("Either message_id or message_ids must be provided.")
+
+        try:
+            result = await execute_async(
+                self._modify_request(message_id, add_labels, remove_labels)
+            )
+
+            return f"Successfully modified labels for message {message_id}. Current labels: {result.get('labelIds', [])}"
+
+        except Exception as e:
+            self._logger.error(f"Failed to modify labels: {str(e)}")
+            raise
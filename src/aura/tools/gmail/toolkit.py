@@ -48,6 +48,10 @@ class GmailToolkitExt(BaseToolkit):
     """
 
     api_resource: Resource = Field(default_factory=build_resource_service)
+    compact_output: bool = Field(
+        default=False,
+        description="Shorten label listings, keeping the rest behind a handle.",
+    )
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -59,6 +63,8 @@ class GmailToolkitExt(BaseToolkit):
             GmailCreateLabel(api_resource=self.api_resource),
             GmailDeleteLabel(api_resource=self.api_resource),
             GmailEditLabel(api_resource=self.api_resource),
-            GmailListLabels(api_resource=self.api_resource),
+            GmailListLabels(
+                api_resource=self.api_resource, compact_output=self.compact_output
+            ),
             GmailModifyEmailLabels(api_resource=self.api_resource),
         ]
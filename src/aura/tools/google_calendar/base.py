@@ -1,10 +1,15 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, List
 
+from googleapiclient.errors import HttpError
 from langchain_community.tools.gmail.utils import (
     build_resource_service,
 )
 from langchain_core.tools import BaseTool
 from pydantic import Field
+from utils.google_api import account_key, execute_async
+
+from .sync import mark_mirrors_stale
+from .utils import selected_calendars_cache
 
 
 if TYPE_CHECKING:
@@ -18,6 +23,10 @@ else:
         pass
 
 
+# Partial response of calendarList.list, all that calendar selection reads
+CALENDAR_LIST_FIELDS = "items(id,selected),nextPageToken"
+
+
 class GoogleCalendarBaseTool(BaseTool):
     """Base class for Google Calendar tools."""
 
@@ -34,3 +43,67 @@ class GoogleCalendarBaseTool(BaseTool):
             A tool.
         """
         return cls(api_resource=api_resource)
+
+    def _select_calendars(self, calendar_list: Dict[str, Any]) -> List[str]:
+        calendars = []
+        for cal in calendar_list.get("items", []):
+            if cal.get("selected", None):
+                calendars.append(cal["id"])
+        return calendars
+
+    def _get_calendars(self):
+        account = account_key(self.api_resource)
+        calendars = selected_calendars_cache.get(account)
+        if calendars is not None:
+            return calendars
+
+        try:
+            calendars, page_token = [], None
+            while True:
+                calendar_list = (
+                    self.api_resource.calendarList()
+                    .list(fields=CALENDAR_LIST_FIELDS, pageToken=page_token)
+                    .execute()
+                )
+                calendars += self._select_calendars(calendar_list)
+                page_token = calendar_list.get("nextPageToken")
+                if not page_token:
+                    break
+            selected_calendars_cache.set(account, calendars)
+            return calendars
+        except HttpError as error:
+            self._logger.error(f"Failed to retrieve calendar list: {error}")
+            raise
+
+    async def _aget_calendars(self):
+        account = account_key(self.api_resource)
+        calendars = selected_calendars_cache.get(account)
+        if calendars is not None:
+            return calendars
+
+        try:
+            calendars, page_token = [], None
+            while True:
+                calendar_list = await execute_async(
+                    self.api_resource.calendarList().list(
+                        fields=CALENDAR_LIST_FIELDS, pageToken=page_token
+                    )
+                )
+                calendars += self._select_calendars(calendar_list)
+                page_token = calendar_list.get("nextPageToken")
+                if not page_token:
+                    break
+            selected_calendars_cache.set(account, calendars)
+            return calendars
+        except HttpError as error:
+            self._logger.error(f"Failed to retrieve calendar list: {error}")
+            raise
+
+    def _forget_missing_calendar(self, error: HttpError) -> None:
+        # A selected calendar was deleted or unshared; list them again next time
+        if error.resp.status == 404:
+            selected_calendars_cache.invalidate(account_key(self.api_resource))
+
+    def _mark_mirrors_stale(self) -> None:
+        # An event was written; the next listing must not skip the delta sync
+        mark_mirrors_stale(self.api_resource)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from autogen_core import TRACE_LOGGER_NAME
+from langchain.callbacks.manager import CallbackManagerForToolRun
+from pydantic import BaseModel, Field
+from utils.google_api import execute, execute_async
+from utils.timezone import get_local_timezone, get_zone
+
+from .base import GoogleCalendarBaseTool
+from .utils import parse_and_format_datetime
+
+# freebusy.query answers for at most 50 calendars per request
+FREEBUSY_MAX_CALENDARS = 50
+
+
+def merge_intervals(
+    intervals: Iterable[Tuple[float, float, str]],
+) -> List[Tuple[float, float, List[str]]]:
+    """Merge overlapping or touching intervals into disjoint blocks.
+
+    Each block carries the sorted, distinct labels of the intervals it covers.
+    """
+    merged: List[Tuple[float, float, List[str]]] = []
+    for start, end, label in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            block_start, block_end, labels = merged[-1]
+            if label not in labels:
+                labels.append(label)
+            merged[-1] = (block_start, max(block_end, end), labels)
+        else:
+            merged.append((start, end, [label]))
+    return [(start, end, sorted(labels)) for start, end, labels in merged]
+
+
+class CheckConflictsSchema(BaseModel):
+    # https://developers.google.com/calendar/api/v3/reference/freebusy/query
+    start_datetime: str = Field(
+        description=(
+            "The start of the time slot to check in format YYYY-MM-DDTHH:MM:SS, "
+            "without timezone info."
+        )
+    )
+    end_datetime: str = Field(
+        description=(
+            "The end of the time slot to check in format YYYY-MM-DDTHH:MM:SS, "
+            "without timezone info."
+        )
+    )
+    calendar_ids: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Calendars to check. Defaults to all of the user's selected calendars."
+        ),
+    )
+    timezone: Optional[str] = Field(
+        default=None,
+        description="The timezone in TZ Database Name format, e.g. 'America/New_York'. Defaults to the user's local timezone.",
+    )
+
+
+class GoogleCalendarCheckConflicts(GoogleCalendarBaseTool):
+    """Tool for checking a time slot for conflicts in Google Calendar.
+
+    Busy times of all calendars are fetched with a single freebusy query and
+    merged locally, so only the overlapping blocks are returned.
+    """
+
+    name: str = "check_google_calendar_conflicts"
+    description: str = (
+        " Use this tool to check whether a time slot conflicts with existing"
+        " events before creating or moving an event. The input must be the"
+        " start and end datetime of the slot. The output lists the busy blocks"
+        " overlapping the slot and the calendars they come from, or states"
+        " that the slot is free."
+    )
+    args_schema: Type[BaseModel] = CheckConflictsSchema
+
+    _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
+
+    def _freebusy_requests(
+        self, calendars: List[str], start_rfc: str, end_rfc: str, timezone: str
+    ) -> List[Any]:
+        return [
+            self.api_resource.freebusy().query(
+                body={
+                    "timeMin": start_rfc,
+                    "timeMax": end_rfc,
+                    "timeZone": timezone,
+                    "items": [
+                        {"id": cal}
+                        for cal in calendars[start : start + FREEBUSY_MAX_CALENDARS]
+                    ],
+                }
+            )
+            for start in range(0, len(calendars), FREEBUSY_MAX_CALENDARS)
+        ]
+
+    def _find_conflicts(
+        self,
+        responses: List[Dict[str, Any]],
+        start_rfc: str,
+        end_rfc: str,
+    ) -> Tuple[List[Tuple[float, float, List[str]]], List[str]]:
+        slot_start = datetime.fromisoformat(start_rfc).timestamp()
+        slot_end = datetime.fromisoformat(end_rfc).timestamp()
+
+        busy = []
+        errors = []
+        for response in responses:
+            for cal, result in response.get("calendars", {}).items():
+                for error in result.get("errors", []):
+                    errors.append(f"{cal}: {error.get('reason', 'unknown error')}")
+                for block in result.get("busy", []):
+                    start = datetime.fromisoformat(block["start"]).timestamp()
+                    end = datetime.fromisoformat(block["end"]).timestamp()
+                    # Clip before merging, so a calendar busy only outside the
+                    # slot is not credited with another calendar's conflict
+                    if start < slot_end and end > slot_start:
+                        busy.append((max(start, slot_start), min(end, slot_end), cal))
+
+        return merge_intervals(busy), errors
+
+    def _format_conflicts(
+        self,
+        conflicts: List[Tuple[float, float, List[str]]],
+        errors: List[str],
+        timezone: str,
+    ) -> str:
+        zone = get_zone(timezone)
+        if conflicts:
+            lines = [f"Found {len(conflicts)} conflict(s):"]
+            for start, end, cals in conflicts:
+                start_str = datetime.fromtimestamp(start, zone).strftime(
+                    "%Y/%m/%d %H:%M:%S"
+                )
+                end_str = datetime.fromtimestamp(end, zone).strftime(
+                    "%Y/%m/%d %H:%M:%S"
+                )
+                lines.append(f"- {start_str} - {end_str} (busy in: {', '.join(cals)})")
+        else:
+            lines = ["No conflicts, the time slot is free."]
+
+        if errors:
+            lines.append(f"Could not check: {'; '.join(errors)}")
+        return "\n".join(lines)
+
+    def _prepare(
+        self, start_datetime: str, end_datetime: str, timezone: Optional[str]
+    ) -> Tuple[str, str, str]:
+        if timezone is None:
+            zone_info = get_local_timezone()
+            timezone = str(zone_info)
+
+        return parse_and_format_datetime(start_datetime, end_datetime, timezone)
+
+    def _run(
+        self,
+        start_datetime: str,
+        end_datetime: str,
+        calendar_ids: Optional[List[str]] = None,
+        timezone: Optional[str] = None,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        try:
+            calendars = calendar_ids or self._get_calendars()
+            start_rfc, end_rfc, timezone = self._prepare(
+                start_datetime, end_datetime, timezone
+            )
+
+            responses = [
+                execute(request)
+                for request in self._freebusy_requests(
+                    calendars, start_rfc, end_rfc, timezone
+                )
+            ]
+            conflicts, errors = self._find_conflicts(responses, start_rfc, end_rfc)
+            return self._format_conflicts(conflicts, errors, timezone)
+        except Exception as e:
+            self._logger.error(f"Failed to check calendar conflicts: {str(e)}")
+            raise
+
+    async def _arun(
+        self,
+        start_datetime: str,
+        end_datetime: str,
+        calendar_ids: Optional[List[str]] = None,
+        timezone: Optional[str] = None,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        try:
+            calendars = calendar_ids or await self._aget_calendars()
+            start_rfc, end_rfc, timezone = self._prepare(
+                start_datetime, end_datetime, timezone
+            )
+
+            responses = [
+                await execute_async(request)
+                for request in self._freebusy_requests(
+                    calendars, start_rfc, end_rfc, timezone
+                )
+            ]
+            conflicts, errors = self._find_conflicts(responses, start_rfc, end_rfc)
+            return self._format_conflicts(conflicts, errors, timezone)
+        except Exception as e:
+            self._logger.error(f"Failed to check calendar conflicts: {str(e)}")
+            raise
@@ -1,17 +1,39 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional, Type
+from typing import Any, List, Optional, Type
 
 from autogen_core import TRACE_LOGGER_NAME
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from pydantic import BaseModel, Field
+from utils.google_api import execute_async
+from utils.google_batch import BatchResult, GoogleApiBatch
 from utils.timezone import get_local_timezone
 
 from .base import GoogleCalendarBaseTool
 from .utils import parse_and_format_datetime
 
 
+class AdditionalEventSchema(BaseModel):
+    start_datetime: str = Field(
+        description="The start datetime in format YYYY-MM-DDTHH:MM:SS, without timezone info."
+    )
+    end_datetime: str = Field(
+        description="The end datetime in format YYYY-MM-DDTHH:MM:SS, without timezone info."
+    )
+    summary: str = Field(description="The title of the event.")
+    location: Optional[str] = Field(
+        default="", description="The location of the event."
+    )
+    description: Optional[str] = Field(
+        default="", description="The description of the event. Optional."
+    )
+    attendees: Optional[list[str]] = Field(
+        default=None,
+        description="List of email addresses of attendees to invite to the event.",
+    )
+
+
 class CreateEventSchema(BaseModel):
     # https://developers.google.com/calendar/api/v3/reference/events/insert
 
@@ -51,6 +73,13 @@ class CreateEventSchema(BaseModel):
         default=None,
         description="List of email addresses of attendees to invite to the event.",
     )
+    additional_events: Optional[List[AdditionalEventSchema]] = Field(
+        default=None,
+        description=(
+            "Further events to create in the same call, in the same timezone. "
+            "Use this instead of calling the tool once per event."
+        ),
+    )
 
 
 class GoogleCalendarCreateEvent(GoogleCalendarBaseTool):
@@ -65,12 +94,93 @@ class GoogleCalendarCreateEvent(GoogleCalendarBaseTool):
     description: str = (
         " Use this tool to create a new calendar event in user's primary calendar."
         " The input must be the start and end datetime for the event, and"
-        " the title of the event. You can also specify the location and description"
+        " the title of the event. You can also specify the location and description."
+        " Several events can be created at once through additional_events."
     )
     args_schema: Type[BaseModel] = CreateEventSchema
+    response_fields: Optional[str] = Field(
+        default="id,htmlLink",
+        description="Fields of the created event to download. None returns all of them.",
+    )
 
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
+    def _build_event_body(
+        self,
+        start_datetime: str,
+        end_datetime: str,
+        summary: str,
+        location: str,
+        description: str,
+        timezone: Optional[str],
+        attendees: Optional[list[str]],
+    ) -> dict:
+        if timezone is None:
+            zone_info = get_local_timezone()
+            timezone = str(zone_info)
+
+        start_rfc, end_rfc, timezone = parse_and_format_datetime(
+            start_datetime, end_datetime, timezone
+        )
+
+        body = {
+            "summary": summary,
+            "start": {"dateTime": start_rfc, "timeZone": timezone},
+            "end": {"dateTime": end_rfc, "timeZone": timezone},
+        }
+
+        if location != "":
+            body["location"] = location
+        if description != "":
+            body["description"] = description
+
+        if attendees:
+            body["attendees"] = [{"email": email} for email in attendees]
+
+        return body
+
+    def _batch(
+        self,
+        first_event: dict,
+        additional_events: List[Any],
+        timezone: Optional[str],
+    ) -> GoogleApiBatch:
+        batch = GoogleApiBatch(self.api_resource)
+        events = [first_event] + [
+            event if isinstance(event, dict) else event.model_dump()
+            for event in additional_events
+        ]
+        for event in events:
+            body = self._build_event_body(
+                event["start_datetime"],
+                event["end_datetime"],
+                event["summary"],
+                event.get("location") or "",
+                event.get("description") or "",
+                timezone,
+                event.get("attendees"),
+            )
+            batch.add(
+                self.api_resource.events().insert(
+                    calendarId="primary", body=body, fields=self.response_fields
+                )
+            )
+        return batch
+
+    def _format_batch_results(self, results: List[BatchResult]) -> str:
+        self._mark_mirrors_stale()
+        lines = []
+        for result in results:
+            if result.ok:
+                event = result.response
+                lines.append(
+                    f"Event created: {event.get('htmlLink')} (ID: {event.get('id')})"
+                )
+            else:
+                self._logger.error(f"Failed to create calendar event: {result.error}")
+                lines.append(f"Failed to create event: {result.error}")
+        return "\n".join(lines)
+
     def _run(
         self,
         start_datetime: str,
@@ -80,37 +190,39 @@ class GoogleCalendarCreateEvent(GoogleCalendarBaseTool):
         description: str = "",
         timezone: str = None,
         attendees: Optional[list[str]] = None,
+        additional_events: Optional[List[Any]] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        try:
-            if timezone is None:
-                zone_info = get_local_timezone()
-                timezone = str(zone_info)
-
-            start_rfc, end_rfc, timezone = parse_and_format_datetime(
-                start_datetime, end_datetime, timezone
+        if additional_events:
+            first_event = dict(
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                summary=summary,
+                location=location,
+                description=description,
+                attendees=attendees,
             )
+            batch = self._batch(first_event, additional_events, timezone)
+            return self._format_batch_results(batch.execute())
 
+        try:
             calendar = "primary"
-            body = {
-                "summary": summary,
-                "start": {"dateTime": start_rfc, "timeZone": timezone},
-                "end": {"dateTime": end_rfc, "timeZone": timezone},
-            }
-
-            if location != "":
-                body["location"] = location
-            if description != "":
-                body["description"] = description
-
-            if attendees:
-                body["attendees"] = [{"email": email} for email in attendees]
+            body = self._build_event_body(
+                start_datetime,
+                end_datetime,
+                summary,
+                location,
+                description,
+                timezone,
+                attendees,
+            )
 
             event = (
                 self.api_resource.events()
-                .insert(calendarId=calendar, body=body)
+                .insert(calendarId=calendar, body=body, fields=self.response_fields)
                 .execute()
             )
+            self._mark_mirrors_stale()
 
             return f"Event created: {event.get('htmlLink')} (ID: {event.get('id')})"
         except Exception as e:
@@ -124,7 +236,43 @@ class GoogleCalendarCreateEvent(GoogleCalendarBaseTool):
         summary: str,
         location: str = "",
         description: str = "",
+        timezone: str = None,
+        attendees: Optional[list[str]] = None,
+        additional_events: Optional[List[Any]] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
+        if additional_events:
+            first_event = dict(
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                summary=summary,
+                location=location,
+                description=description,
+                attendees=attendees,
+            )
+            batch = self._batch(first_event, additional_events, timezone)
+            return self._format_batch_results(await batch.execute_async())
+
+        try:
+            calendar = "primary"
+            body = self._build_event_body(
+                start_datetime,
+                end_datetime,
+                summary,
+                location,
+                description,
+                timezone,
+                attendees,
+            )
+
+            event = await execute_async(
+                self.api_resource.events().insert(
+                    calendarId=calendar, body=body, fields=self.response_fields
+                )
+            )
+            self._mark_mirrors_stale()
 
-        raise NotImplementedError("Async version of this tool is not implemented.")
+            return f"Event created: {event.get('htmlLink')} (ID: {event.get('id')})"
+        except Exception as e:
+            self._logger.error(f"Failed to create calendar event: {str(e)}")
+            raise
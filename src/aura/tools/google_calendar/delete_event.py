@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional, Type
+from typing import List, Optional, Type
 
 from autogen_core import TRACE_LOGGER_NAME
 from googleapiclient.errors import HttpError
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from pydantic import BaseModel, Field
+from utils.google_api import execute_async
+from utils.google_batch import BatchResult, GoogleApiBatch
 
 from .base import GoogleCalendarBaseTool
 
 
 class DeleteEventSchema(BaseModel):
-    event_id: str = Field(
-        description="The unique identifier for the calendar event to delete"
+    event_id: Optional[str] = Field(
+        default=None,
+        description="The unique identifier for the calendar event to delete",
+    )
+    event_ids: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Identifiers of several events to delete at once. Use this instead of "
+            "event_id when deleting more than one event from the same calendar."
+        ),
     )
     calendar_id: str = Field(
         default="primary",
@@ -42,22 +52,61 @@ class GoogleCalendarDeleteEvent(GoogleCalendarBaseTool):
         "Use this tool to delete an existing calendar event."
         " You need to provide the event ID to delete the specific event."
         " The event ID can be obtained from the list_google_calendar_events tool."
+        " To delete several events at once, pass their IDs in event_ids."
     )
     args_schema: Type[BaseModel] = DeleteEventSchema
 
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
+    def _batch(
+        self, event_ids: List[str], calendar_id: str, send_updates: str
+    ) -> GoogleApiBatch:
+        batch = GoogleApiBatch(self.api_resource)
+        for event_id in dict.fromkeys(event_ids):
+            batch.add(
+                self.api_resource.events().delete(
+                    calendarId=calendar_id, eventId=event_id, sendUpdates=send_updates
+                ),
+                request_id=event_id,
+            )
+        return batch
+
+    def _format_batch_results(self, results: List[BatchResult]) -> str:
+        self._mark_mirrors_stale()
+        lines = []
+        for result in results:
+            if result.ok:
+                lines.append(f"Successfully deleted event {result.request_id}")
+            else:
+                self._logger.error(
+                    f"Failed to delete calendar event {result.request_id}: {result.error}"
+                )
+                lines.append(
+                    f"Failed to delete event {result.request_id}: {result.error}"
+                )
+        return "\n".join(lines)
+
     def _run(
         self,
-        event_id: str,
+        event_id: Optional[str] = None,
+        event_ids: Optional[List[str]] = None,
         calendar_id: str = "primary",
         send_updates: str = "all",
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
+        if event_ids:
+            batch = self._batch(
+                ([event_id] if event_id else []) + event_ids, calendar_id, send_updates
+            )
+            return self._format_batch_results(batch.execute())
+        if not event_id:
+            raise ValueError("Either event_id or event_ids must be provided.")
+
         try:
             self.api_resource.events().delete(
                 calendarId=calendar_id, eventId=event_id, sendUpdates=send_updates
             ).execute()
+            self._mark_mirrors_stale()
 
             return f"Successfully deleted event {event_id}"
         except HttpError as error:
@@ -69,8 +118,32 @@ class GoogleCalendarDeleteEvent(GoogleCalendarBaseTool):
 
     async def _arun(
         self,
-        event_id: str,
+        event_id: Optional[str] = None,
+        event_ids: Optional[List[str]] = None,
         calendar_id: str = "primary",
+        send_updates: str = "all",
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        raise NotImplementedError("Async version of this tool is not implemented.")
+        if event_ids:
+            batch = self._batch(
+                ([event_id] if event_id else []) + event_ids, calendar_id, send_updates
+            )
+            return self._format_batch_results(await batch.execute_async())
+        if not event_id:
+            raise ValueError("Either event_id or event_ids must be provided.")
+
+        try:
+            await execute_async(
+                self.api_resource.events().delete(
+                    calendarId=calendar_id, eventId=event_id, sendUpdates=send_updates
+                )
+            )
+            self._mark_mirrors_stale()
+
+            return f"Successfully deleted event {event_id}"
+        except HttpError as error:
+            self._logger.error(f"Failed to delete calendar event: {error}")
+            raise
+        except Exception as e:
+            self._logger.error(f"Unexpected error deleting calendar event: {str(e)}")
+            raise
@@ -7,6 +7,7 @@ from autogen_core import TRACE_LOGGER_NAME
 from googleapiclient.errors import HttpError
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from pydantic import BaseModel, Field
+from utils.google_api import execute_async
 from utils.timezone import get_local_timezone
 
 from .base import GoogleCalendarBaseTool
@@ -98,9 +99,67 @@ class GoogleCalendarEditEvent(GoogleCalendarBaseTool):
         "You can update the title, times, description, location, and attendees."
     )
     args_schema: Type[BaseModel] = EditEventSchema
+    response_fields: Optional[str] = Field(
+        default="id,htmlLink",
+        description="Fields of the updated event to download. None returns all of them.",
+    )
 
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
+    def _apply_changes(
+        self,
+        event: dict,
+        summary: Optional[str],
+        start_datetime: Optional[str],
+        end_datetime: Optional[str],
+        description: Optional[str],
+        location: Optional[str],
+        add_attendees: Optional[List[str]],
+        remove_attendees: Optional[List[str]],
+        timezone: Optional[str],
+    ) -> None:
+        # Update fields if provided
+        if summary is not None:
+            event["summary"] = summary
+
+        if start_datetime is not None and end_datetime is not None:
+            if timezone is None:
+                timezone = str(get_local_timezone())
+
+            start_rfc, end_rfc, timezone = parse_and_format_datetime(
+                start_datetime, end_datetime, timezone
+            )
+
+            event["start"] = {"dateTime": start_rfc, "timeZone": timezone}
+            event["end"] = {"dateTime": end_rfc, "timeZone": timezone}
+
+        if description is not None:
+            event["description"] = description
+
+        if location is not None:
+            event["location"] = location
+
+        # Handle attendees
+        current_attendees = event.get("attendees", [])
+
+        if add_attendees:
+            # Add new attendees
+            new_attendees = [
+                {"email": email}
+                for email in add_attendees
+                if email not in [a["email"] for a in current_attendees]
+            ]
+            current_attendees.extend(new_attendees)
+
+        if remove_attendees:
+            # Remove specified attendees
+            current_attendees = [
+                a for a in current_attendees if a["email"] not in remove_attendees
+            ]
+
+        if add_attendees or remove_attendees:
+            event["attendees"] = current_attendees
+
     def _run(
         self,
         event_id: str,
@@ -126,47 +185,17 @@ class GoogleCalendarEditEvent(GoogleCalendarBaseTool):
                 .execute()
             )
 
-            # Update fields if provided
-            if summary is not None:
-                event["summary"] = summary
-
-            if start_datetime is not None and end_datetime is not None:
-                if timezone is None:
-                    timezone = str(get_local_timezone())
-
-                start_rfc, end_rfc, timezone = parse_and_format_datetime(
-                    start_datetime, end_datetime, timezone
-                )
-
-                event["start"] = {"dateTime": start_rfc, "timeZone": timezone}
-                event["end"] = {"dateTime": end_rfc, "timeZone": timezone}
-
-            if description is not None:
-                event["description"] = description
-
-            if location is not None:
-                event["location"] = location
-
-            # Handle attendees
-            current_attendees = event.get("attendees", [])
-
-            if add_attendees:
-                # Add new attendees
-                new_attendees = [
-                    {"email": email}
-                    for email in add_attendees
-                    if email not in [a["email"] for a in current_attendees]
-                ]
-                current_attendees.extend(new_attendees)
-
-            if remove_attendees:
-                # Remove specified attendees
-                current_attendees = [
-                    a for a in current_attendees if a["email"] not in remove_attendees
-                ]
-
-            if add_attendees or remove_attendees:
-                event["attendees"] = current_attendees
+            self._apply_changes(
+                event,
+                summary,
+                start_datetime,
+                end_datetime,
+                description,
+                location,
+                add_attendees,
+                remove_attendees,
+                timezone,
+            )
 
             # Update the event
             updated_event = (
@@ -178,9 +207,11 @@ class GoogleCalendarEditEvent(GoogleCalendarBaseTool):
                     sendUpdates=send_updates,
                     supportsAttachments=supports_attachments,
                     conferenceDataVersion=conference_data_version,
+                    fields=self.response_fields,
                 )
                 .execute()
             )
+            self._mark_mirrors_stale()
 
             return f"Successfully updated event: {updated_event.get('htmlLink')} (ID: {updated_event.get('id')})"
 
@@ -203,6 +234,50 @@ class GoogleCalendarEditEvent(GoogleCalendarBaseTool):
         add_attendees: Optional[List[str]] = None,
         remove_attendees: Optional[List[str]] = None,
         timezone: Optional[str] = None,
+        send_updates: str = "all",
+        supports_attachments: bool = False,
+        conference_data_version: int = 0,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        raise NotImplementedError("Async version of this tool is not implemented.")
+        try:
+            events = self.api_resource.events()
+
+            # Get the existing event
+            event = await execute_async(
+                events.get(calendarId=calendar_id, eventId=event_id)
+            )
+
+            self._apply_changes(
+                event,
+                summary,
+                start_datetime,
+                end_datetime,
+                description,
+                location,
+                add_attendees,
+                remove_attendees,
+                timezone,
+            )
+
+            # Update the event
+            updated_event = await execute_async(
+                events.update(
+                    calendarId=calendar_id,
+                    eventId=event_id,
+                    body=event,
+                    sendUpdates=send_updates,
+                    supportsAttachments=supports_attachments,
+                    conferenceDataVersion=conference_data_version,
+                    fields=self.response_fields,
+                )
+            )
+            self._mark_mirrors_stale()
+
+            return f"Successfully updated event: {updated_event.get('htmlLink')} (ID: {updated_event.get('id')})"
+
+        except HttpError as error:
+            self._logger.error(f"Failed to update calendar event: {error}")
+            raise
+        except Exception as e:
+            self._logger.error(f"Unexpected error updating calendar event: {str(e)}")
+            raise
@@ -0,0 +1,223 @@
+"""SQLite persistence for synchronized calendar events."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_EVENT_STORE_FILE = "calendar_events.sqlite"
+# Bumped when the tables change; older stores are dropped and synced again
+SCHEMA_VERSION = 3
+# Events longer than this many seconds are kept aside by range queries
+DEFAULT_LONG_THRESHOLD = 86400.0
+
+# (event_id, start, end, all_day, event)
+StoredEvent = Tuple[str, float, float, bool, Dict[str, Any]]
+# (start, end) in epoch seconds
+SyncWindow = Tuple[float, float]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    account TEXT NOT NULL,
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    all_day INTEGER NOT NULL,
+    long INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (account, calendar_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS events_by_start
+    ON events (account, calendar_id, all_day, long, start_ts);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account TEXT NOT NULL,
+    calendar_id TEXT NOT NULL,
+    sync_token TEXT,
+    window_start REAL,
+    window_end REAL,
+    PRIMARY KEY (account, calendar_id)
+);
+"""
+
+_OVERLAPPING = """
+SELECT start_ts, event_id, payload FROM events
+WHERE account = :account AND calendar_id = :calendar_id AND all_day = :all_day
+    AND long = 0 AND start_ts >= :start - :threshold AND start_ts < :end
+    AND end_ts > :start
+UNION ALL
+SELECT start_ts, event_id, payload FROM events
+WHERE account = :account AND calendar_id = :calendar_id AND all_day = :all_day
+    AND long = 1 AND start_ts < :end AND end_ts > :start
+ORDER BY start_ts, event_id
+LIMIT :limit
+"""
+
+
+def default_event_store_path() -> str:
+    """Return the absolute path of the store next to the OAuth token file."""
+    from utils.google_auth import DEFAULT_TOKEN_FILE
+
+    token_dir = os.path.dirname(os.path.abspath(DEFAULT_TOKEN_FILE))
+    return os.path.join(token_dir, DEFAULT_EVENT_STORE_FILE)
+
+
+class EventStore:
+    """Store of mirrored events and sync state, one row per event.
+
+    Timestamps are epoch seconds for timed events and floating (zone-less)
+    seconds for all-day events, as produced by the calendar mirror. Range
+    queries read only the matching rows: an event up to ``long_threshold``
+    seconds long that overlaps ``[a, b)`` must start within
+    ``[a - long_threshold, b)``, which the start index finds directly. The rare
+    longer events (multi-day ones) are flagged and checked separately.
+
+    Args:
+        path: SQLite database file, or ``":memory:"`` for a throwaway store.
+        long_threshold: Length in seconds above which an event is flagged long.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_EVENT_STORE_FILE,
+        long_threshold: float = DEFAULT_LONG_THRESHOLD,
+    ):
+        self.path = path
+        self.long_threshold = long_threshold
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+            if version < SCHEMA_VERSION:
+                # The mirror is a cache, so an outdated store is rebuilt by a full sync
+                self._connection.executescript(
+                    "DROP TABLE IF EXISTS events; DROP TABLE IF EXISTS sync_state;"
+                )
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def load_state(
+        self, account: str, calendar_id: str
+    ) -> Tuple[Optional[str], Optional[SyncWindow]]:
+        """Return the sync token and sync window of a calendar."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT sync_token, window_start, window_end FROM sync_state "
+                "WHERE account = ? AND calendar_id = ?",
+                (account, calendar_id),
+            ).fetchone()
+
+        if row is None:
+            return None, None
+        window = (row[1], row[2]) if row[1] is not None else None
+        return row[0], window
+
+    def count(self, account: str, calendar_id: str) -> int:
+        """Return the number of stored events of a calendar."""
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM events WHERE account = ? AND calendar_id = ?",
+                (account, calendar_id),
+            ).fetchone()
+        return count
+
+    def overlapping(
+        self,
+        account: str,
+        calendar_id: str,
+        start: float,
+        end: float,
+        all_day: bool,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return ``(start, event)`` of events with ``start < end`` and ``end > start``.
+
+        Only timed or only all-day events are searched, as their timestamps
+        are not comparable. Results are ordered by start, then ID, and only
+        the first ``limit`` are read.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                _OVERLAPPING,
+                {
+                    "account": account,
+                    "calendar_id": calendar_id,
+                    "all_day": int(all_day),
+                    "start": start,
+                    "end": end,
+                    "threshold": self.long_threshold,
+                    "limit": -1 if limit is None else limit,
+                },
+            ).fetchall()
+        return [(start_ts, json.loads(payload)) for start_ts, _, payload in rows]
+
+    def save(
+        self,
+        account: str,
+        calendar_id: str,
+        sync_token: Optional[str],
+        window: Optional[SyncWindow],
+        upserts: Iterable[StoredEvent],
+        deletions: Iterable[str] = (),
+        replace: bool = False,
+    ) -> None:
+        """Persist one sync round in a single transaction.
+
+        Args:
+            account: Account the calendar belongs to.
+            calendar_id: Calendar the events belong to.
+            sync_token: Token to resume incremental sync from.
+            window: Time range the full sync downloaded.
+            upserts: Events added or changed in this round.
+            deletions: IDs of events removed in this round.
+            replace: Drop all stored events of the calendar first (full sync).
+        """
+        with self._lock, self._connection:
+            if replace:
+                self._connection.execute(
+                    "DELETE FROM events WHERE account = ? AND calendar_id = ?",
+                    (account, calendar_id),
+                )
+            self._connection.executemany(
+                "DELETE FROM events WHERE account = ? AND calendar_id = ? AND event_id = ?",
+                ((account, calendar_id, event_id) for event_id in deletions),
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        account,
+                        calendar_id,
+                        event_id,
+                        start,
+                        end,
+                        int(all_day),
+                        int(end - start > self.long_threshold),
+                        json.dumps(event),
+                    )
+                    for event_id, start, end, all_day, event in upserts
+                ),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                (account, calendar_id, sync_token, *(window or (None, None))),
+            )
+
+    def clear(self, account: str, calendar_id: str) -> None:
+        """Forget a calendar's events and sync state."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM events WHERE account = ? AND calendar_id = ?",
+                (account, calendar_id),
+            )
+            self._connection.execute(
+                "DELETE FROM sync_state WHERE account = ? AND calendar_id = ?",
+                (account, calendar_id),
+            )
@@ -1,20 +1,53 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import json
 import logging
-from typing import Any, Dict, List, Optional, Type
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    Union,
+)
 
 from autogen_core import TRACE_LOGGER_NAME
-from dateutil import parser, tz
 from googleapiclient.errors import HttpError
 from langchain.callbacks.manager import (
     CallbackManagerForToolRun,
 )
 from pydantic import BaseModel, Field
-from utils.timezone import get_local_timezone
+from utils.continuation import get_continuation_store, truncate
+from utils.google_api import execute, map_requests
+from utils.timezone import get_local_timezone, get_zone, parse_rfc3339
 
 from .base import GoogleCalendarBaseTool
+from .event_store import default_event_store_path
+from .pager import aiter_events, amerge_events, iter_events, merge_events
+from .sync import CalendarMirror, get_sync_engine, match_order
 from .utils import parse_and_format_datetime
 
+# Event fields returned alongside the localized start and end
+EVENT_FIELDS = ("summary", "description", "location", "hangoutLink", "attendees")
+# Partial response of events.list: the fields above and what paging needs
+DEFAULT_EVENT_LIST_FIELDS = (
+    f"items({','.join(('start', 'end') + EVENT_FIELDS)}),nextPageToken"
+)
+DEFAULT_DESCRIPTION_LIMIT = 160
+
+COMPACT_HEADER = (
+    "Events (s=start, e=end, t=title, l=location, d=description, "
+    "v=video call, a=attendee numbers):"
+)
+
 
 class GetEventsSchema(BaseModel):
     # https://developers.google.com/calendar/api/v3/reference/events/list
@@ -61,43 +94,275 @@ class GoogleCalendarListEvents(GoogleCalendarBaseTool):
         " Use this tool to search for the user's calendar events."
         " The input must be the start and end datetimes for the search query."
         " Start time is default to the current time. You can also specify the"
-        " maximum number of results to return. The output is a JSON list of "
-        " all the events in the user's calendar between the start and end times."
+        " maximum number of results to return. The output lists the events in"
+        " the user's calendar between the start and end times."
     )
     args_schema: Type[BaseModel] = GetEventsSchema
+    max_concurrency: int = Field(
+        default=4,
+        description="Maximum number of calendars queried in parallel.",
+    )
+    page_size: int = Field(
+        default=250,
+        description="Maximum number of events requested per page from the API.",
+    )
+    response_fields: Optional[str] = Field(
+        default=DEFAULT_EVENT_LIST_FIELDS,
+        description=(
+            "Partial response requested from events.list through the API's "
+            "fields parameter. None downloads whole event resources."
+        ),
+    )
+    use_sync_mirror: bool = Field(
+        default=False,
+        description=(
+            "Answer from a local mirror kept current with incremental sync "
+            "instead of listing the time range from the API on every call. "
+            "The first listing downloads every selected calendar's events from "
+            "30 days back to a year ahead; ranges outside that window are "
+            "still listed from the API."
+        ),
+    )
+    event_store_path: Optional[str] = Field(
+        default_factory=default_event_store_path,
+        description=(
+            "SQLite file the synced mirror, including the events' titles, "
+            "descriptions and attendees, is persisted to, so restarts resume "
+            "with an incremental sync. Defaults to calendar_events.sqlite next "
+            "to the OAuth token; None keeps the mirror in memory only."
+        ),
+    )
+
+    compact_output: bool = Field(
+        default=False,
+        description=(
+            "Return events as one short JSON line each, with abbreviated keys, "
+            "attendees listed once and descriptions cut to description_limit. "
+            "The full events stay readable through read_more_results."
+        ),
+    )
+    description_limit: int = Field(
+        default=DEFAULT_DESCRIPTION_LIMIT,
+        description="Characters of each description kept in compact output.",
+    )
 
     _logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
 
-    def _parse_event(self, event, timezone):
-        # convert to local timezone
-        start = event["start"].get("dateTime", event["start"].get("date"))
-        start = (
-            parser.parse(start)
-            .astimezone(tz.gettz(timezone))
-            .strftime("%Y/%m/%d %H:%M:%S")
+    def _format_compact(self, events: List[Dict[str, Any]]) -> str:
+        if not events:
+            return "No events found."
+
+        people: Dict[str, int] = {}
+        lines = [COMPACT_HEADER]
+        shortened = False
+        for event in events:
+            # Drop the seconds, and the date of an end on the start's day
+            start, end = event["start"][:16], event["end"][:16]
+            item: Dict[str, Any] = {
+                "s": start,
+                "e": end[11:] if end[:10] == start[:10] else end,
+            }
+            for key, field in (
+                ("t", "summary"),
+                ("l", "location"),
+                ("v", "hangoutLink"),
+            ):
+                if event.get(field):
+                    item[key] = event[field]
+
+            description = event.get("description")
+            if description:
+                item["d"] = truncate(description, self.description_limit)
+                shortened = shortened or item["d"] != description
+
+            attendees = [
+                a["email"] for a in event.get("attendees") or () if "email" in a
+            ]
+            if attendees:
+                item["a"] = [
+                    people.setdefault(email, len(people) + 1) for email in attendees
+                ]
+                # Response statuses are left out
+                shortened = True
+
+            lines.append(json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+
+        if people:
+            lines.append(
+                "Attendees: " + ", ".join(f"{n}={email}" for email, n in people.items())
+            )
+        if shortened:
+            handle = get_continuation_store().put(events)
+            lines.append(
+                "Descriptions are shortened and attendee responses left out; "
+                f'read the full events with read_more_results(handle="{handle}").'
+            )
+        return "\n".join(lines)
+
+    def _format_output(
+        self, events: List[Dict[str, Any]]
+    ) -> Union[str, List[Dict[str, Any]]]:
+        return self._format_compact(events) if self.compact_output else events
+
+    def _parse_events(
+        self, events: Iterable[Dict[str, Any]], timezone: str
+    ) -> List[Dict[str, Any]]:
+        # convert to local timezone, resolving the zone once for the whole batch
+        zone = get_zone(timezone)
+
+        def local_time(moment: Dict[str, str]) -> str:
+            if "dateTime" in moment:
+                dt = parse_rfc3339(moment["dateTime"]).astimezone(zone)
+            else:
+                # All-day events have no zone: midnight wherever they are viewed
+                dt = datetime.fromisoformat(moment["date"])
+            return (
+                f"{dt.year:04d}/{dt.month:02d}/{dt.day:02d} "
+                f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+            )
+
+        return [
+            dict(
+                start=local_time(event["start"]),
+                end=local_time(event["end"]),
+                **{field: event.get(field, None) for field in EVENT_FIELDS},
+            )
+            for event in events
+        ]
+
+    def _list_events_request(
+        self,
+        calendar_id: str,
+        start_rfc: str,
+        end_rfc: str,
+        page_size: int,
+        timezone: str,
+        page_token: Optional[str] = None,
+    ):
+        return self.api_resource.events().list(
+            calendarId=calendar_id,
+            timeMin=start_rfc,
+            timeMax=end_rfc,
+            maxResults=page_size,
+            singleEvents=True,
+            orderBy="startTime",
+            timeZone=timezone,
+            pageToken=page_token,
+            fields=self.response_fields,
         )
-        end = event["end"].get("dateTime", event["end"].get("date"))
-        end = (
-            parser.parse(end)
-            .astimezone(tz.gettz(timezone))
-            .strftime("%Y/%m/%d %H:%M:%S")
+
+    def _page_size(self, max_results: int) -> int:
+        return max(1, min(max_results, self.page_size))
+
+    def _stream_events(
+        self,
+        calendars: List[str],
+        start_rfc: str,
+        end_rfc: str,
+        max_results: int,
+        timezone: str,
+    ) -> Iterator[Dict[str, Any]]:
+        if not calendars:
+            return iter(())
+
+        list_requests = [
+            partial(
+                self._list_events_request,
+                cal,
+                start_rfc,
+                end_rfc,
+                self._page_size(max_results),
+                timezone,
+            )
+            for cal in calendars
+        ]
+
+        # Fetch every calendar's first page in parallel, later pages on demand
+        first_pages = map_requests(
+            lambda list_request: execute(list_request(None)),
+            list_requests,
+            self.max_concurrency,
         )
-        event_parsed = dict(start=start, end=end)
-        for field in ["summary", "description", "location", "hangoutLink", "attendees"]:
-            event_parsed[field] = event.get(field, None)
-        return event_parsed
 
-    def _get_calendars(self):
-        calendars = []
-        try:
-            calendar_list = self.api_resource.calendarList().list().execute()
-            for cal in calendar_list.get("items", []):
-                if cal.get("selected", None):
-                    calendars.append(cal["id"])
-            return calendars
-        except HttpError as error:
-            self._logger.error(f"Failed to retrieve calendar list: {error}")
-            raise
+        streams = [
+            iter_events(list_request, first_page)
+            for list_request, first_page in zip(list_requests, first_pages)
+        ]
+        return merge_events(streams, max_results)
+
+    def _astream_events(
+        self,
+        calendars: List[str],
+        start_rfc: str,
+        end_rfc: str,
+        max_results: int,
+        timezone: str,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        streams = [
+            aiter_events(
+                partial(
+                    self._list_events_request,
+                    cal,
+                    start_rfc,
+                    end_rfc,
+                    self._page_size(max_results),
+                    timezone,
+                ),
+                semaphore,
+            )
+            for cal in calendars
+        ]
+        return amerge_events(streams, max_results)
+
+    def _mirrors_cover(
+        self, calendars: List[str], start_rfc: str, end_rfc: str
+    ) -> bool:
+        if not self.use_sync_mirror:
+            return False
+
+        engine = get_sync_engine(self.api_resource, self.event_store_path)
+        time_min = datetime.fromisoformat(start_rfc)
+        time_max = datetime.fromisoformat(end_rfc)
+        return all(engine.covers(cal, time_min, time_max) for cal in calendars)
+
+    def _sync_mirrors(self, calendars: List[str]) -> List[CalendarMirror]:
+        if not calendars:
+            return []
+
+        engine = get_sync_engine(self.api_resource, self.event_store_path)
+        return map_requests(engine.sync, calendars, self.max_concurrency)
+
+    async def _async_mirrors(self, calendars: List[str]) -> List[CalendarMirror]:
+        engine = get_sync_engine(self.api_resource, self.event_store_path)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def sync(cal: str) -> CalendarMirror:
+            async with semaphore:
+                return await engine.sync_async(cal)
+
+        return await asyncio.gather(*(sync(cal) for cal in calendars))
+
+    def _query_mirrors(
+        self,
+        mirrors: List[CalendarMirror],
+        start_rfc: str,
+        end_rfc: str,
+        max_results: int,
+        timezone: str,
+    ) -> Iterator[Dict[str, Any]]:
+        time_min = datetime.fromisoformat(start_rfc)
+        time_max = datetime.fromisoformat(end_rfc)
+        zone = get_zone(timezone)
+
+        matches = heapq.merge(
+            *(
+                mirror.events_between(time_min, time_max, zone, max_results)
+                for mirror in mirrors
+            ),
+            key=match_order,
+        )
+        return (event for _, event in islice(matches, max_results))
 
     def _run(
         self,
@@ -106,7 +371,7 @@ class GoogleCalendarListEvents(GoogleCalendarBaseTool):
         max_results: int = 10,
         timezone: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Union[str, List[Dict[str, Any]]]:
         try:
             calendars = self._get_calendars()
 
@@ -114,37 +379,28 @@ class GoogleCalendarListEvents(GoogleCalendarBaseTool):
                 zone_info = get_local_timezone()
                 timezone = str(zone_info)
 
-            events = []
-
             start_rfc, end_rfc, timezone = parse_and_format_datetime(
                 start_datetime, end_datetime, timezone
             )
 
-            for cal in calendars:
-                events_result = (
-                    self.api_resource.events()
-                    .list(
-                        calendarId=cal,
-                        timeMin=start_rfc,
-                        timeMax=end_rfc,
-                        maxResults=max_results,
-                        singleEvents=True,
-                        orderBy="startTime",
-                        timeZone=timezone,
-                    )
-                    .execute()
+            if self._mirrors_cover(calendars, start_rfc, end_rfc):
+                events = self._query_mirrors(
+                    self._sync_mirrors(calendars),
+                    start_rfc,
+                    end_rfc,
+                    max_results,
+                    timezone,
+                )
+            else:
+                events = self._stream_events(
+                    calendars, start_rfc, end_rfc, max_results, timezone
                 )
-                cal_events = events_result.get("items", [])
-                events.extend(cal_events)
-
-            events = sorted(
-                events, key=lambda x: x["start"].get("dateTime", x["start"].get("date"))
-            )
 
-            return [self._parse_event(e, timezone) for e in events]
+            return self._format_output(self._parse_events(events, timezone))
 
         except HttpError as error:
             self._logger.error(f"Failed to retrieve calendar events: {error}")
+            self._forget_missing_calendar(error)
             raise
         except Exception as e:
             self._logger.error(f"Unexpected error occurred: {str(e)}")
@@ -155,7 +411,46 @@ class GoogleCalendarListEvents(GoogleCalendarBaseTool):
         start_datetime: str,
         end_datetime: str,
         max_results: int = 10,
+        timezone: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> List(Dict[str, Any]):  # type: ignore
+    ) -> Union[str, List[Dict[str, Any]]]:
+        try:
+            calendars = await self._aget_calendars()
 
-        raise NotImplementedError("Async version of this tool is not implemented.")
+            if timezone is None:
+                zone_info = get_local_timezone()
+                timezone = str(zone_info)
+
+            start_rfc, end_rfc, timezone = parse_and_format_datetime(
+                start_datetime, end_datetime, timezone
+            )
+
+            # Opening the store and reading it block, so both run off the loop
+            if self.use_sync_mirror and await asyncio.to_thread(
+                self._mirrors_cover, calendars, start_rfc, end_rfc
+            ):
+                mirrors = await self._async_mirrors(calendars)
+                events = await asyncio.to_thread(
+                    lambda: list(
+                        self._query_mirrors(
+                            mirrors, start_rfc, end_rfc, max_results, timezone
+                        )
+                    )
+                )
+                return self._format_output(self._parse_events(events, timezone))
+
+            events = self._astream_events(
+                calendars, start_rfc, end_rfc, max_results, timezone
+            )
+
+            return self._format_output(
+                self._parse_events([e async for e in events], timezone)
+            )
+
+        except HttpError as error:
+            self._logger.error(f"Failed to retrieve calendar events: {error}")
+            self._forget_missing_calendar(error)
+            raise
+        except Exception as e:
+            self._logger.error(f"Unexpected error occurred: {str(e)}")
+            raise
@@ -0,0 +1,122 @@
+"""Streaming pagination over Google Calendar event listings."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from utils.google_api import execute, execute_async
+
+if TYPE_CHECKING:
+    from googleapiclient.http import HttpRequest  # type: ignore[import]
+
+# Builds the events().list request for a page, given the previous nextPageToken
+ListRequestFactory = Callable[[Optional[str]], "HttpRequest"]
+
+
+def event_start_key(event: Dict[str, Any]) -> str:
+    """Sort key ordering events by their start, as returned by the API."""
+    return event["start"].get("dateTime", event["start"].get("date"))
+
+
+def iter_events(
+    list_request: ListRequestFactory, first_page: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield the events of one calendar, fetching pages as they are consumed.
+
+    Args:
+        list_request: Builds the request for a page from its page token.
+        first_page: An already fetched first page, e.g. from a parallel prefetch.
+    """
+    page = first_page if first_page is not None else execute(list_request(None))
+    while True:
+        yield from page.get("items", [])
+
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return
+        page = execute(list_request(page_token))
+
+
+async def aiter_events(
+    list_request: ListRequestFactory,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async variant of :func:`iter_events`.
+
+    Args:
+        list_request: Builds the request for a page from its page token.
+        semaphore: Optional limit on page fetches running at the same time.
+    """
+    page_token = None
+    while True:
+        if semaphore is None:
+            page = await execute_async(list_request(page_token))
+        else:
+            async with semaphore:
+                page = await execute_async(list_request(page_token))
+
+        for event in page.get("items", []):
+            yield event
+
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def merge_events(
+    streams: Iterable[Iterator[Dict[str, Any]]], limit: int
+) -> Iterator[Dict[str, Any]]:
+    """Merge start-ordered event streams and stop after ``limit`` events.
+
+    Ties keep the order of ``streams``, matching a stable sort of the
+    concatenated streams.
+    """
+    return islice(heapq.merge(*streams, key=event_start_key), limit)
+
+
+async def amerge_events(
+    streams: List[AsyncIterator[Dict[str, Any]]], limit: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async variant of :func:`merge_events`.
+
+    The first page of every stream is requested concurrently; later pages are
+    only fetched once the merge actually reaches them.
+    """
+    heap: List[Tuple[str, int, int, Dict[str, Any]]] = []
+    sequence = 0
+
+    async def push(index: int) -> None:
+        nonlocal sequence
+        event = await anext(streams[index], None)
+        if event is not None:
+            heapq.heappush(heap, (event_start_key(event), index, sequence, event))
+            sequence += 1
+
+    try:
+        await asyncio.gather(*(push(index) for index in range(len(streams))))
+
+        emitted = 0
+        while heap and emitted < limit:
+            _, index, _, event = heapq.heappop(heap)
+            yield event
+            emitted += 1
+
+            if emitted < limit:
+                await push(index)
+    finally:
+        for stream in streams:
+            await stream.aclose()
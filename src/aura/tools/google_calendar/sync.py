@@ -0,0 +1,427 @@
+"""Incremental calendar synchronization into a local event mirror.
+
+The first sync of a calendar downloads its events within a window around the
+present and stores the ``nextSyncToken`` returned on the last page. Every later
+sync sends that token and only receives the events that changed since, so
+keeping the mirror current costs one small delta request. Ranges outside the
+window are not mirrored and are listed from the API instead. See
+https://developers.google.com/calendar/api/guides/sync
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from autogen_core import TRACE_LOGGER_NAME
+from googleapiclient.errors import HttpError
+from utils.google_api import account_key, execute
+
+from .event_store import EventStore, StoredEvent, SyncWindow
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource  # type: ignore[import]
+
+logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.calendar_sync")
+
+# Event fields kept in the mirror; everything list_google_calendar_events returns
+MIRRORED_FIELDS = (
+    "id",
+    "start",
+    "end",
+    "summary",
+    "description",
+    "location",
+    "hangoutLink",
+    "attendees",
+)
+
+# Time range around the present that a full sync downloads
+SYNC_WINDOW_PAST = timedelta(days=30)
+SYNC_WINDOW_FUTURE = timedelta(days=365)
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DATE = _EPOCH.date()
+
+
+def _timestamps(event: Dict[str, Any]) -> Tuple[float, float, bool]:
+    """Return ``(start, end, all_day)`` for an event.
+
+    Timed events use epoch seconds. All-day events have no zone, so they use
+    floating seconds: the wall-clock time since 1970-01-01 in whatever zone
+    the event is later viewed in.
+    """
+    start, end = event["start"], event["end"]
+    if "dateTime" in start:
+        return (
+            datetime.fromisoformat(start["dateTime"]).timestamp(),
+            datetime.fromisoformat(end["dateTime"]).timestamp(),
+            False,
+        )
+    return (
+        (date.fromisoformat(start["date"]) - _EPOCH_DATE).days * 86400.0,
+        (date.fromisoformat(end["date"]) - _EPOCH_DATE).days * 86400.0,
+        True,
+    )
+
+
+def _floating(moment: datetime, zone: tzinfo) -> float:
+    return (moment.astimezone(zone).replace(tzinfo=None) - _EPOCH).total_seconds()
+
+
+def _zoned(floating: float, zone: tzinfo) -> float:
+    return (_EPOCH + timedelta(seconds=floating)).replace(tzinfo=zone).timestamp()
+
+
+def match_order(match: Tuple[float, Dict[str, Any]]) -> Tuple[float, bool]:
+    """Sort key of :meth:`CalendarMirror.events_between` results.
+
+    Orders by start, with all-day events ahead of timed ones starting at the
+    same moment, as the paged API listing orders them.
+    """
+    start, event = match
+    return start, "date" not in event["start"]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CalendarMirror:
+    """Local copy of one calendar's events, refreshed with sync tokens.
+
+    Events live in an :class:`EventStore`, on disk so a restart resumes with
+    an incremental sync, or in memory. Range queries read only the matching
+    rows rather than holding the calendar in memory. ``window`` is the range
+    the last full sync downloaded; only queries within it are answered from
+    the mirror.
+
+    Changes are staged with :meth:`apply` and written with :meth:`commit` in
+    one transaction, so queries see either the previous or the new round.
+    ``lock`` keeps the two steps of one round together.
+
+    Args:
+        calendar_id: The mirrored calendar.
+        store: Store to load from and persist to.
+        account: Account key used to scope rows in the store.
+    """
+
+    def __init__(self, calendar_id: str, store: EventStore, account: str = ""):
+        self.calendar_id = calendar_id
+        self.account = account
+        self.last_synced: Optional[float] = None
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self._store = store
+        self._upserts: Dict[str, StoredEvent] = {}
+        self._deletions: Set[str] = set()
+        self._replace = False
+        self.sync_token, self.window = store.load_state(account, calendar_id)
+
+    def __len__(self) -> int:
+        return self._store.count(self.account, self.calendar_id)
+
+    def reset(self) -> None:
+        """Forget all events and the sync state, forcing a full resync."""
+        self.sync_token = None
+        self.window = None
+        self.last_synced = None
+        self._upserts.clear()
+        self._deletions.clear()
+        self._replace = True
+
+    def apply(self, items: List[Dict[str, Any]]) -> None:
+        """Stage a page of full or incremental sync results."""
+        for event in items:
+            event_id = event["id"]
+
+            if event.get("status") == "cancelled" or "start" not in event:
+                self._upserts.pop(event_id, None)
+                self._deletions.add(event_id)
+                continue
+
+            event = {field: event[field] for field in MIRRORED_FIELDS if field in event}
+            start, end, all_day = _timestamps(event)
+            self._upserts[event_id] = (event_id, start, end, all_day, event)
+            self._deletions.discard(event_id)
+
+    def commit(self, sync_token: Optional[str]) -> None:
+        """Record the token to resume from and persist the staged changes."""
+        self._store.save(
+            self.account,
+            self.calendar_id,
+            sync_token,
+            self.window,
+            self._upserts.values(),
+            self._deletions,
+            replace=self._replace,
+        )
+        self.sync_token = sync_token
+        self._upserts.clear()
+        self._deletions.clear()
+        self._replace = False
+
+    def events_between(
+        self,
+        time_min: datetime,
+        time_max: datetime,
+        zone: tzinfo,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return ``(start, event)`` pairs overlapping the range, by :func:`match_order`.
+
+        Matches the API's filtering: an event is included when it ends after
+        ``time_min`` and starts before ``time_max``. Start is in epoch seconds.
+        At most ``limit`` pairs are returned.
+        """
+        return self._overlapping(
+            (time_min.timestamp(), time_max.timestamp()),
+            (_floating(time_min, zone), _floating(time_max, zone)),
+            zone,
+            limit,
+        )
+
+    def next_events(
+        self, after: datetime, zone: tzinfo, limit: int
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return the first ``limit`` events ending after ``after``, by :func:`match_order`.
+
+        Answers "what is next" without an end to the range: events in progress
+        at ``after`` come first, then upcoming ones. Only events within the
+        sync window are mirrored.
+        """
+        return self._overlapping(
+            (after.timestamp(), math.inf),
+            (_floating(after, zone), math.inf),
+            zone,
+            limit,
+        )
+
+    def _overlapping(
+        self,
+        timed_range: Tuple[float, float],
+        all_day_range: Tuple[float, float],
+        zone: tzinfo,
+        limit: Optional[int],
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        matches = self._store.overlapping(
+            self.account, self.calendar_id, *timed_range, all_day=False, limit=limit
+        )
+        all_day = self._store.overlapping(
+            self.account, self.calendar_id, *all_day_range, all_day=True, limit=limit
+        )
+        if all_day:
+            matches = list(
+                heapq.merge(
+                    [(_zoned(start, zone), event) for start, event in all_day],
+                    matches,
+                    key=match_order,
+                )
+            )
+        return matches[:limit]
+
+
+class CalendarSyncEngine:
+    """Keeps a :class:`CalendarMirror` per calendar of one account up to date.
+
+    Args:
+        api_resource: Calendar API resource used for the sync requests.
+        store: Store the mirrors persist to; by default an in-memory one.
+        page_size: Events requested per page during a sync.
+        min_sync_interval: Seconds during which a freshly synced mirror is
+            served without another delta request.
+        window_past: How far into the past a full sync reaches.
+        window_future: How far into the future a full sync reaches. A
+            mirror whose window ends less than half of this ahead is synced
+            in full again, so the window moves along with the present.
+        clock: Monotonic time source, overridable for tests.
+        now: Wall-clock time source the window is placed around.
+    """
+
+    def __init__(
+        self,
+        api_resource: Resource,
+        store: Optional[EventStore] = None,
+        page_size: int = 250,
+        min_sync_interval: float = 0.0,
+        window_past: timedelta = SYNC_WINDOW_PAST,
+        window_future: timedelta = SYNC_WINDOW_FUTURE,
+        clock: Callable[[], float] = time.monotonic,
+        now: Callable[[], datetime] = _utcnow,
+    ):
+        self.api_resource = api_resource
+        self.store = store or EventStore(":memory:")
+        self.account = account_key(api_resource)
+        self.page_size = page_size
+        self.min_sync_interval = min_sync_interval
+        self.window_past = window_past
+        self.window_future = window_future
+        self.now = now
+        self._clock = clock
+        self._mirrors: Dict[str, CalendarMirror] = {}
+        self._lock = threading.Lock()
+        # Counts mark_stale calls, so a sync racing a write does not count as fresh
+        self._writes = 0
+
+    def mirror(self, calendar_id: str) -> CalendarMirror:
+        """Return the mirror for a calendar, creating an empty one if needed."""
+        with self._lock:
+            mirror = self._mirrors.get(calendar_id)
+            if mirror is None:
+                mirror = self._mirrors[calendar_id] = CalendarMirror(
+                    calendar_id, self.store, self.account
+                )
+            return mirror
+
+    def _next_window(self) -> SyncWindow:
+        now = self.now()
+        return (
+            (now - self.window_past).timestamp(),
+            (now + self.window_future).timestamp(),
+        )
+
+    def _needs_full_sync(self, mirror: CalendarMirror) -> bool:
+        if mirror.sync_token is None or mirror.window is None:
+            return True
+        ahead = mirror.window[1] - self.now().timestamp()
+        return ahead < self.window_future.total_seconds() / 2
+
+    def mark_stale(self) -> None:
+        """Make the next :meth:`sync` of every calendar ask for changes.
+
+        Called after the account's events were written, so the written
+        events show up in the next listing even within ``min_sync_interval``.
+        """
+        with self._lock:
+            self._writes += 1
+            mirrors = list(self._mirrors.values())
+        for mirror in mirrors:
+            mirror.last_synced = None
+
+    def covers(self, calendar_id: str, time_min: datetime, time_max: datetime) -> bool:
+        """Whether the calendar's mirror answers queries of the range once synced."""
+        mirror = self.mirror(calendar_id)
+        window = self._next_window() if self._needs_full_sync(mirror) else mirror.window
+        return window[0] <= time_min.timestamp() and time_max.timestamp() <= window[1]
+
+    def sync(self, calendar_id: str) -> CalendarMirror:
+        """Bring a calendar's mirror up to date and return it.
+
+        Concurrent syncs of one calendar run one at a time; queries of the
+        mirror keep being answered while the pages are fetched.
+        """
+        mirror = self.mirror(calendar_id)
+        writes = self._writes
+        with mirror.sync_lock:
+            if (
+                mirror.last_synced is not None
+                and self._clock() - mirror.last_synced < self.min_sync_interval
+            ):
+                return mirror
+
+            if self._needs_full_sync(mirror):
+                self._full_sync(mirror)
+            else:
+                try:
+                    items, sync_token = self._fetch_pages(
+                        mirror.calendar_id, syncToken=mirror.sync_token
+                    )
+                except HttpError as error:
+                    if error.resp.status != 410:
+                        raise
+                    # The sync token expired or was invalidated by the server
+                    logger.info(f"Full resync required for calendar {calendar_id}")
+                    self._full_sync(mirror)
+                else:
+                    with mirror.lock:
+                        mirror.apply(items)
+                        mirror.commit(sync_token)
+
+            if writes == self._writes:
+                mirror.last_synced = self._clock()
+            return mirror
+
+    async def sync_async(self, calendar_id: str) -> CalendarMirror:
+        """Run :meth:`sync` in a worker thread."""
+        return await asyncio.to_thread(self.sync, calendar_id)
+
+    def _full_sync(self, mirror: CalendarMirror) -> None:
+        window = self._next_window()
+        items, sync_token = self._fetch_pages(
+            mirror.calendar_id,
+            timeMin=datetime.fromtimestamp(window[0], timezone.utc).isoformat(),
+            timeMax=datetime.fromtimestamp(window[1], timezone.utc).isoformat(),
+        )
+        with mirror.lock:
+            mirror.reset()
+            mirror.window = window
+            mirror.apply(items)
+            mirror.commit(sync_token)
+
+    def _fetch_pages(
+        self, calendar_id: str, **params: Any
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return the items of every page and the final ``nextSyncToken``."""
+        page_token = None
+        items: List[Dict[str, Any]] = []
+
+        fields = ",".join(MIRRORED_FIELDS + ("status",))
+
+        while True:
+            page = execute(
+                self.api_resource.events().list(
+                    calendarId=calendar_id,
+                    singleEvents=True,
+                    maxResults=self.page_size,
+                    pageToken=page_token,
+                    fields=f"items({fields}),nextPageToken,nextSyncToken",
+                    **params,
+                )
+            )
+            items.extend(page.get("items", []))
+
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return items, page.get("nextSyncToken")
+
+
+_engines: Dict[str, CalendarSyncEngine] = {}
+_stores: Dict[str, EventStore] = {}
+_engines_lock = threading.Lock()
+
+
+def get_sync_engine(
+    api_resource: Resource, store_path: Optional[str] = None
+) -> CalendarSyncEngine:
+    """Return the sync engine shared by all tools using the same account.
+
+    Args:
+        api_resource: Calendar API resource of the account.
+        store_path: SQLite file the mirrors persist to, or None to keep them
+            in memory only. Only used when the engine is first created.
+    """
+    key = account_key(api_resource)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            store = None
+            if store_path is not None:
+                store = _stores.get(store_path)
+                if store is None:
+                    store = _stores[store_path] = EventStore(store_path)
+            engine = _engines[key] = CalendarSyncEngine(api_resource, store)
+        return engine
+
+
+def mark_mirrors_stale(api_resource: Resource) -> None:
+    """Mark the account's mirrors stale after a write, if it has any."""
+    with _engines_lock:
+        engine = _engines.get(account_key(api_resource))
+    if engine is not None:
+        engine.mark_stale()
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 from langchain_community.agent_toolkits.base import BaseToolkit
 from langchain_core.tools import BaseTool
 from pydantic import ConfigDict, Field
 
+from .check_conflicts import GoogleCalendarCheckConflicts
 from .create_event import GoogleCalendarCreateEvent
 from .delete_event import GoogleCalendarDeleteEvent
 from .edit_event import GoogleCalendarEditEvent
+from .event_store import default_event_store_path
 from .list_calendar_events import GoogleCalendarListEvents
 from .utils import build_resource_service
 
@@ -43,6 +45,26 @@ class GoogleCalendarToolkit(BaseToolkit):
     """
 
     api_resource: Resource = Field(default_factory=build_resource_service)
+    max_concurrency: int = Field(
+        default=4,
+        description="Maximum number of calendars queried in parallel when listing events.",
+    )
+    use_sync_mirror: bool = Field(
+        default=False,
+        description="Answer event listings from an incrementally synced local mirror.",
+    )
+    event_store_path: Optional[str] = Field(
+        default_factory=default_event_store_path,
+        description=(
+            "SQLite file the synced mirror, events included, is persisted to, by "
+            "default calendar_events.sqlite next to the OAuth token; None keeps "
+            "it in memory."
+        ),
+    )
+    compact_output: bool = Field(
+        default=False,
+        description="Shorten event listings, keeping the full events behind a handle.",
+    )
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -54,5 +76,12 @@ class GoogleCalendarToolkit(BaseToolkit):
             GoogleCalendarCreateEvent(api_resource=self.api_resource),
             GoogleCalendarDeleteEvent(api_resource=self.api_resource),
             GoogleCalendarEditEvent(api_resource=self.api_resource),
-            GoogleCalendarListEvents(api_resource=self.api_resource),
+            GoogleCalendarCheckConflicts(api_resource=self.api_resource),
+            GoogleCalendarListEvents(
+                api_resource=self.api_resource,
+                max_concurrency=self.max_concurrency,
+                use_sync_mirror=self.use_sync_mirror,
+                event_store_path=self.event_store_path,
+                compact_output=self.compact_output,
+            ),
         ]
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 from datetime import datetime
 import logging
-import os
 from typing import List, Optional, Tuple, TYPE_CHECKING
 
-from dateutil import tz
-from utils.timezone import get_local_timezone
+from utils.cache import TTLCache
+from utils.google_auth import get_credential_provider
+from utils.google_discovery import build_service
+from utils.timezone import get_local_timezone, get_zone
 
 if TYPE_CHECKING:
     from google.auth.transport.requests import Request  # type: ignore[import]
@@ -73,15 +74,20 @@ def import_googleapiclient_resource_builder() -> build_resource:
 
 
 DEFAULT_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+DEFAULT_CALENDAR_LIST_TTL = 300.0
 DEFAULT_SERVICE_SCOPES = [
     "https://www.googleapis.com/auth/calendar.readonly",
     "https://www.googleapis.com/auth/calendar.events",
 ]
-DEFAULT_CREDS_TOKEN_FILE = "token.json"
-DEFAULT_CLIENT_SECRETS_FILE = "credentials.json"
 DEFAULT_SERVICE_ACCOUNT_FILE = "service_account.json"
 
 
+# Selected calendar IDs per account, shared by every calendar tool instance.
+selected_calendars_cache: TTLCache[str, List[str]] = TTLCache(
+    ttl=DEFAULT_CALENDAR_LIST_TTL
+)
+
+
 def get_gmail_credentials(
     token_file: Optional[str] = None,
     client_secrets_file: Optional[str] = None,
@@ -104,34 +110,11 @@ def get_gmail_credentials(
 
         return credentials
     else:
-        # From https://developers.google.com/gmail/api/quickstart/python
-        Request, Credentials, _ = import_google()
-        InstalledAppFlow = import_installed_app_flow()
-        creds = None
         scopes = scopes or DEFAULT_SCOPES
-        token_file = token_file or DEFAULT_CREDS_TOKEN_FILE
-        client_secrets_file = client_secrets_file or DEFAULT_CLIENT_SECRETS_FILE
-        # The file token.json stores the user's access and refresh tokens, and is
-        # created automatically when the authorization flow completes for the first
-        # time.
-
-        if os.path.exists(token_file):
-            creds = Credentials.from_authorized_user_file(token_file, scopes)
-
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())  # type: ignore[call-arg]
-            else:
-                # https://developers.google.com/gmail/api/quickstart/python#authorize_credentials_for_a_desktop_application # noqa
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    client_secrets_file, scopes
-                )
-                creds = flow.run_local_server(port=0)
-
-            with open(token_file, "w") as token:
-                token.write(creds.to_json())
-
-        return creds
+        # Shared with every other toolkit reading the same token file
+        return get_credential_provider(token_file, client_secrets_file).get_credentials(
+            scopes
+        )
 
 
 def build_resource_service(
@@ -150,8 +133,7 @@ def build_resource_service(
         service_account_file=service_account_file,
         scopes=scopes,
     )
-    builder = import_googleapiclient_resource_builder()
-    return builder(service_name, service_version, credentials=credentials)
+    return build_service(service_name, service_version, credentials)
 
 
 def parse_and_format_datetime(
@@ -174,7 +156,8 @@ def parse_and_format_datetime(
     start = datetime.strptime(start_datetime, "%Y-%m-%dT%H:%M:%S")
     end = datetime.strptime(end_datetime, "%Y-%m-%dT%H:%M:%S")
 
-    start = start.replace(tzinfo=tz.gettz(timezone))
-    end = end.replace(tzinfo=tz.gettz(timezone))
+    zone = get_zone(timezone)
+    start = start.replace(tzinfo=zone)
+    end = end.replace(tzinfo=zone)
 
     return start.isoformat(), end.isoformat(), timezone
@@ -0,0 +1,21 @@
+import inspect
+
+from autogen_ext.tools.langchain import LangChainToolAdapter
+from langchain_core.tools import BaseTool
+from utils.tracing import TracedToolMixin
+
+
+class AsyncLangChainToolAdapter(TracedToolMixin, LangChainToolAdapter):
+    """LangChain tool adapter that awaits the tool's native ``_arun``.
+
+    The stock adapter always calls ``_run`` in a worker thread. Tools that
+    implement their own ``_arun`` are awaited directly instead, so their
+    requests can overlap on the event loop. Every call is traced.
+    """
+
+    def __init__(self, langchain_tool: BaseTool):
+        super().__init__(langchain_tool)
+
+        arun = type(langchain_tool)._arun
+        if arun is not BaseTool._arun and inspect.iscoroutinefunction(arun):
+            self._callable = langchain_tool._arun
@@ -0,0 +1,321 @@
+"""Lazily built tools that publish their schema before their backend exists.
+
+Building the Gmail, Calendar and MCP tools means importing langchain and the
+Google client libraries, loading credentials and spawning MCP servers. A
+:class:`LazyToolGroup` defers all of that until one of its tools is first
+called. Until then its tools are :class:`LazyTool` proxies whose schemas come
+from a small JSON cache written the last time the group was built. The cache
+is discarded when the tool modules or the libraries building the tools
+change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+from importlib import metadata
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from autogen_core import CancellationToken
+    from autogen_core.tools import Tool, ToolSchema
+    from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOOL_SCHEMA_FILE = ".tool_schemas.json"
+# Distributions whose versions shape the tool schemas
+SCHEMA_DISTRIBUTIONS = (
+    "aura",
+    "autogen-core",
+    "autogen-ext",
+    "autogen-ext-mcp",
+    "langchain-core",
+    "langchain-google-community",
+)
+
+ToolFactory = Callable[[], Union[List["Tool"], Awaitable[List["Tool"]]]]
+
+
+def tool_schema_fingerprint() -> str:
+    """Return a hash of the tool modules' sources and the versions building them."""
+    digest = hashlib.sha256()
+    for distribution in SCHEMA_DISTRIBUTIONS:
+        try:
+            version = metadata.version(distribution)
+        except metadata.PackageNotFoundError:
+            version = ""
+        digest.update(f"{distribution}={version}\n".encode())
+
+    tools_dir = Path(__file__).parent
+    for module in sorted(tools_dir.rglob("*.py")):
+        digest.update(module.relative_to(tools_dir).as_posix().encode())
+        digest.update(module.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ToolSchemaCache:
+    """JSON file holding the tool schemas of every group, keyed by group name.
+
+    The file records the fingerprint it was written with. Schemas written
+    with another fingerprint are ignored, as their tools may have changed.
+
+    Args:
+        path: The cache file.
+        fingerprint: Key of the current tool code; computed when first needed
+            if not given.
+    """
+
+    def __init__(
+        self, path: str = DEFAULT_TOOL_SCHEMA_FILE, fingerprint: Optional[str] = None
+    ):
+        self.path = path
+        self.fingerprint = fingerprint
+        self._lock = threading.Lock()
+        self._schemas: Optional[Dict[str, List[ToolSchema]]] = None
+
+    def _load(self) -> Dict[str, List[ToolSchema]]:
+        if self._schemas is None:
+            if self.fingerprint is None:
+                self.fingerprint = tool_schema_fingerprint()
+            try:
+                with open(self.path) as f:
+                    cached = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                cached = {}
+            if (
+                isinstance(cached, dict)
+                and cached.get("fingerprint") == self.fingerprint
+            ):
+                self._schemas = cached.get("groups", {})
+            else:
+                self._schemas = {}
+        return self._schemas
+
+    def get(self, group: str) -> Optional[List[ToolSchema]]:
+        with self._lock:
+            return self._load().get(group)
+
+    def set(self, group: str, schemas: List[ToolSchema]) -> None:
+        with self._lock:
+            cached = self._load()
+            if cached.get(group) == schemas:
+                return
+            cached[group] = schemas
+
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(
+                    {"fingerprint": self.fingerprint, "groups": cached}, f, indent=2
+                )
+            os.replace(temp_path, self.path)
+
+
+class ToolGroupUnavailableError(RuntimeError):
+    """Raised for the tools of a group whose factory failed.
+
+    The message tells the model the group's tools cannot be used right now;
+    the next call tries to build the group again.
+    """
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class LazyTool:
+    """Stand-in for a tool of a :class:`LazyToolGroup`.
+
+    Exposes the cached name, description and schema right away and builds the
+    group on the first call. The other methods need the real tool; they are
+    served once the group is built, which :meth:`run_json` ensures. When the
+    build fails, the call fails with :class:`ToolGroupUnavailableError`, which
+    the agent reports to the model as the tool's error.
+    """
+
+    def __init__(self, schema: ToolSchema, group: LazyToolGroup):
+        self._schema = schema
+        self._group = group
+
+    @property
+    def name(self) -> str:
+        return self._schema["name"]
+
+    @property
+    def description(self) -> str:
+        return self._schema.get("description", "")
+
+    @property
+    def schema(self) -> ToolSchema:
+        return self._schema
+
+    def _backend(self) -> Tool:
+        return self._group.tool(self.name)
+
+    def args_type(self) -> type[BaseModel]:
+        return self._backend().args_type()
+
+    def return_type(self) -> type[Any]:
+        return self._backend().return_type()
+
+    def state_type(self) -> type[BaseModel] | None:
+        return self._backend().state_type()
+
+    def return_value_as_string(self, value: Any) -> str:
+        return self._backend().return_value_as_string(value)
+
+    async def run_json(
+        self, args: Mapping[str, Any], cancellation_token: CancellationToken
+    ) -> Any:
+        tool = await self._group.atool(self.name)
+        return await tool.run_json(args, cancellation_token)
+
+    def save_state_json(self) -> Mapping[str, Any]:
+        return self._backend().save_state_json()
+
+    def load_state_json(self, state: Mapping[str, Any]) -> None:
+        self._backend().load_state_json(state)
+
+
+class LazyToolGroup:
+    """Tools built together by one factory, e.g. everything of a toolkit.
+
+    Args:
+        name: Key of the group in the schema cache.
+        factory: Builds the real tools; may be a coroutine function.
+        schema_cache: Where the group's schemas are read from and saved to.
+        prewarm: Build the group in the background even when its schemas are
+            cached, so the first call does not wait for it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: ToolFactory,
+        schema_cache: ToolSchemaCache,
+        prewarm: bool = False,
+    ):
+        self.name = name
+        self.prewarm = prewarm
+        self._factory = factory
+        self._schema_cache = schema_cache
+        self._tools: Optional[Dict[str, Tool]] = None
+        self.error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+        self._prewarm_task: Optional[asyncio.Task] = None
+
+    @property
+    def built(self) -> bool:
+        return self._tools is not None
+
+    @property
+    def available(self) -> bool:
+        """False after the last build failed, until a build succeeds."""
+        return self.error is None
+
+    async def tools(self) -> List[Tool]:
+        """Return proxies when the schemas are cached, otherwise build now."""
+        schemas = self._schema_cache.get(self.name)
+        if schemas is not None:
+            if self.prewarm:
+                self._prewarm_task = asyncio.create_task(self._prewarm())
+            return [LazyTool(schema, self) for schema in schemas]
+
+        return list((await self.abuild()).values())
+
+    async def _prewarm(self) -> None:
+        try:
+            await self.abuild()
+        except ToolGroupUnavailableError:
+            # Already logged; retried, and reported to the model, on the first call
+            pass
+
+    def _store(self, tools: List[Tool]) -> Dict[str, Tool]:
+        self._tools = {tool.name: tool for tool in tools}
+        self.error = None
+        self._schema_cache.set(self.name, [dict(tool.schema) for tool in tools])
+        return self._tools
+
+    def _unavailable(self, error: Exception) -> ToolGroupUnavailableError:
+        self.error = error
+        logger.warning(f"Failed to build tool group {self.name}: {error}")
+        return ToolGroupUnavailableError(
+            f"The {self.name} tools are unavailable, they failed to start: {error}"
+        )
+
+    def build(self) -> Dict[str, Tool]:
+        """Build the group's tools from a synchronous factory.
+
+        Refuses to build on an event loop, where waiting for the factory, or
+        for a build already running in a worker thread, would block the loop;
+        use :meth:`abuild` there instead.
+        """
+        if self._tools is not None:
+            return self._tools
+        if inspect.iscoroutinefunction(self._factory):
+            raise RuntimeError(
+                f"Tool group '{self.name}' has an async factory; await abuild() first."
+            )
+        if _on_event_loop():
+            raise RuntimeError(
+                f"Tool group '{self.name}' is not built yet; await abuild() first "
+                "instead of building it on the event loop."
+            )
+
+        with self._lock:
+            if self._tools is None:
+                logger.info(f"Building tool group {self.name}")
+                try:
+                    tools = self._factory()
+                except Exception as e:
+                    raise self._unavailable(e) from e
+                self._store(tools)
+            return self._tools
+
+    async def abuild(self) -> Dict[str, Tool]:
+        """Build the group's tools without blocking the event loop."""
+        async with self._async_lock:
+            if self._tools is None:
+                if inspect.iscoroutinefunction(self._factory):
+                    logger.info(f"Building tool group {self.name}")
+                    try:
+                        tools = await self._factory()
+                    except Exception as e:
+                        raise self._unavailable(e) from e
+                    self._store(tools)
+                else:
+                    await asyncio.to_thread(self.build)
+            return self._tools
+
+    def _lookup(self, tools: Dict[str, Tool], name: str) -> Tool:
+        tool = tools.get(name)
+        if tool is None:
+            raise ValueError(f"The tool '{name}' is no longer available.")
+        return tool
+
+    def tool(self, name: str) -> Tool:
+        return self._lookup(self.build(), name)
+
+    async def atool(self, name: str) -> Tool:
+        return self._lookup(await self.abuild(), name)
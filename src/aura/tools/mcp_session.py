@@ -0,0 +1,224 @@
+"""Long-lived MCP server sessions shared by every tool call.
+
+The stock ``MCPToolAdapter`` spawns the server and initializes a new session
+for each call. Here every server is started once, kept running for the life
+of the process and restarted with a backoff if it exits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import anyio
+from autogen_core import CancellationToken
+from autogen_ext_mcp.tools import MCPToolAdapter
+from mcp import ClientSession, StdioServerParameters, Tool
+from mcp.client.stdio import stdio_client
+from pydantic import BaseModel
+from utils.tracing import TracedToolMixin
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before each restart after consecutive failures
+RESTART_BACKOFF = (1.0, 2.0, 5.0, 10.0, 30.0)
+DEFAULT_CALL_TIMEOUT = 120.0
+
+
+class MCPServerSession:
+    """One MCP server process and the client session connected to it.
+
+    The server is started on first use (or by :meth:`start`) and the same
+    initialized session serves every request. When the process exits, calls
+    in flight fail and the server is restarted in the background.
+
+    Args:
+        server_params: How to spawn the server.
+        call_timeout: Seconds to wait for a response before giving up.
+    """
+
+    def __init__(
+        self,
+        server_params: StdioServerParameters,
+        call_timeout: Optional[float] = DEFAULT_CALL_TIMEOUT,
+    ):
+        self.server_params = server_params
+        self.call_timeout = call_timeout
+        self.restarts = 0
+        self._runner: Optional[asyncio.Task] = None
+        self._connection: Optional[asyncio.Future] = None
+        self._ended: Optional[asyncio.Event] = None
+        self._closing = False
+
+    @property
+    def name(self) -> str:
+        return " ".join([self.server_params.command, *self.server_params.args])
+
+    def start(self) -> None:
+        """Start the server in the background if it is not running yet."""
+        if self._runner is None or self._runner.done():
+            self._closing = False
+            self._connection = asyncio.get_running_loop().create_future()
+            self._runner = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the server and wait for the process to exit."""
+        self._closing = True
+        if self._ended is not None:
+            self._ended.set()
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+
+    def _settle(self, result: Any = None, error: Optional[Exception] = None) -> None:
+        # Replace an already settled connection so later callers see the new state
+        if self._connection is None or self._connection.done():
+            self._connection = asyncio.get_running_loop().create_future()
+        if error is None:
+            self._connection.set_result(result)
+        else:
+            self._connection.set_exception(error)
+            # Retrieved by whoever calls next; don't warn if nobody does
+            self._connection.exception()
+
+    async def _relay(self, source: Any, sink: Any, ended: asyncio.Event) -> None:
+        try:
+            async with sink:
+                async for message in source:
+                    await sink.send(message)
+        finally:
+            # stdout closed: the server process is gone
+            ended.set()
+
+    async def _serve(self, ended: asyncio.Event) -> None:
+        timeout = timedelta(seconds=self.call_timeout) if self.call_timeout else None
+        async with stdio_client(self.server_params) as (read, write):
+            relay_sink, relay_source = anyio.create_memory_object_stream(0)
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(self._relay, read, relay_sink, ended)
+                async with ClientSession(relay_source, write, timeout) as session:
+                    await session.initialize()
+                    self._settle((session, ended))
+                    logger.info(f"MCP server ready: {self.name}")
+                    await ended.wait()
+                tg.cancel_scope.cancel()
+
+    async def _run(self) -> None:
+        failures = 0
+        while not self._closing:
+            ended = self._ended = asyncio.Event()
+            error: Exception = ConnectionError(f"MCP server exited: {self.name}")
+            try:
+                await self._serve(ended)
+                failures = 0
+            except Exception as e:
+                error = e
+                failures += 1
+            if self._closing:
+                break
+            if asyncio.current_task().cancelling():
+                # anyio's cancel scopes can swallow the task's cancellation
+                raise asyncio.CancelledError()
+
+            self._settle(error=error)
+            delay = RESTART_BACKOFF[min(failures, len(RESTART_BACKOFF) - 1)]
+            logger.warning(
+                f"MCP server stopped ({error}); restarting in {delay:.0f}s: {self.name}"
+            )
+            await asyncio.sleep(delay)
+            self.restarts += 1
+            self._connection = asyncio.get_running_loop().create_future()
+
+    async def _request(
+        self,
+        send: Callable[[ClientSession], Awaitable[Any]],
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> Any:
+        self.start()
+        session, ended = await asyncio.shield(self._connection)
+        if ended.is_set():
+            raise ConnectionError(f"MCP server is restarting: {self.name}")
+
+        request = asyncio.ensure_future(send(session))
+        if cancellation_token is not None:
+            cancellation_token.link_future(request)
+        lost = asyncio.ensure_future(ended.wait())
+        try:
+            await asyncio.wait({request, lost}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            lost.cancel()
+
+        if not request.done():
+            request.cancel()
+            raise ConnectionError(f"MCP server exited during the request: {self.name}")
+        return request.result()
+
+    async def list_tools(self) -> List[Tool]:
+        result = await self._request(lambda session: session.list_tools())
+        return result.tools
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> Any:
+        return await self._request(
+            lambda session: session.call_tool(name, arguments), cancellation_token
+        )
+
+
+class MCPSessionPool:
+    """Registry of running MCP servers, one per distinct set of parameters."""
+
+    def __init__(self):
+        self._servers: Dict[str, MCPServerSession] = {}
+
+    def get(self, server_params: StdioServerParameters) -> MCPServerSession:
+        key = server_params.model_dump_json()
+        server = self._servers.get(key)
+        if server is None:
+            server = self._servers[key] = MCPServerSession(server_params)
+        return server
+
+    async def close(self) -> None:
+        servers, self._servers = list(self._servers.values()), {}
+        await asyncio.gather(*(server.close() for server in servers))
+
+
+_pool = MCPSessionPool()
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Return the pool shared by every MCP tool in the process."""
+    return _pool
+
+
+class PooledMCPToolAdapter(TracedToolMixin, MCPToolAdapter):
+    """MCP tool adapter that calls the tool over a pooled, long-lived session.
+
+    Every call is traced.
+    """
+
+    def __init__(self, server: MCPServerSession, tool: Tool) -> None:
+        super().__init__(server.server_params, tool)
+        self._server = server
+
+    async def run(self, args: BaseModel, cancellation_token: CancellationToken) -> Any:
+        result = await self._server.call_tool(
+            self._tool.name, args.model_dump(), cancellation_token
+        )
+        if result.isError:
+            raise Exception(f"MCP tool execution failed: {result.content}")
+        return result.content
+
+
+async def get_tools_from_mcp_session(
+    server_params: StdioServerParameters,
+) -> List[PooledMCPToolAdapter]:
+    """Start (or reuse) the server and wrap each of its tools."""
+    server = get_mcp_session_pool().get(server_params)
+    return [PooledMCPToolAdapter(server, tool) for tool in await server.list_tools()]
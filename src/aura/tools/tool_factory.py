@@ -1,63 +1,115 @@
+import os
+from functools import partial
 from pathlib import Path
-from autogen_ext.tools.langchain import LangChainToolAdapter
-from autogen_ext_mcp.tools import get_tools_from_mcp_server
-from langchain_google_community import GmailToolkit
-from langchain_google_community.gmail.utils import (
-    build_resource_service as build_gmail_resource_service,
-)
-from mcp import StdioServerParameters
-
-from .gmail.toolkit import GmailToolkitExt
-from .google_calendar.toolkit import GoogleCalendarToolkit
-from .google_calendar.utils import (
-    build_resource_service as build_google_calendar_resource_service,
-)
-from .utilities.get_current_time import GetCurrentTime
-
-
-file_system_server = StdioServerParameters(
-    command="npx.cmd",
-    args=[
-        "-y",
-        "@modelcontextprotocol/server-filesystem",
-        str(Path.home() / "Desktop" / "aura"),
-    ],
-)
+from typing import List, Optional
+
+from .lazy import LazyToolGroup, ToolSchemaCache
+
+# Tools that write the same resource, mapped to it; their calls from one model
+# response run one at a time, in the order the model made them.
+SERIALIZED_TOOLS = {
+    "create_gmail_label": "gmail_labels",
+    "edit_gmail_label": "gmail_labels",
+    "delete_gmail_label": "gmail_labels",
+    "modify_gmail_email_labels": "gmail_labels",
+    "create_google_calendar_event": "google_calendar_events",
+    "edit_google_calendar_event": "google_calendar_events",
+    "delete_google_calendar_event": "google_calendar_events",
+    "write_file": "file_system",
+    "edit_file": "file_system",
+    "create_directory": "file_system",
+    "move_file": "file_system",
+}
+
+# The toolkits pull in langchain, the Google client libraries and MCP, so they
+# are imported by the factories below only when a tool group is first built.
+
+
+def get_file_system_server():
+    from mcp import StdioServerParameters
+
+    return StdioServerParameters(
+        command="npx.cmd",
+        args=[
+            "-y",
+            "@modelcontextprotocol/server-filesystem",
+            str(Path.home() / "Desktop" / "aura"),
+        ],
+    )
 
 
 async def get_file_system_tools():
-    return await get_tools_from_mcp_server(file_system_server)
+    from .mcp_session import get_tools_from_mcp_session
+
+    return await get_tools_from_mcp_session(get_file_system_server())
 
 
 def get_gmail_tools(scopes: list[str]):
-    api_resource = build_gmail_resource_service(scopes=scopes)
+    from langchain_google_community import GmailToolkit
+    from utils.google_auth import get_credentials
+    from utils.google_discovery import build_service
+
+    from .gmail.toolkit import GmailToolkitExt
+    from .langchain_adapter import AsyncLangChainToolAdapter
+
+    api_resource = build_service("gmail", "v1", get_credentials(scopes))
 
     gmailTookit = GmailToolkit(api_resource=api_resource)
-    gmailToolkitExt = GmailToolkitExt(api_resource=api_resource)
+    gmailToolkitExt = GmailToolkitExt(api_resource=api_resource, compact_output=True)
 
     tools = gmailTookit.get_tools() + gmailToolkitExt.get_tools()
 
-    autogen_tools = [LangChainToolAdapter(tool) for tool in tools]
+    autogen_tools = [AsyncLangChainToolAdapter(tool) for tool in tools]
 
     return autogen_tools
 
 
 def get_google_calendar_tools(scopes: list[str]):
+    from utils.google_auth import get_credentials
+    from utils.google_discovery import build_service
+
+    from .google_calendar.toolkit import GoogleCalendarToolkit
+    from .langchain_adapter import AsyncLangChainToolAdapter
+
     google_calendar_toolkit = GoogleCalendarToolkit(
-        api_resource=build_google_calendar_resource_service(scopes=scopes)
+        api_resource=build_service("calendar", "v3", get_credentials(scopes)),
+        # The mirror stores events on disk, so it is only used when asked for
+        use_sync_mirror=os.environ.get("AURA_CALENDAR_MIRROR") == "1",
+        compact_output=True,
     )
     tools = google_calendar_toolkit.get_tools()
 
-    autogen_tools = [LangChainToolAdapter(tool) for tool in tools]
+    autogen_tools = [AsyncLangChainToolAdapter(tool) for tool in tools]
 
     return autogen_tools
 
 
 def get_utility_tools():
+    from .langchain_adapter import AsyncLangChainToolAdapter
+    from .utilities.get_current_time import GetCurrentTime
+    from .utilities.read_more_results import ReadMoreResults
+
     tools = [
         GetCurrentTime(),
+        ReadMoreResults(),
     ]
 
-    autogen_tools = [LangChainToolAdapter(tool) for tool in tools]
+    autogen_tools = [AsyncLangChainToolAdapter(tool) for tool in tools]
 
     return autogen_tools
+
+
+def get_tool_groups(
+    scopes: list[str], schema_cache: Optional[ToolSchemaCache] = None
+) -> List[LazyToolGroup]:
+    """Return every tool group, built on first use."""
+    schema_cache = schema_cache or ToolSchemaCache()
+    return [
+        LazyToolGroup("gmail", partial(get_gmail_tools, scopes), schema_cache),
+        LazyToolGroup(
+            "google_calendar", partial(get_google_calendar_tools, scopes), schema_cache
+        ),
+        LazyToolGroup("utility", get_utility_tools, schema_cache),
+        # Start the MCP server right away so it is warm by the first call
+        LazyToolGroup("file_system", get_file_system_tools, schema_cache, prewarm=True),
+    ]
@@ -1,9 +1,9 @@
 from datetime import datetime
 from typing import Type
 
-from dateutil import tz
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
+from utils.timezone import get_zone
 
 
 class TimeZoneInput(BaseModel):
@@ -20,6 +20,6 @@ class GetCurrentTime(BaseTool):
     args_schema: Type[BaseModel] = TimeZoneInput
 
     def _run(self, timezone: str) -> str:
-        user_timezone = tz.gettz(timezone)
+        user_timezone = get_zone(timezone)
         now = datetime.now(tz=user_timezone)
         return now.strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,38 @@
+import json
+from typing import Type
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+from utils.continuation import get_continuation_store
+
+
+class ReadMoreResultsInput(BaseModel):
+    handle: str = Field(description="The handle given in a shortened tool result")
+    offset: int = Field(default=0, description="Index of the first item to return")
+    limit: int = Field(default=20, description="Maximum number of items to return")
+
+
+class ReadMoreResults(BaseTool):
+    name: str = "read_more_results"
+    description: str = (
+        "Some tools shorten their results and give a handle for the rest. "
+        "Use this tool with that handle to read the full, untruncated items."
+    )
+    args_schema: Type[BaseModel] = ReadMoreResultsInput
+
+    def _run(self, handle: str, offset: int = 0, limit: int = 20) -> str:
+        items = get_continuation_store().get(handle)
+        if items is None:
+            return f"No results for handle {handle}; they expired. Call the original tool again."
+
+        end = offset + max(1, limit)
+        lines = [
+            json.dumps(
+                {key: value for key, value in item.items() if value is not None},
+                ensure_ascii=False,
+            )
+            for item in items[offset:end]
+        ]
+        if end < len(items):
+            lines.append(f"{len(items) - end} more, continue with offset={end}.")
+        return "\n".join(lines)
@@ -1,64 +1,94 @@
-import time
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 from autogen_agentchat.base import Response
 from autogen_agentchat.messages import AgentMessage
-from autogen_core.models import RequestUsage
 from rich.console import Console
 from rich.markdown import Markdown
+from rich.table import Table
 from rich.text import Text
 
+from utils.turn_stats import TurnRecorder, TurnStats
+
+
+def _tool_table(stats: TurnStats) -> Table:
+    table = Table(box=None, style="dim cyan", header_style="dim cyan")
+    table.add_column("Tool", style="dim cyan")
+    table.add_column("Calls", justify="right", style="dim cyan")
+    table.add_column("Total", justify="right", style="dim cyan")
+    table.add_column("Max", justify="right", style="dim cyan")
+    for name, latency in sorted(
+        stats.tools.items(), key=lambda item: item[1].total, reverse=True
+    ):
+        table.add_row(
+            name,
+            str(latency.calls),
+            f"{latency.total:.2f}s",
+            f"{latency.max:.2f}s",
+        )
+    return table
+
 
 async def RichConsole(
     stream: AsyncGenerator[AgentMessage | Response, None],
     show_intermediate: bool = True,
-) -> None:
+    stats_file: Optional[str] = None,
+) -> TurnStats:
     """Consume the stream from  :meth:`~autogen_agentchat.teams.Team.run_stream`
     and print the messages to the console.
 
+    Ends with a summary of the turn: tokens, time to the first message, the
+    split between model calls and tool execution, and per-tool latencies.
+
     Args:
         stream: The message stream to consume
         show_intermediate: Whether to show intermediate messages (default: True)
+        stats_file: File to append the turn's statistics to as a JSON line
+
+    Returns:
+        The statistics of the turn.
     """
     console = Console()
-    start_time = time.time()
-    total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+    recorder = TurnRecorder()
 
     async for message in stream:
+        offset = recorder.record(message)
+
         if isinstance(message, Response):
-            duration = time.time() - start_time
-            stats = Text()
-            stats.append(
-                f"Messages: {len(message.inner_messages)} • ", style="dim cyan"
-            )
-            stats.append(
-                f"Tokens: {total_usage.prompt_tokens}/{total_usage.completion_tokens} • ",
-                style="dim cyan",
+            stats = recorder.finish()
+            summary = Text(style="dim cyan")
+            summary.append(f"Messages: {stats.messages} • ")
+            summary.append(
+                f"Tokens: {stats.prompt_tokens}/{stats.completion_tokens} • "
             )
-            stats.append(f"Duration: {duration:.2f}s", style="dim cyan")
+            summary.append(f"First message: {stats.first_message:.2f}s • ")
+            summary.append(f"Model: {stats.model_time:.2f}s • ")
+            summary.append(f"Tools: {stats.tool_time:.2f}s • ")
+            summary.append(f"Duration: {stats.duration:.2f}s")
             console.print(Markdown(message.chat_message.content), style="turquoise4")
-            console.print(stats)
-        else:
-            # Always update token usage even if not showing intermediate messages
-            if message.models_usage:
-                total_usage.completion_tokens += message.models_usage.completion_tokens
-                total_usage.prompt_tokens += message.models_usage.prompt_tokens
+            console.print(summary)
+            if stats.tools:
+                console.print(_tool_table(stats))
+        elif show_intermediate:
+            content = Text()
 
-            if show_intermediate:
-                content = Text()
+            # Add the message source and its time into the turn as a header
+            content.append(f"{message.source} +{offset:.2f}s\n", style="dim")
 
-                # Add the message source as a header
-                content.append(f"{message.source}\n", style="dim")
+            # Add the message content
+            content.append(f"{message.content}\n", style="dim")
 
-                # Add the message content
-                content.append(f"{message.content}\n", style="dim")
+            # Add usage statistics if present
+            if message.models_usage:
+                content.append(
+                    f"[Tokens: {message.models_usage.prompt_tokens} prompt, {message.models_usage.completion_tokens} completion]",
+                    style="dim cyan",
+                )
 
-                # Add usage statistics if present
-                if message.models_usage:
-                    content.append(
-                        f"[Tokens: {message.models_usage.prompt_tokens} prompt, {message.models_usage.completion_tokens} completion]",
-                        style="dim cyan",
-                    )
+            console.print(content)
+            console.print()  # Add a blank line between messages
 
-                console.print(content)
-                console.print()  # Add a blank line between messages
+    stats = recorder.finish()
+    if stats_file:
+        with open(stats_file, "a") as f:
+            f.write(stats.to_json() + "\n")
+    return stats
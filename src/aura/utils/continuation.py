@@ -0,0 +1,79 @@
+"""Full tool results held back from compact outputs, retrievable by handle."""
+
+from __future__ import annotations
+
+import contextlib
+import secrets
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional
+
+DEFAULT_MAX_RESULTS = 64
+
+
+class ContinuationStore:
+    """Keeps the full items behind recent compact tool outputs.
+
+    A compact output names the handle of its items, and the model reads them
+    in full with the ``read_more_results`` tool. Only the most recent
+    ``max_results`` outputs are kept. Handles are random, so one session
+    cannot guess another's.
+
+    Args:
+        max_results: Number of stored results before the oldest is dropped.
+    """
+
+    def __init__(self, max_results: int = DEFAULT_MAX_RESULTS):
+        self.max_results = max_results
+        self._results: OrderedDict[str, List[Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, items: List[Any]) -> str:
+        """Store ``items`` and return their handle."""
+        with self._lock:
+            handle = secrets.token_urlsafe(6)
+            self._results[handle] = items
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+            return handle
+
+    def get(self, handle: str) -> Optional[List[Any]]:
+        """Return the items stored under ``handle``, if still kept."""
+        with self._lock:
+            items = self._results.get(handle)
+            if items is not None:
+                self._results.move_to_end(handle)
+            return items
+
+
+_default_store = ContinuationStore()
+_current_store: ContextVar[ContinuationStore] = ContextVar(
+    "continuation_store", default=_default_store
+)
+
+
+def get_continuation_store() -> ContinuationStore:
+    """Return the store of the current session.
+
+    Outside :func:`use_continuation_store`, e.g. in scripts, this is a store
+    shared by the process.
+    """
+    return _current_store.get()
+
+
+@contextlib.contextmanager
+def use_continuation_store(store: ContinuationStore) -> Iterator[ContinuationStore]:
+    """Make ``store`` the current one for the tool calls started within."""
+    token = _current_store.set(store)
+    try:
+        yield store
+    finally:
+        _current_store.reset(token)
+
+
+def truncate(text: Optional[str], limit: int) -> Optional[str]:
+    """Cut ``text`` to ``limit`` characters, marking the cut with an ellipsis."""
+    if text is None or len(text) <= limit:
+        return text
+    return text[: limit - 1].rstrip() + "…"
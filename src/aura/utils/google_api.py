@@ -0,0 +1,125 @@
+"""Helpers for executing Google API requests without blocking the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource  # type: ignore[import]
+    from googleapiclient.http import HttpRequest  # type: ignore[import]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Worker threads of the shared request pool
+DEFAULT_REQUEST_WORKERS = 8
+
+_local = threading.local()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def thread_http(http: Any) -> Any:
+    """Return an authorized http client owned by the calling thread.
+
+    httplib2 connections are not thread-safe, so each worker thread gets its
+    own transport bound to the same credentials as ``http``, the client the
+    discovery resource was built with.
+    """
+    credentials = getattr(http, "credentials", None)
+    if credentials is None:
+        return http
+
+    clients = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = {}
+
+    http = clients.get(id(credentials))
+    if http is None or http.credentials is not credentials:
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.http import build_http
+
+        http = AuthorizedHttp(credentials, http=build_http())
+        clients[id(credentials)] = http
+
+    return http
+
+
+def account_key(api_resource: Resource) -> str:
+    """Return a stable key identifying the account behind a resource.
+
+    Used to scope shared caches so that resources built for different users
+    never see each other's data.
+    """
+    credentials = getattr(getattr(api_resource, "_http", None), "credentials", None)
+    if credentials is None:
+        return f"resource-{id(api_resource)}"
+
+    service_account = getattr(credentials, "service_account_email", None)
+    if service_account:
+        subject = getattr(credentials, "_subject", None) or ""
+        return f"{service_account}:{subject}"
+
+    refresh_token = getattr(credentials, "refresh_token", None)
+    if refresh_token:
+        client_id = getattr(credentials, "client_id", None) or ""
+        digest = hashlib.sha256(f"{client_id}:{refresh_token}".encode())
+        return digest.hexdigest()[:16]
+
+    return f"credentials-{id(credentials)}"
+
+
+def execute(request: HttpRequest, num_retries: int = 0) -> Any:
+    """Execute a request on the calling thread's own http client."""
+    return request.execute(http=thread_http(request.http), num_retries=num_retries)
+
+
+async def execute_async(request: HttpRequest, num_retries: int = 0) -> Any:
+    """Execute a request in a worker thread and await its result.
+
+    Args:
+        request: The request built from a discovery resource, e.g.
+            ``service.events().list(...)``.
+        num_retries: Number of times to retry with exponential backoff.
+
+    Returns:
+        The deserialized response body.
+    """
+    return await asyncio.to_thread(execute, request, num_retries)
+
+
+def get_request_executor() -> ThreadPoolExecutor:
+    """Return the thread pool shared by every sync caller fanning out requests.
+
+    Its threads live as long as the process, so the per-thread http clients
+    of :func:`thread_http`, and their open connections, are reused by later
+    calls instead of being set up again for each one.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_REQUEST_WORKERS, thread_name_prefix="google-api"
+            )
+        return _executor
+
+
+def map_requests(
+    func: Callable[[T], R], items: Iterable[T], max_concurrency: int
+) -> List[R]:
+    """Apply ``func`` to ``items`` on the shared pool, in order.
+
+    At most ``max_concurrency`` of these calls run at once, whatever the
+    size of the pool.
+    """
+    slots = threading.BoundedSemaphore(max(1, max_concurrency))
+
+    def call(item: T) -> R:
+        with slots:
+            return func(item)
+
+    return list(get_request_executor().map(call, items))
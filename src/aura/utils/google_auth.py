@@ -0,0 +1,216 @@
+"""Process-wide provider of Google user credentials."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import weakref
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Set
+
+from utils.file_lock import file_lock, write_atomic
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials  # type: ignore[import]
+
+DEFAULT_TOKEN_FILE = "token.json"
+DEFAULT_CLIENT_SECRETS_FILE = "credentials.json"
+# google-auth refreshes inline within ~4 minutes of expiry; stay ahead of it
+DEFAULT_REFRESH_MARGIN = 600.0
+REFRESH_RETRY_DELAY = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialProvider:
+    """Loads the user's OAuth credentials once, shares them and keeps them fresh.
+
+    Every toolkit asks the provider for credentials instead of reading the
+    token file itself. The first request loads (and if needed refreshes or
+    authorizes) the credentials; later requests get the same object as long
+    as their scopes were already requested.
+
+    A background thread refreshes the access token ``refresh_margin`` seconds
+    before it expires, so requests never wait for a refresh. The token file is
+    only read and written under a cross-process lock, and always replaced
+    atomically. A token another process refreshed in the meantime is adopted
+    instead of being refreshed again. The lock is not held while the user
+    authorizes in the browser.
+
+    Args:
+        token_file: File the access and refresh tokens are stored in.
+        client_secrets_file: OAuth client secrets used to authorize when there
+            is no usable token.
+        auto_refresh: Whether to refresh tokens in the background.
+        refresh_margin: Seconds before expiry at which to refresh.
+    """
+
+    def __init__(
+        self,
+        token_file: str = DEFAULT_TOKEN_FILE,
+        client_secrets_file: str = DEFAULT_CLIENT_SECRETS_FILE,
+        auto_refresh: bool = True,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+    ):
+        self.token_file = token_file
+        self.client_secrets_file = client_secrets_file
+        self.auto_refresh = auto_refresh
+        self.refresh_margin = refresh_margin
+        self._credentials: Optional[Credentials] = None
+        self._handed_out: "weakref.WeakSet[Credentials]" = weakref.WeakSet()
+        self._scopes: Set[str] = set()
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stopped = False
+        # Wakes the refresh thread to stop, or to reschedule for new credentials
+        self._wake = threading.Event()
+
+    def get_credentials(self, scopes: Optional[Sequence[str]] = None) -> Credentials:
+        """Return credentials covering ``scopes``, loading them if needed.
+
+        Requesting new scopes loads new credentials. Those handed out before
+        keep working: every refresh also updates their access token.
+        """
+        requested = set(scopes or ())
+        with self._lock:
+            if self._credentials is None or not requested <= self._scopes:
+                self._scopes |= requested
+                self._credentials = self._load(sorted(self._scopes))
+                self._handed_out.add(self._credentials)
+                self._share(self._credentials)
+                self._wake.set()
+                if self.auto_refresh and self._credentials.refresh_token:
+                    self._start_refresher()
+            return self._credentials
+
+    def _share(self, creds: Credentials) -> None:
+        # The token of the widest scopes also serves the narrower ones
+        for other in list(self._handed_out):
+            if other is not creds:
+                other.token = creds.token
+                other.expiry = creds.expiry
+
+    def _read_token_file(
+        self, scopes: Optional[Sequence[str]]
+    ) -> Optional[Credentials]:
+        from google.oauth2.credentials import Credentials
+
+        if not os.path.exists(self.token_file):
+            return None
+        return Credentials.from_authorized_user_file(self.token_file, scopes)
+
+    def _write_token_file(self, creds: Credentials) -> None:
+        write_atomic(self.token_file, creds.to_json())
+
+    def _load(self, scopes: Sequence[str]) -> Credentials:
+        # From https://developers.google.com/gmail/api/quickstart/python
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        with file_lock(self.token_file):
+            creds = self._read_token_file(scopes)
+            if creds and creds.valid:
+                return creds
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+                self._write_token_file(creds)
+                return creds
+
+        # Consent waits on the user, so other processes must not wait on it
+        flow = InstalledAppFlow.from_client_secrets_file(
+            self.client_secrets_file, scopes
+        )
+        creds = flow.run_local_server(port=0)
+
+        with file_lock(self.token_file):
+            # Scopes as granted, not as requested
+            stored = self._read_token_file(None)
+            if stored and stored.valid and set(scopes) <= set(stored.scopes or ()):
+                # Another process was authorized meanwhile; keep its token
+                return stored
+            self._write_token_file(creds)
+        return creds
+
+    def refresh(self) -> None:
+        """Refresh the shared credentials in place and persist the new token."""
+        from google.auth.transport.requests import Request
+
+        creds = self._credentials
+        with file_lock(self.token_file):
+            stored = self._read_token_file(sorted(self._scopes))
+            if (
+                stored is not None
+                and stored.expiry is not None
+                and stored.refresh_token == creds.refresh_token
+                and (creds.expiry is None or stored.expiry > creds.expiry)
+                and self._seconds_left(stored) > self.refresh_margin
+            ):
+                # Another process already refreshed the token
+                creds.token = stored.token
+                creds.expiry = stored.expiry
+                self._share(creds)
+                return
+
+            creds.refresh(Request())
+            self._write_token_file(creds)
+        self._share(creds)
+        logger.info(f"Refreshed access token, valid until {creds.expiry}")
+
+    def _seconds_left(self, creds: Credentials) -> float:
+        if creds.expiry is None:
+            return float("inf")
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (creds.expiry - now).total_seconds()
+
+    def _start_refresher(self) -> None:
+        if self._refresher is None or not self._refresher.is_alive():
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="oauth-refresh", daemon=True
+            )
+            self._refresher.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh."""
+        self._stopped = True
+        self._wake.set()
+
+    def _refresh_loop(self) -> None:
+        while not self._stopped:
+            self._wake.clear()
+            delay = self._seconds_left(self._credentials) - self.refresh_margin
+            if self._wake.wait(None if delay == float("inf") else max(delay, 0.0)):
+                # Stopped, or the credentials were replaced: schedule anew
+                continue
+
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Background token refresh failed: {e}")
+                self._wake.wait(REFRESH_RETRY_DELAY)
+
+
+_providers: Dict[str, CredentialProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_credential_provider(
+    token_file: Optional[str] = None, client_secrets_file: Optional[str] = None
+) -> CredentialProvider:
+    """Return the provider shared by everything using the same token file."""
+    token_file = token_file or DEFAULT_TOKEN_FILE
+    with _providers_lock:
+        provider = _providers.get(token_file)
+        if provider is None:
+            provider = _providers[token_file] = CredentialProvider(
+                token_file, client_secrets_file or DEFAULT_CLIENT_SECRETS_FILE
+            )
+        return provider
+
+
+def get_credentials(
+    scopes: Optional[Sequence[str]] = None, token_file: Optional[str] = None
+) -> Credentials:
+    """Return the shared user credentials covering ``scopes``."""
+    return get_credential_provider(token_file).get_credentials(scopes)
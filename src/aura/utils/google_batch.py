@@ -0,0 +1,109 @@
+"""Batching of Google API requests into multipart HTTP batch calls."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from utils.google_api import thread_http
+from utils.tracing import get_tracer
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource  # type: ignore[import]
+    from googleapiclient.http import HttpRequest  # type: ignore[import]
+
+# Google recommends keeping batches at 50 calls; Gmail rejects more than 100
+DEFAULT_MAX_BATCH_SIZE = 50
+# Prefix of the IDs given to requests added without one; reserved for them
+AUTO_ID_PREFIX = "_auto"
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a single request sent as part of a batch."""
+
+    request_id: str
+    response: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class GoogleApiBatch:
+    """Queue requests for one API resource and send them as batch requests.
+
+    Requests are sent in multipart batches of at most ``max_batch_size`` calls.
+    Each response or error is mapped back to the request it belongs to, and
+    results are returned in the order the requests were added. Requests
+    added without an ID get one starting with ``AUTO_ID_PREFIX``, which
+    explicit IDs may not use.
+
+    Args:
+        api_resource: The discovery resource the queued requests were built from.
+        max_batch_size: Maximum number of calls per HTTP batch.
+    """
+
+    def __init__(
+        self, api_resource: Resource, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be greater than 0.")
+
+        self._api_resource = api_resource
+        self._max_batch_size = max_batch_size
+        self._queue: List[Tuple[str, HttpRequest]] = []
+        self._request_ids: Set[str] = set()
+        self._auto_ids = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add(self, request: HttpRequest, request_id: Optional[str] = None) -> str:
+        """Queue a request and return the ID its result will carry."""
+        if request_id is None:
+            request_id = f"{AUTO_ID_PREFIX}{next(self._auto_ids)}"
+        elif request_id.startswith(AUTO_ID_PREFIX):
+            raise ValueError(
+                f"Batch request IDs starting with {AUTO_ID_PREFIX!r} are reserved: {request_id}"
+            )
+        if request_id in self._request_ids:
+            raise ValueError(f"Duplicate batch request ID: {request_id}")
+
+        self._request_ids.add(request_id)
+        self._queue.append((request_id, request))
+        return request_id
+
+    def execute(self) -> List[BatchResult]:
+        """Send all queued requests and return one result per request."""
+        queue, self._queue = self._queue, []
+        self._request_ids = set()
+        results: Dict[str, BatchResult] = {}
+
+        def callback(request_id: str, response: Any, exception: Exception) -> None:
+            results[request_id] = BatchResult(request_id, response, exception)
+
+        http = thread_http(self._api_resource._http)
+        for start in range(0, len(queue), self._max_batch_size):
+            chunk = queue[start : start + self._max_batch_size]
+            batch = self._api_resource.new_batch_http_request(callback=callback)
+            for request_id, request in chunk:
+                batch.add(request, request_id=request_id)
+
+            try:
+                with get_tracer().start_as_current_span("google batch") as span:
+                    span.set_attribute("aura.batch.size", len(chunk))
+                    batch.execute(http=http)
+            except Exception as e:
+                # The batch itself failed, so none of its calls went through
+                for request_id, _ in chunk:
+                    results[request_id] = BatchResult(request_id, error=e)
+
+        return [results[request_id] for request_id, _ in queue]
+
+    async def execute_async(self) -> List[BatchResult]:
+        """Send all queued requests from a worker thread."""
+        return await asyncio.to_thread(self.execute)
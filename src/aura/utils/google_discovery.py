@@ -0,0 +1,102 @@
+"""Cached Google API discovery documents and service construction."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource  # type: ignore[import]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DISCOVERY_CACHE_DIR = ".discovery_cache"
+
+_documents: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_services: Dict[Tuple[str, str, int], Tuple[Any, Resource]] = {}
+_lock = threading.Lock()
+
+
+def _cache_file(cache_dir: str, service_name: str, version: str) -> str:
+    return os.path.join(cache_dir, f"{service_name}.{version}.json")
+
+
+def _read_cached(cache_dir: str, service_name: str, version: str) -> Optional[str]:
+    try:
+        with open(_cache_file(cache_dir, service_name, version)) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _fetch(cache_dir: str, service_name: str, version: str) -> str:
+    from googleapiclient.discovery import DISCOVERY_URI, V2_DISCOVERY_URI
+    from googleapiclient.http import build_http
+
+    http = build_http()
+    for template in (DISCOVERY_URI, V2_DISCOVERY_URI):
+        url = template.format(api=service_name, apiVersion=version)
+        response, content = http.request(url)
+        if response.status < 400:
+            break
+    else:
+        raise ValueError(f"No discovery document for {service_name} {version}")
+
+    content = content.decode("utf-8")
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(_cache_file(cache_dir, service_name, version), "w") as f:
+        f.write(content)
+    return content
+
+
+def get_discovery_document(
+    service_name: str, version: str, cache_dir: str = DEFAULT_DISCOVERY_CACHE_DIR
+) -> Dict[str, Any]:
+    """Return the parsed discovery document of an API.
+
+    Documents come from the copies bundled with google-api-python-client,
+    then from ``cache_dir``. Only an API missing from both is downloaded, once,
+    and stored in ``cache_dir``. Parsed documents are kept for the process.
+    """
+    from googleapiclient.discovery_cache import get_static_doc
+
+    key = (service_name, version)
+    with _lock:
+        document = _documents.get(key)
+        if document is None:
+            content = get_static_doc(service_name, version) or _read_cached(
+                cache_dir, service_name, version
+            )
+            if content is None:
+                logger.info(
+                    f"Downloading discovery document for {service_name} {version}"
+                )
+                content = _fetch(cache_dir, service_name, version)
+            document = _documents[key] = json.loads(content)
+        return document
+
+
+def build_service(service_name: str, version: str, credentials: Any) -> Resource:
+    """Return the API resource for ``credentials``, building it only once.
+
+    Toolkits asking for the same API with the same credentials share one
+    resource, and with it the account-scoped caches keyed on it.
+    """
+    from googleapiclient.discovery import build_from_document
+    from utils.google_tracing import TracedHttpRequest
+
+    document = get_discovery_document(service_name, version)
+    key = (service_name, version, id(credentials))
+    with _lock:
+        cached = _services.get(key)
+        if cached is not None and cached[0] is credentials:
+            return cached[1]
+
+        service = build_from_document(
+            document, credentials=credentials, requestBuilder=TracedHttpRequest
+        )
+        _services[key] = (credentials, service)
+        return service
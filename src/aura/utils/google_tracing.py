@@ -0,0 +1,47 @@
+"""Google API requests that record a span per execution."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from opentelemetry.trace import SpanKind
+
+from utils.tracing import get_tracer
+
+
+class TracedHttpRequest(HttpRequest):
+    """``HttpRequest`` that wraps ``execute()`` in a client span.
+
+    Passed as ``requestBuilder`` when a discovery resource is built, so every
+    request of the resource, including follow-up pages, is traced. The span
+    records the API method, the status and the request and response sizes.
+    """
+
+    def execute(self, http: Any = None, num_retries: int = 0) -> Any:
+        with get_tracer().start_as_current_span(
+            f"google {self.methodId}", kind=SpanKind.CLIENT
+        ) as span:
+            if not span.is_recording():
+                return super().execute(http=http, num_retries=num_retries)
+
+            span.set_attribute("google.api.method", self.methodId or "")
+            span.set_attribute("http.request.method", self.method)
+            span.set_attribute("http.request.body.size", len(self.body or ""))
+
+            postproc = self.postproc
+
+            def record(response: Any, content: bytes) -> Any:
+                span.set_attribute("http.response.status_code", response.status)
+                span.set_attribute("http.response.body.size", len(content or b""))
+                return postproc(response, content)
+
+            self.postproc = record
+            try:
+                return super().execute(http=http, num_retries=num_retries)
+            except HttpError as e:
+                span.set_attribute("http.response.status_code", e.resp.status)
+                raise
+            finally:
+                self.postproc = postproc
@@ -0,0 +1,122 @@
+"""Prompt input and Ctrl-C handling that keep the event loop running."""
+
+import asyncio
+import queue
+import signal
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from autogen_core import CancellationToken
+
+T = TypeVar("T")
+
+
+class Interrupted(Exception):
+    """Raised by :meth:`Interrupts.run` when Ctrl-C cancelled the awaited work."""
+
+
+def _resolve(
+    future: asyncio.Future, line: Optional[str], error: Optional[BaseException]
+) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(line)
+
+
+class AsyncInput:
+    """Reads lines from stdin on a daemon thread, awaited without blocking the loop.
+
+    ``input()`` cannot be interrupted once called, so a single reader thread
+    serves every prompt; an abandoned prompt simply drops the line it reads.
+    End of input raises ``EOFError`` in the awaiting task.
+    """
+
+    def __init__(self) -> None:
+        self._requests: "queue.Queue[Tuple[str, asyncio.AbstractEventLoop, asyncio.Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def _serve(self) -> None:
+        while True:
+            prompt, loop, future = self._requests.get()
+            try:
+                line, error = input(prompt), None
+            except BaseException as e:
+                line, error = None, e
+            try:
+                loop.call_soon_threadsafe(_resolve, future, line, error)
+            except RuntimeError:
+                # The loop closed while the prompt was shown
+                return
+
+    async def __call__(self, prompt: str = "") -> str:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._serve, daemon=True)
+            self._thread.start()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.put((prompt, loop, future))
+        return await future
+
+
+class Interrupts:
+    """Routes Ctrl-C to the work being awaited instead of the process.
+
+    Used as a context manager around the input loop. Ctrl-C cancels the
+    current :meth:`run`, along with its cancellation token, and the loop
+    decides what that means: leaving at the prompt, or dropping the turn.
+    """
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._token: Optional["CancellationToken"] = None
+        self._interrupted = False
+        self._previous: Any = None
+
+    def __enter__(self) -> "Interrupts":
+        self._loop = asyncio.get_running_loop()
+        self._previous = signal.signal(signal.SIGINT, self._on_signal)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        signal.signal(signal.SIGINT, self._previous)
+
+    def _on_signal(self, signum: int, frame: Any) -> None:
+        # Runs between bytecodes of the main thread, so defer to the loop
+        self._loop.call_soon_threadsafe(self._interrupt)
+
+    def _interrupt(self) -> None:
+        if self._task is None or self._task.done():
+            return
+        self._interrupted = True
+        if self._token is not None:
+            self._token.cancel()
+        self._task.cancel()
+
+    async def run(
+        self,
+        work: Awaitable[T],
+        cancellation_token: Optional["CancellationToken"] = None,
+    ) -> T:
+        """Await ``work``, raising :class:`Interrupted` if Ctrl-C cancels it.
+
+        Args:
+            work: The prompt or turn to await.
+            cancellation_token: Token of the work, cancelled along with it.
+        """
+        self._task = asyncio.ensure_future(work)
+        self._token = cancellation_token
+        self._interrupted = False
+        try:
+            return await self._task
+        except asyncio.CancelledError:
+            if not self._interrupted:
+                raise
+            raise Interrupted() from None
+        finally:
+            self._task = self._token = None
@@ -0,0 +1,42 @@
+"""Startup timing broken down by phase."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+
+
+class StartupTimer:
+    """Records how long each startup phase took.
+
+    Args:
+        clock: Time source, overridable for tests.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._start = clock()
+        self.phases: List[Tuple[str, float]] = []
+
+    def elapsed(self) -> float:
+        """Seconds since the timer was created."""
+        return self._clock() - self._start
+
+    def mark(self, name: str) -> None:
+        """Record a milestone measured from the start."""
+        self.phases.append((name, self.elapsed()))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the duration of the enclosed block."""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, self._clock() - start))
+
+    def report(self) -> str:
+        return " • ".join(
+            f"{name} {duration * 1000:.0f} ms" for name, duration in self.phases
+        )
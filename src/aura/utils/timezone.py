@@ -1,9 +1,39 @@
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Optional
 from zoneinfo import ZoneInfo
 
+from dateutil import parser, tz
 from tzlocal import get_localzone
 
 
+@lru_cache(maxsize=1)
 def get_local_timezone() -> ZoneInfo:
     """Get the current system timezone."""
 
     return ZoneInfo(str(get_localzone()))
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: Optional[str]) -> Optional[tzinfo]:
+    """Resolve a TZ database name once.
+
+    Like ``dateutil.tz.gettz``, unknown names resolve to None, which datetime
+    methods treat as the system timezone.
+    """
+
+    return tz.gettz(name)
+
+
+def parse_rfc3339(value: str) -> datetime:
+    """Parse an RFC 3339 timestamp or date as returned by Google APIs.
+
+    ``datetime.fromisoformat`` covers the fixed formats the APIs return
+    ("Z" and offset suffixes, fractional seconds, bare dates) without the
+    general-purpose parser; anything else falls back to dateutil.
+    """
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return parser.parse(value)
@@ -0,0 +1,111 @@
+"""OpenTelemetry spans for agent turns, model calls, tool calls and API requests.
+
+Spans are created through the OpenTelemetry API, which autogen already
+depends on, and cost next to nothing until tracing is configured.
+:func:`configure_tracing` exports them in batches over OTLP when
+``OTEL_EXPORTER_OTLP_ENDPOINT`` is set and the SDK is installed
+(``pip install aura[tracing]``), e.g. to the collector in ``docker/``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+from opentelemetry import trace
+
+if TYPE_CHECKING:
+    from autogen_core import CancellationToken
+    from opentelemetry.sdk.trace import TracerProvider
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = "aura"
+DEFAULT_SERVICE_NAME = "aura"
+
+
+def get_tracer() -> trace.Tracer:
+    return trace.get_tracer(TRACER_NAME)
+
+
+def configure_tracing(
+    service_name: str = DEFAULT_SERVICE_NAME,
+) -> Optional[TracerProvider]:
+    """Export spans over OTLP if an endpoint is configured.
+
+    Uses the standard ``OTEL_EXPORTER_OTLP_*`` environment variables;
+    ``OTEL_EXPORTER_OTLP_PROTOCOL`` selects ``grpc`` (default) or
+    ``http/protobuf``. Spans are queued and sent by a background thread.
+
+    Returns:
+        The installed tracer provider, or None when tracing stays off.
+    """
+    if not os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return None
+
+    protocol = os.environ.get("OTEL_EXPORTER_OTLP_PROTOCOL", "grpc")
+    try:
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        if protocol.startswith("http"):
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        else:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+                OTLPSpanExporter,
+            )
+    except ImportError as e:
+        logger.warning(
+            f"Tracing disabled, the OpenTelemetry SDK or OTLP exporter is missing: {e}. "
+            "Install them with `pip install aura[tracing]`."
+        )
+        return None
+
+    provider = TracerProvider(resource=Resource.create({SERVICE_NAME: service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    logger.info(f"Exporting traces to {os.environ['OTEL_EXPORTER_OTLP_ENDPOINT']}")
+    return provider
+
+
+def shutdown_tracing() -> None:
+    """Flush queued spans and stop the exporter, if tracing was configured."""
+    provider = trace.get_tracer_provider()
+    shutdown = getattr(provider, "shutdown", None)
+    if shutdown is not None:
+        shutdown()
+
+
+class TracedToolMixin:
+    """Records a span around every call of an autogen tool.
+
+    Mixed in before the tool class, e.g. ``class A(TracedToolMixin, Adapter)``.
+    The span carries the tool name and the sizes of its arguments and result.
+    """
+
+    async def run_json(
+        self, args: Mapping[str, Any], cancellation_token: CancellationToken
+    ) -> Any:
+        with get_tracer().start_as_current_span(f"execute_tool {self.name}") as span:
+            recording = span.is_recording()
+            if recording:
+                span.set_attribute("gen_ai.tool.name", self.name)
+                span.set_attribute(
+                    "aura.tool.args_size", len(json.dumps(args, default=str))
+                )
+
+            result = await super().run_json(args, cancellation_token)
+
+            if recording:
+                output = (
+                    result
+                    if isinstance(result, str)
+                    else self.return_value_as_string(result)
+                )
+                span.set_attribute("aura.tool.result_size", len(output))
+            return result
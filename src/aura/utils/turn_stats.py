@@ -0,0 +1,111 @@
+"""Latency and token statistics of one agent turn."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import (
+    ToolCallExecutionEvent,
+    ToolCallRequestEvent,
+    ToolCallSummaryMessage,
+)
+
+
+@dataclass
+class ToolLatency:
+    """Calls and latency of one tool within a turn."""
+
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+
+@dataclass
+class TurnStats:
+    """Where the time and tokens of a turn went. Durations are in seconds."""
+
+    started_at: float
+    duration: float = 0.0
+    first_message: Optional[float] = None
+    model_time: float = 0.0
+    tool_time: float = 0.0
+    messages: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tools: Dict[str, ToolLatency] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+
+class TurnRecorder:
+    """Builds :class:`TurnStats` from the message stream of a turn.
+
+    The gap before a tool call request or a final answer is counted as model
+    time, the gap before a tool call result as tool time. Tools called in
+    parallel each get the latency of the whole batch.
+
+    Args:
+        clock: Monotonic time source, overridable for tests.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._start = self._last = clock()
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self.stats = TurnStats(started_at=time.time())
+
+    def elapsed(self) -> float:
+        """Seconds since the turn started."""
+        return self._clock() - self._start
+
+    def _add_usage(self, message: Any) -> None:
+        if message.models_usage:
+            self.stats.prompt_tokens += message.models_usage.prompt_tokens
+            self.stats.completion_tokens += message.models_usage.completion_tokens
+
+    def record(self, message: Any) -> float:
+        """Account for a streamed message and return its offset into the turn."""
+        now = self._clock()
+        offset, interval = now - self._start, now - self._last
+        self._last = now
+        stats = self.stats
+        if stats.first_message is None:
+            stats.first_message = offset
+
+        if isinstance(message, Response):
+            # A tool call summary is assembled locally, without a model call
+            if not isinstance(message.chat_message, ToolCallSummaryMessage):
+                stats.model_time += interval
+            self._add_usage(message.chat_message)
+            stats.messages += len(message.inner_messages or ())
+        elif isinstance(message, ToolCallExecutionEvent):
+            stats.tool_time += interval
+            for result in message.content:
+                name, called_at = self._pending.pop(
+                    result.call_id, ("unknown", self._start)
+                )
+                stats.tools.setdefault(name, ToolLatency()).add(now - called_at)
+        else:
+            stats.model_time += interval
+            if isinstance(message, ToolCallRequestEvent):
+                for call in message.content:
+                    self._pending[call.id] = (call.name, now)
+            self._add_usage(message)
+
+        return offset
+
+    def finish(self) -> TurnStats:
+        """Stop the turn's clock, once, and return its statistics."""
+        if not self.stats.duration:
+            self.stats.duration = self.elapsed()
+        return self.stats
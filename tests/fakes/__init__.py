@@ -0,0 +1 @@
+"""Offline fakes of the Google APIs and an MCP server, shared by the tests and the benchmarks."""
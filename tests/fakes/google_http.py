@@ -0,0 +1,165 @@
+"""Offline http transport answering Calendar and Gmail requests from payloads."""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import date, datetime, tzinfo
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+import httplib2
+from googleapiclient.discovery import build_from_document
+from utils.google_discovery import get_discovery_document
+from utils.timezone import get_zone
+
+from .payloads import calendar_list
+
+
+def _bound(moment: Dict[str, str], zone: tzinfo) -> datetime:
+    if "dateTime" in moment:
+        return datetime.fromisoformat(moment["dateTime"])
+    # All-day events start and end at midnight in the requested time zone
+    return datetime.combine(
+        date.fromisoformat(moment["date"]), datetime.min.time(), tzinfo=zone
+    )
+
+
+def _parse_fields(expression: str) -> Dict[str, Any]:
+    """Parse a ``fields`` selector like ``items(id,start),nextPageToken``."""
+    spec: Dict[str, Any] = {}
+    stack = [spec]
+    name = ""
+    for char in expression + ",":
+        if char == "(":
+            stack[-1][name] = {}
+            stack.append(stack[-1][name])
+            name = ""
+        elif char in ",)":
+            if name:
+                stack[-1][name] = None
+            name = ""
+            if char == ")":
+                stack.pop()
+        else:
+            name += char.strip()
+    return spec
+
+
+def _project(value: Any, spec: Optional[Dict[str, Any]]) -> Any:
+    if spec is None:
+        return value
+    if isinstance(value, list):
+        return [_project(item, spec) for item in value]
+    return {key: _project(value[key], sub) for key, sub in spec.items() if key in value}
+
+
+def _localize(event: Dict[str, Any], zone: tzinfo) -> Dict[str, Any]:
+    # Like the API, render times in the zone given by the timeZone parameter
+    event = dict(event)
+    for key in ("start", "end"):
+        if "dateTime" in event[key]:
+            moment = datetime.fromisoformat(event[key]["dateTime"]).astimezone(zone)
+            event[key] = {**event[key], "dateTime": moment.isoformat()}
+    return event
+
+
+class FakeGoogleHttp:
+    """Serves ``calendarList.list``, ``events.list`` and ``labels.list``.
+
+    Events are filtered by ``timeMin``/``timeMax``, ordered by start for
+    ``orderBy=startTime`` and paged like the real API, and ``fields``
+    selectors trim responses the way the server does.
+    Responses are memoized per URI, so repeated benchmark rounds measure the
+    client side rather than the fake.
+
+    Requests are free unless a network is modelled: each response then takes
+    ``latency`` seconds plus its size over ``bandwidth`` bytes per second.
+    """
+
+    def __init__(
+        self,
+        calendars: Dict[str, List[Dict[str, Any]]],
+        labels: Dict[str, Any],
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None,
+    ):
+        self.calendars = calendars
+        self.labels = labels
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self._responses: Dict[str, bytes] = {}
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Any = None,
+        **kwargs: Any,
+    ) -> Tuple[httplib2.Response, bytes]:
+        content = self._responses.get(uri)
+        if content is None:
+            body = self._route(uri)
+            fields = parse_qs(urlparse(uri).query).get("fields")
+            if fields:
+                body = _project(body, _parse_fields(fields[0]))
+            content = self._responses[uri] = json.dumps(body).encode()
+        if self.latency or self.bandwidth:
+            transfer = len(content) / self.bandwidth if self.bandwidth else 0.0
+            time.sleep(self.latency + transfer)
+        return httplib2.Response({"status": "200"}), content
+
+    def _route(self, uri: str) -> Dict[str, Any]:
+        parsed = urlparse(uri)
+        query = parse_qs(parsed.query)
+        path = unquote(parsed.path)
+
+        if path.endswith("/users/me/calendarList"):
+            return calendar_list(list(self.calendars))
+
+        if path.endswith("/labels"):
+            return self.labels
+
+        if "/calendars/" in path and path.endswith("/events"):
+            calendar_id = path.split("/calendars/")[1].split("/events")[0]
+            events = self.calendars[calendar_id]
+            if "syncToken" in query:
+                return {"items": [], "nextSyncToken": "next"}
+            zone = get_zone(query.get("timeZone", ["UTC"])[0])
+            if "timeMin" in query:
+                time_min = datetime.fromisoformat(query["timeMin"][0])
+                time_max = datetime.fromisoformat(query["timeMax"][0])
+                events = [
+                    _localize(event, zone)
+                    for event in events
+                    if _bound(event["start"], zone) < time_max
+                    and _bound(event["end"], zone) > time_min
+                ]
+            if query.get("orderBy") == ["startTime"]:
+                # Ties go to all-day events, then by ID, as the mirror orders them
+                events = sorted(
+                    events,
+                    key=lambda event: (
+                        _bound(event["start"], zone),
+                        "dateTime" in event["start"],
+                        event["id"],
+                    ),
+                )
+
+            size = int(query.get("maxResults", ["250"])[0])
+            offset = int(query.get("pageToken", ["0"])[0])
+            page: Dict[str, Any] = {"items": events[offset : offset + size]}
+            if offset + size < len(events):
+                page["nextPageToken"] = str(offset + size)
+            elif "orderBy" not in query:
+                # Only sync requests, which leave out orderBy, end with a token
+                page["nextSyncToken"] = "initial"
+            return page
+
+        raise ValueError(f"Unexpected request: {uri}")
+
+
+def fake_service(service_name: str, version: str, http: FakeGoogleHttp) -> Any:
+    """Build a discovery resource that sends every request to ``http``."""
+    return build_from_document(get_discovery_document(service_name, version), http=http)
@@ -0,0 +1,23 @@
+"""Minimal MCP server run over stdio by the session pool tests."""
+
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("fake")
+
+
+@server.tool()
+def pid() -> str:
+    """Return the server's process ID."""
+    return str(os.getpid())
+
+
+@server.tool()
+def echo(text: str) -> str:
+    """Return the text."""
+    return text
+
+
+if __name__ == "__main__":
+    server.run()
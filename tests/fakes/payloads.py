@@ -0,0 +1,173 @@
+"""Deterministic Google API payloads shaped like recorded responses.
+
+The generators reproduce the structure and field set of real ``events.list``,
+``calendarList.list`` and ``labels.list`` responses, at the sizes we see in
+practice. The benchmarks can use real recordings instead with
+``--payloads DIR``: see :func:`load_payloads`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+SYSTEM_LABELS = [
+    "CHAT",
+    "SENT",
+    "INBOX",
+    "IMPORTANT",
+    "TRASH",
+    "DRAFT",
+    "SPAM",
+    "CATEGORY_FORUMS",
+    "CATEGORY_UPDATES",
+    "CATEGORY_PERSONAL",
+    "CATEGORY_PROMOTIONS",
+    "CATEGORY_SOCIAL",
+    "STARRED",
+    "UNREAD",
+]
+
+# Zone listings are requested in, and a present within the generated events
+TIMEZONE = "Europe/Budapest"
+SYNC_NOW = datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+_OFFSETS = [timezone(timedelta(hours=hours)) for hours in (1, 2, 0, -5)]
+_WORDS = "sync review planning standup retro design budget offsite 1:1 demo".split()
+
+
+def _event(
+    rng: random.Random, calendar_id: str, index: int, start: datetime
+) -> Dict[str, Any]:
+    event_id = f"{calendar_id[:6]}{index:06d}"
+    attendees = [
+        {
+            "email": f"person{rng.randrange(500)}@example.com",
+            "responseStatus": rng.choice(["accepted", "needsAction", "tentative"]),
+        }
+        for _ in range(rng.randrange(0, 6))
+    ]
+    if rng.random() < 0.08:
+        day = start.date()
+        bounds = {
+            "start": {"date": day.isoformat()},
+            "end": {"date": (day + timedelta(days=rng.choice([1, 1, 3]))).isoformat()},
+        }
+    else:
+        offset = rng.choice(_OFFSETS)
+        end = start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90]))
+        bounds = {
+            "start": {
+                "dateTime": start.astimezone(offset).isoformat(),
+                "timeZone": "Europe/Budapest",
+            },
+            "end": {
+                "dateTime": end.astimezone(offset).isoformat(),
+                "timeZone": "Europe/Budapest",
+            },
+        }
+
+    event = {
+        "kind": "calendar#event",
+        "etag": f'"{rng.getrandbits(52)}"',
+        "id": event_id,
+        "status": "confirmed",
+        "htmlLink": f"https://www.google.com/calendar/event?eid={event_id}",
+        "created": "2024-01-01T08:00:00.000Z",
+        "updated": "2024-01-02T09:30:12.345Z",
+        "summary": f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)}",
+        "creator": {"email": "me@example.com", "self": True},
+        "organizer": {"email": calendar_id, "self": True},
+        **bounds,
+        "iCalUID": f"{event_id}@google.com",
+        "sequence": 0,
+        "reminders": {"useDefault": True},
+        "eventType": "default",
+    }
+    if rng.random() < 0.4:
+        event["description"] = " ".join(rng.choice(_WORDS) for _ in range(40))
+    if rng.random() < 0.3:
+        event["location"] = f"Room {rng.randrange(1, 40)}"
+    if rng.random() < 0.5:
+        event["hangoutLink"] = f"https://meet.google.com/{event_id}"
+    if attendees:
+        event["attendees"] = attendees
+    return event
+
+
+def calendar_events(
+    calendar_id: str, count: int, first_day: date, days: int, seed: int = 0
+) -> List[Dict[str, Any]]:
+    """Events of one calendar ordered by start, as ``orderBy=startTime`` returns."""
+    rng = random.Random(f"{seed}:{calendar_id}")
+    origin = datetime.combine(first_day, datetime.min.time(), tzinfo=timezone.utc)
+    starts = sorted(
+        origin + timedelta(minutes=15 * rng.randrange(days * 96)) for _ in range(count)
+    )
+    return [_event(rng, calendar_id, i, start) for i, start in enumerate(starts)]
+
+
+def calendar_list(calendar_ids: List[str]) -> Dict[str, Any]:
+    return {
+        "kind": "calendar#calendarList",
+        "items": [
+            {
+                "kind": "calendar#calendarListEntry",
+                "id": calendar_id,
+                "summary": calendar_id,
+                "timeZone": "Europe/Budapest",
+                "accessRole": "owner",
+                "selected": True,
+            }
+            for calendar_id in calendar_ids
+        ],
+    }
+
+
+def gmail_labels(user_labels: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    labels = [
+        {"id": name, "name": name, "type": "system"} for name in SYSTEM_LABELS
+    ] + [
+        {
+            "id": f"Label_{i}",
+            "name": f"{rng.choice(_WORDS).title()}/{rng.choice(_WORDS)}-{i}",
+            "messageListVisibility": "show",
+            "labelListVisibility": "labelShow",
+            "type": "user",
+        }
+        for i in range(user_labels)
+    ]
+    return {"labels": labels}
+
+
+def load_payloads(directory: Optional[str]) -> Dict[str, Any]:
+    """Return the benchmark payloads, preferring recordings in ``directory``.
+
+    Recognized files: ``calendar_events.json`` (calendar ID to list of events)
+    and ``gmail_labels.json`` (a ``labels.list`` response).
+    """
+    calendars = {
+        calendar_id: calendar_events(calendar_id, 600, date(2024, 1, 1), 60)
+        for calendar_id in [
+            "me@example.com",
+            "team@example.com",
+            "holidays@example.com",
+            "family@example.com",
+        ]
+    }
+    payloads: Dict[str, Any] = {"calendars": calendars, "labels": gmail_labels(120)}
+
+    if directory:
+        for key, file_name in [
+            ("calendars", "calendar_events.json"),
+            ("labels", "gmail_labels.json"),
+        ]:
+            path = os.path.join(directory, file_name)
+            if os.path.exists(path):
+                with open(path) as f:
+                    payloads[key] = json.load(f)
+    return payloads
@@ -0,0 +1,117 @@
+import asyncio
+from datetime import date
+
+import httplib2
+import pytest
+from fakes.google_http import FakeGoogleHttp, fake_service
+from fakes.payloads import calendar_events, gmail_labels
+from googleapiclient.errors import HttpError
+from tools.google_calendar import base
+from tools.google_calendar.list_calendar_events import GoogleCalendarListEvents
+from utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_set_restarts_the_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 8
+    cache.set("a", 2)
+    clock.now = 15
+
+    assert cache.get("a") == 2
+
+
+def test_hits_and_misses_are_counted():
+    cache = TTLCache(ttl=10, clock=FakeClock())
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 1}
+
+
+def test_invalidate_drops_one_entry_or_all():
+    cache = TTLCache(ttl=10, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.invalidate()
+    assert cache.stats()["size"] == 0
+
+
+class CountingHttp(FakeGoogleHttp):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.calendar_lists = 0
+
+    def request(self, uri, *args, **kwargs):
+        if "/calendarList" in uri:
+            self.calendar_lists += 1
+        return super().request(uri, *args, **kwargs)
+
+
+@pytest.fixture
+def calendars(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(base, "selected_calendars_cache", TTLCache(60, clock))
+    ids = ["me@example.com", "team@example.com"]
+    http = CountingHttp(
+        {cal: calendar_events(cal, 5, date(2024, 1, 1), 5) for cal in ids},
+        gmail_labels(1),
+    )
+    tool = GoogleCalendarListEvents(
+        api_resource=fake_service("calendar", "v3", http), use_sync_mirror=False
+    )
+    return tool, http, clock, ids
+
+
+def test_selected_calendars_are_listed_once_per_ttl(calendars):
+    tool, http, clock, ids = calendars
+
+    assert tool._get_calendars() == ids
+    assert asyncio.run(tool._aget_calendars()) == ids
+    assert http.calendar_lists == 1
+
+    clock.now = 60
+    assert asyncio.run(tool._aget_calendars()) == ids
+    assert http.calendar_lists == 2
+
+
+def test_missing_calendar_drops_the_cached_selection(calendars):
+    tool, http, _, ids = calendars
+    tool._get_calendars()
+
+    tool._forget_missing_calendar(HttpError(httplib2.Response({"status": 403}), b""))
+    tool._get_calendars()
+    assert http.calendar_lists == 1
+
+    tool._forget_missing_calendar(HttpError(httplib2.Response({"status": 404}), b""))
+    assert tool._get_calendars() == ids
+    assert http.calendar_lists == 2
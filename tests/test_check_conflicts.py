@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from tools.google_calendar.check_conflicts import GoogleCalendarCheckConflicts
+
+SLOT = ("2024-01-08T10:00:00+00:00", "2024-01-08T10:30:00+00:00")
+
+
+def _ts(moment):
+    return datetime.fromisoformat(f"2024-01-08T{moment}:00+00:00").timestamp()
+
+
+def _response(**busy):
+    return {
+        "calendars": {
+            cal: {
+                "busy": [
+                    {"start": f"2024-01-08T{start}:00Z", "end": f"2024-01-08T{end}:00Z"}
+                    for start, end in blocks
+                ]
+            }
+            for cal, blocks in busy.items()
+        }
+    }
+
+
+def _find_conflicts(*responses):
+    tool = GoogleCalendarCheckConflicts.model_construct(api_resource=None)
+    return tool._find_conflicts(list(responses), *SLOT)
+
+
+def test_calendar_busy_only_outside_the_slot_is_not_reported():
+    # A's block touches B's, but ends before the slot starts
+    conflicts, errors = _find_conflicts(
+        _response(A=[("08:00", "09:30")], B=[("09:00", "11:00")])
+    )
+    assert conflicts == [(_ts("10:00"), _ts("10:30"), ["B"])]
+    assert errors == []
+
+
+def test_overlapping_blocks_within_the_slot_are_merged():
+    conflicts, _ = _find_conflicts(
+        _response(A=[("09:50", "10:10")]), _response(B=[("10:05", "10:15")])
+    )
+    assert conflicts == [(_ts("10:00"), _ts("10:15"), ["A", "B"])]
+
+
+def test_separate_blocks_keep_their_own_calendars():
+    conflicts, _ = _find_conflicts(
+        _response(A=[("10:00", "10:05")], B=[("10:20", "10:40")])
+    )
+    assert conflicts == [
+        (_ts("10:00"), _ts("10:05"), ["A"]),
+        (_ts("10:20"), _ts("10:30"), ["B"]),
+    ]
+
+
+def test_free_slot_and_errors():
+    response = {"calendars": {"A": {"busy": [], "errors": [{"reason": "notFound"}]}}}
+    assert _find_conflicts(response) == ([], ["A: notFound"])
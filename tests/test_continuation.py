@@ -0,0 +1,40 @@
+import asyncio
+
+from utils.continuation import (
+    ContinuationStore,
+    get_continuation_store,
+    use_continuation_store,
+)
+
+
+def test_handles_are_unguessable_and_oldest_results_expire():
+    store = ContinuationStore(max_results=2)
+    first, second, third = (store.put([n]) for n in range(3))
+
+    assert len({first, second, third}) == 3
+    assert len(first) >= 8
+    assert store.get(first) is None
+    assert store.get(second) == [1]
+    assert store.get(third) == [2]
+
+
+def test_sessions_only_read_their_own_results():
+    one, other = ContinuationStore(), ContinuationStore()
+
+    async def tool_call(store, items):
+        # Tool calls run in tasks and worker threads started within the scope
+        with use_continuation_store(store):
+            task = asyncio.ensure_future(
+                asyncio.to_thread(lambda: get_continuation_store().put(items))
+            )
+            return await task
+
+    async def main():
+        return await asyncio.gather(tool_call(one, ["a"]), tool_call(other, ["b"]))
+
+    handle_one, handle_other = asyncio.run(main())
+
+    assert one.get(handle_one) == ["a"]
+    assert other.get(handle_other) == ["b"]
+    assert one.get(handle_other) is None
+    assert get_continuation_store().get(handle_one) is None
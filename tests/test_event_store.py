@@ -0,0 +1,159 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from tools.google_calendar.event_store import SCHEMA_VERSION, EventStore
+from tools.google_calendar.sync import CalendarMirror
+
+HOUR = 3600.0
+
+
+def _event(event_id, start, end):
+    return {"id": event_id, "start": start, "end": end}
+
+
+def _timed(event_id, start, hours):
+    end = start + timedelta(hours=hours)
+    return _event(
+        event_id, {"dateTime": start.isoformat()}, {"dateTime": end.isoformat()}
+    )
+
+
+def _all_day(event_id, day, days=1):
+    end = day + timedelta(days=days)
+    return _event(event_id, {"date": day.isoformat()}, {"date": end.isoformat()})
+
+
+def _ids(matches):
+    return [event["id"] for _, event in matches]
+
+
+def _mirror(store, events):
+    mirror = CalendarMirror("cal", store)
+    mirror.apply(events)
+    mirror.commit("token")
+    return mirror
+
+
+def _save(store, rows):
+    store.save(
+        "me",
+        "cal",
+        "token",
+        None,
+        [
+            (event_id, start, end, False, {"id": event_id})
+            for event_id, start, end in rows
+        ],
+    )
+
+
+def test_events_longer_than_the_threshold_are_found_by_the_long_branch():
+    store = EventStore(":memory:", long_threshold=2 * HOUR)
+    _save(
+        store,
+        [
+            ("short", 9 * HOUR, 10 * HOUR),
+            ("at-threshold", 8 * HOUR, 10 * HOUR),
+            ("long", 0, 24 * HOUR),
+            ("long-before", 0, 9 * HOUR),
+        ],
+    )
+
+    matches = store.overlapping("me", "cal", 9.5 * HOUR, 11 * HOUR, all_day=False)
+
+    # Merged from both branches in start order
+    assert _ids(matches) == ["long", "at-threshold", "short"]
+    assert [start for start, _ in matches] == [0, 8 * HOUR, 9 * HOUR]
+    limited = store.overlapping("me", "cal", 9.5 * HOUR, 11 * HOUR, False, limit=2)
+    assert _ids(limited) == ["long", "at-threshold"]
+
+
+def test_open_ended_queries_return_the_next_events():
+    store = EventStore(":memory:", long_threshold=2 * HOUR)
+    _save(
+        store,
+        [
+            ("ended", 0, HOUR),
+            ("running", 0, 48 * HOUR),
+            ("later", 30 * HOUR, 31 * HOUR),
+            ("next", 3 * HOUR, 4 * HOUR),
+        ],
+    )
+
+    matches = store.overlapping("me", "cal", 2 * HOUR, float("inf"), False, limit=2)
+
+    assert _ids(matches) == ["running", "next"]
+
+
+def test_all_day_events_keep_their_dates_in_every_zone():
+    store = EventStore(":memory:")
+    day = datetime(2024, 1, 15).date()
+    mirror = _mirror(
+        store,
+        [
+            _all_day("holiday", day),
+            _all_day("trip", day - timedelta(days=2), days=3),
+            _all_day("tomorrow", day + timedelta(days=1)),
+        ],
+    )
+
+    for zone in (ZoneInfo("Pacific/Auckland"), ZoneInfo("America/Los_Angeles")):
+        morning = datetime(2024, 1, 15, 8, tzinfo=zone)
+        matches = mirror.events_between(morning, morning + timedelta(hours=1), zone)
+
+        assert _ids(matches) == ["trip", "holiday"]
+        # Starts are midnight in the viewing zone
+        midnight = datetime(2024, 1, 15, tzinfo=zone).timestamp()
+        assert matches[1][0] == midnight
+
+
+def test_next_events_merge_all_day_and_timed_events():
+    store = EventStore(":memory:")
+    zone = ZoneInfo("Europe/Budapest")
+    now = datetime(2024, 1, 15, 10, tzinfo=zone)
+    mirror = _mirror(
+        store,
+        [
+            _timed("done", now - timedelta(hours=2), 1),
+            _timed("meeting", now - timedelta(minutes=30), 1),
+            _timed("lunch", now + timedelta(hours=2), 1),
+            _all_day("today", now.date()),
+            _all_day("tomorrow", now.date() + timedelta(days=1)),
+            _timed("standup", datetime(2024, 1, 16, tzinfo=zone), 1),
+        ],
+    )
+
+    assert _ids(mirror.next_events(now, zone, 10)) == [
+        "today",
+        "meeting",
+        "lunch",
+        "tomorrow",
+        "standup",
+    ]
+    assert _ids(mirror.next_events(now, zone, 2)) == ["today", "meeting"]
+    utc_now = now.astimezone(timezone.utc)
+    assert _ids(mirror.next_events(utc_now, zone, 2)) == ["today", "meeting"]
+
+
+def test_stores_from_an_older_schema_are_rebuilt(tmp_path):
+    path = str(tmp_path / "events.sqlite")
+    store = EventStore(path)
+    _save(store, [("kept", 0, HOUR)])
+    store.close()
+
+    reopened = EventStore(path)
+    assert reopened.count("me", "cal") == 1
+    assert reopened.load_state("me", "cal") == ("token", None)
+    reopened.close()
+
+    with sqlite3.connect(path) as connection:
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION - 1}")
+    connection.close()
+
+    rebuilt = EventStore(path)
+    assert rebuilt.count("me", "cal") == 0
+    assert rebuilt.load_state("me", "cal") == (None, None)
+    (version,) = rebuilt._connection.execute("PRAGMA user_version").fetchone()
+    assert version == SCHEMA_VERSION
+    rebuilt.close()
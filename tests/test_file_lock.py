@@ -0,0 +1,54 @@
+import os
+import threading
+
+import pytest
+from utils.file_lock import file_lock, write_atomic
+
+
+def test_the_lock_is_exclusive_until_released(tmp_path):
+    path = str(tmp_path / "token.json")
+    held, release = threading.Event(), threading.Event()
+
+    def holder():
+        with file_lock(path):
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    held.wait(5)
+    try:
+        with pytest.raises(TimeoutError):
+            with file_lock(path, timeout=0.2):
+                pass
+    finally:
+        release.set()
+        thread.join(5)
+
+    with file_lock(path, timeout=1):
+        pass
+
+
+def test_write_atomic_replaces_the_file(tmp_path):
+    path = tmp_path / "token.json"
+    path.write_text("old")
+
+    write_atomic(str(path), "new")
+
+    assert path.read_text() == "new"
+    assert os.listdir(tmp_path) == ["token.json"]
+
+
+def test_a_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "token.json"
+    path.write_text("old")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError, match="disk full"):
+        write_atomic(str(path), "new")
+
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["token.json"]
@@ -0,0 +1,108 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+from google.oauth2.credentials import Credentials
+from utils.google_auth import CredentialProvider
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class FakeCredentials(Credentials):
+    """Credentials whose refresh issues the next numbered token offline."""
+
+    refreshed = threading.Event()
+
+    def __init__(self, token, scopes, expiry=None):
+        super().__init__(
+            token,
+            refresh_token="refresh",
+            client_id="client",
+            client_secret="secret",
+            token_uri="https://oauth2.example.com/token",
+            scopes=scopes,
+        )
+        self.expiry = expiry
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = f"{self.token}+"
+        self.expiry = _utcnow() + timedelta(hours=1)
+        self.refreshed.set()
+
+
+class FakeProvider(CredentialProvider):
+    """Provider loading fake credentials instead of running the OAuth flow."""
+
+    def __init__(self, tmp_path, expiry=None, **kwargs):
+        super().__init__(str(tmp_path / "token.json"), **kwargs)
+        self.expiry = expiry
+        self.loaded = []
+
+    def _load(self, scopes):
+        creds = FakeCredentials(f"token{len(self.loaded)}", scopes, self.expiry)
+        self.loaded.append(scopes)
+        return creds
+
+
+def test_credentials_are_shared_until_new_scopes_are_requested(tmp_path):
+    provider = FakeProvider(tmp_path, auto_refresh=False)
+
+    gmail = provider.get_credentials(["gmail"])
+    assert provider.get_credentials(["gmail"]) is gmail
+    assert provider.get_credentials() is gmail
+
+    both = provider.get_credentials(["calendar"])
+    assert both is not gmail
+    assert provider.get_credentials(["gmail"]) is both
+    assert provider.loaded == [["gmail"], ["calendar", "gmail"]]
+    # Credentials handed out earlier use the token of the widest scopes
+    assert gmail.token == both.token == "token1"
+
+
+def test_refresh_updates_every_handed_out_credential_and_the_token_file(tmp_path):
+    provider = FakeProvider(tmp_path, auto_refresh=False)
+    gmail = provider.get_credentials(["gmail"])
+    both = provider.get_credentials(["gmail", "calendar"])
+
+    provider.refresh()
+
+    assert both.refreshes == 1
+    assert gmail.token == both.token == "token1+"
+    with open(provider.token_file) as f:
+        assert json.load(f)["token"] == "token1+"
+
+
+def test_a_token_refreshed_by_another_process_is_adopted(tmp_path):
+    provider = FakeProvider(tmp_path, auto_refresh=False, expiry=_utcnow())
+    creds = provider.get_credentials(["gmail"])
+    stored = FakeCredentials("from-other-process", ["gmail"])
+    stored.expiry = _utcnow() + timedelta(hours=1)
+    with open(provider.token_file, "w") as f:
+        f.write(stored.to_json())
+
+    provider.refresh()
+
+    assert creds.refreshes == 0
+    assert creds.token == "from-other-process"
+
+
+def test_the_refresher_reschedules_when_the_credentials_are_replaced(tmp_path):
+    FakeCredentials.refreshed.clear()
+    # Without an expiry there is nothing to refresh, so the thread waits
+    provider = FakeProvider(tmp_path, refresh_margin=600)
+    provider.get_credentials(["gmail"])
+    assert not FakeCredentials.refreshed.wait(0.2)
+
+    provider.expiry = _utcnow() + timedelta(seconds=60)
+    creds = provider.get_credentials(["calendar"])
+    try:
+        assert FakeCredentials.refreshed.wait(5)
+        assert creds.refreshes == 1
+    finally:
+        provider.stop()
+        provider._refresher.join(5)
+    assert not provider._refresher.is_alive()
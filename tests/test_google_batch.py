@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from utils.google_batch import GoogleApiBatch
+
+
+class FakeBatch:
+    def __init__(self, resource, callback):
+        self.resource = resource
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self, http):
+        self.resource.sent.append([request_id for request_id, _ in self.requests])
+        if any(request == "fail-batch" for _, request in self.requests):
+            raise RuntimeError("batch rejected")
+        # Answer out of order, as the API is free to
+        for request_id, request in reversed(self.requests):
+            error = ValueError(request) if request.startswith("bad") else None
+            self.callback(request_id, None if error else {"echo": request}, error)
+
+
+class FakeResource:
+    def __init__(self):
+        self._http = object()
+        self.sent = []
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+def test_results_keep_the_order_requests_were_added():
+    resource = FakeResource()
+    batch = GoogleApiBatch(resource, max_batch_size=50)
+    for name in ["a", "b", "bad-c", "d"]:
+        batch.add(name, request_id=name)
+
+    results = batch.execute()
+
+    assert [result.request_id for result in results] == ["a", "b", "bad-c", "d"]
+    assert [result.ok for result in results] == [True, True, False, True]
+    assert results[0].response == {"echo": "a"}
+    assert isinstance(results[2].error, ValueError)
+
+
+def test_requests_are_sent_in_chunks_of_max_batch_size():
+    resource = FakeResource()
+    batch = GoogleApiBatch(resource, max_batch_size=2)
+    for i in range(5):
+        batch.add(f"r{i}")
+
+    results = batch.execute()
+
+    assert resource.sent == [["_auto0", "_auto1"], ["_auto2", "_auto3"], ["_auto4"]]
+    assert [result.response["echo"] for result in results] == [
+        f"r{i}" for i in range(5)
+    ]
+    # The queue is emptied by execute
+    assert len(batch) == 0
+
+
+def test_a_failed_chunk_fails_only_its_own_requests():
+    resource = FakeResource()
+    batch = GoogleApiBatch(resource, max_batch_size=2)
+    for request in ["a", "fail-batch", "c", "d"]:
+        batch.add(request)
+
+    results = batch.execute()
+
+    assert [result.ok for result in results] == [False, False, True, True]
+    assert str(results[0].error) == "batch rejected"
+
+
+def test_duplicate_request_ids_are_rejected():
+    batch = GoogleApiBatch(FakeResource())
+    batch.add("a", request_id="x")
+    with pytest.raises(ValueError):
+        batch.add("b", request_id="x")
+
+
+def test_explicit_ids_cannot_collide_with_generated_ones():
+    batch = GoogleApiBatch(FakeResource())
+    batch.add("a", request_id="0")
+    assert batch.add("b") == "_auto0"
+    assert batch.add("c", request_id="1") == "1"
+    assert batch.add("d") == "_auto1"
+    with pytest.raises(ValueError, match="reserved"):
+        batch.add("e", request_id="_auto2")
+
+    results = batch.execute()
+    assert [result.response["echo"] for result in results] == ["a", "b", "c", "d"]
+
+
+def test_max_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        GoogleApiBatch(FakeResource(), max_batch_size=0)
+
+
+def test_execute_async_returns_the_same_results():
+    resource = FakeResource()
+    batch = GoogleApiBatch(resource, max_batch_size=1)
+    batch.add("a")
+    batch.add("bad-b")
+
+    results = asyncio.run(batch.execute_async())
+
+    assert [(result.request_id, result.ok) for result in results] == [
+        ("_auto0", True),
+        ("_auto1", False),
+    ]
@@ -0,0 +1,109 @@
+from datetime import date
+
+from fakes.google_http import FakeGoogleHttp, fake_service
+from fakes.payloads import calendar_events, gmail_labels
+from tools.gmail.label_index import LabelIndex, get_label_index, invalidate_on_stale
+from tools.gmail.list_labels import GmailListLabels
+
+
+def _label(label_id, name):
+    return {"id": label_id, "name": name, "type": "user"}
+
+
+def _names(index):
+    return [label["name"] for label in index.labels()]
+
+
+def test_load_replaces_the_contents():
+    index = LabelIndex()
+    assert not index.loaded
+
+    index.load([_label("a", "A"), _label("b", "B")])
+    index.load([_label("c", "C")])
+
+    assert index.loaded
+    assert _names(index) == ["C"]
+
+
+def test_upsert_and_remove_keep_a_loaded_index_current():
+    index = LabelIndex()
+    index.load([_label("a", "A"), _label("b", "B")])
+
+    index.upsert(_label("c", "C"))
+    index.upsert(_label("a", "Renamed"))
+    index.remove("b")
+    index.remove("missing")
+
+    assert index.loaded
+    assert _names(index) == ["Renamed", "C"]
+
+
+def test_get_returns_a_copy_and_a_miss_keeps_the_index():
+    index = LabelIndex()
+    index.load([_label("a", "A")])
+
+    index.get("a")["name"] = "changed"
+    assert index.get("a") == _label("a", "A")
+    assert index.get("missing") is None
+    assert index.loaded
+    assert _names(index) == ["A"]
+
+
+def test_writes_during_a_listing_are_merged_into_it():
+    index = LabelIndex()
+    index.upsert(_label("old", "Before the listing"))
+    since = index.version
+    # The listing is in flight while another tool writes
+    index.upsert(_label("new", "Created"))
+    index.remove("a")
+    index.upsert(_label("b", "Renamed"))
+
+    index.load([_label("a", "A"), _label("b", "B"), _label("old", "Listed")], since)
+
+    assert index.loaded
+    assert _names(index) == ["Renamed", "Listed", "Created"]
+
+
+def test_invalidation_during_a_listing_leaves_the_index_unloaded():
+    index = LabelIndex()
+    since = index.version
+    index.invalidate()
+
+    index.load([_label("a", "A")], since)
+
+    assert not index.loaded
+    index.load([_label("a", "A")], index.version)
+    assert index.loaded
+
+
+def test_stale_writes_invalidate_the_shared_index():
+    class Error(Exception):
+        def __init__(self, status):
+            self.resp = type("Response", (), {"status": status})()
+
+    resource = object()
+    index = get_label_index(resource)
+    index.load([_label("a", "A")])
+
+    invalidate_on_stale(resource, Error(500))
+    assert get_label_index(resource).loaded
+    invalidate_on_stale(resource, Error(404))
+    assert not get_label_index(resource).loaded
+
+
+def test_listing_keeps_a_label_created_while_it_was_in_flight():
+    class CreatingHttp(FakeGoogleHttp):
+        def request(self, uri, *args, **kwargs):
+            get_label_index(api_resource).upsert(_label("Label_new", "Created"))
+            return super().request(uri, *args, **kwargs)
+
+    http = CreatingHttp(
+        {"me@example.com": calendar_events("me@example.com", 1, date(2024, 1, 1), 1)},
+        gmail_labels(2),
+    )
+    api_resource = fake_service("gmail", "v1", http)
+    output = GmailListLabels(api_resource=api_resource)._run()
+
+    assert "Label_new - Name: Created" in output
+    assert "Label_0" in output
+    assert get_label_index(api_resource).loaded
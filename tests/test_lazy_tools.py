@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_core import CancellationToken, FunctionCall
+from autogen_core.tools import FunctionTool
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from tools.lazy import (
+    LazyTool,
+    LazyToolGroup,
+    ToolGroupUnavailableError,
+    ToolSchemaCache,
+)
+
+
+def echo(text: str) -> str:
+    """Return the text."""
+    return text
+
+
+class Factory:
+    """Tool factory failing until ``fail`` is cleared."""
+
+    def __init__(self):
+        self.fail = True
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise OSError("credentials.json not found")
+        return [FunctionTool(echo, description="Return the text.")]
+
+
+@pytest.fixture
+def group(tmp_path):
+    cache = ToolSchemaCache(str(tmp_path / "schemas.json"), fingerprint="test")
+    cache.set("echo", [FunctionTool(echo, description="Return the text.").schema])
+    return LazyToolGroup("echo", Factory(), cache)
+
+
+def _call(proxy):
+    return asyncio.run(proxy.run_json({"text": "hi"}, CancellationToken()))
+
+
+def test_a_failed_build_is_a_tool_error_and_retried_on_the_next_call(group):
+    (proxy,) = asyncio.run(group.tools())
+    assert isinstance(proxy, LazyTool)
+    assert proxy.name == "echo"
+
+    with pytest.raises(ToolGroupUnavailableError, match="echo tools are unavailable"):
+        _call(proxy)
+    assert not group.available
+    assert not group.built
+    assert isinstance(group.error, OSError)
+
+    group._factory.fail = False
+    assert _call(proxy) == "hi"
+    assert group.available
+    assert group._factory.calls == 2
+
+
+def test_the_agent_reports_the_unavailable_group_to_the_model(group):
+    async def main():
+        (proxy,) = await group.tools()
+        client = ReplayChatCompletionClient([])
+        client._model_info["function_calling"] = True
+        agent = AssistantAgent("aura", client, tools=[proxy])
+        call = FunctionCall(id="1", name="echo", arguments='{"text": "hi"}')
+        return await agent._execute_tool_call(call, CancellationToken())
+
+    result = asyncio.run(main())
+
+    assert result.content.startswith("Error: The echo tools are unavailable")
+    assert "credentials.json not found" in result.content
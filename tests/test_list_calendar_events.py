@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from datetime import date, datetime, timezone
+
+import pytest
+from fakes.google_http import FakeGoogleHttp, fake_service
+from fakes.payloads import SYNC_NOW, TIMEZONE, calendar_events, gmail_labels
+from tools.google_calendar.list_calendar_events import GoogleCalendarListEvents
+from tools.google_calendar.event_store import EventStore
+from tools.google_calendar.sync import get_sync_engine, mark_mirrors_stale
+
+RANGES = [
+    ("2024-01-08T00:00:00", "2024-01-22T00:00:00"),
+    ("2024-01-10T13:17:00", "2024-01-10T15:00:00"),
+    ("2024-01-01T00:00:00", "2024-03-01T00:00:00"),
+]
+
+
+@pytest.fixture(scope="module")
+def tools():
+    calendars = {
+        calendar_id: calendar_events(calendar_id, 300, date(2024, 1, 1), 60)
+        for calendar_id in ["me@example.com", "team@example.com", "family@example.com"]
+    }
+    http = FakeGoogleHttp(calendars, gmail_labels(1))
+    api = GoogleCalendarListEvents(
+        api_resource=fake_service("calendar", "v3", http),
+        use_sync_mirror=False,
+        compact_output=False,
+    )
+    mirror = GoogleCalendarListEvents(
+        api_resource=fake_service("calendar", "v3", http),
+        use_sync_mirror=True,
+        event_store_path=None,
+        compact_output=False,
+    )
+    get_sync_engine(mirror.api_resource, None).now = lambda: SYNC_NOW
+    return api, mirror
+
+
+@pytest.mark.parametrize("start, end", RANGES)
+@pytest.mark.parametrize("max_results", [5, 250, 5000])
+def test_api_and_mirror_listings_are_identical(tools, start, end, max_results):
+    api, mirror = tools
+    expected = api._run(start, end, max_results, TIMEZONE)
+
+    assert expected
+    assert [event["start"] for event in expected] == sorted(
+        event["start"] for event in expected
+    )
+    assert mirror._run(start, end, max_results, TIMEZONE) == expected
+    assert asyncio.run(api._arun(start, end, max_results, TIMEZONE)) == expected
+    assert asyncio.run(mirror._arun(start, end, max_results, TIMEZONE)) == expected
+
+
+def test_range_reaching_past_the_sync_window_is_listed_from_the_api(tools):
+    api, mirror = tools
+    start, end = "2023-12-01T00:00:00", "2024-01-03T00:00:00"
+    engine = get_sync_engine(mirror.api_resource, None)
+
+    assert not engine.covers(
+        "me@example.com", datetime(2023, 12, 1, tzinfo=timezone.utc), SYNC_NOW
+    )
+    expected = api._run(start, end, 50, TIMEZONE)
+    assert expected
+    assert mirror._run(start, end, 50, TIMEZONE) == expected
+
+
+def test_async_listing_reads_the_mirror_off_the_event_loop(tools, monkeypatch):
+    _, mirror = tools
+    threads = set()
+    overlapping = EventStore.overlapping
+
+    def recording(self, *args, **kwargs):
+        threads.add(threading.current_thread())
+        return overlapping(self, *args, **kwargs)
+
+    monkeypatch.setattr(EventStore, "overlapping", recording)
+    assert asyncio.run(mirror._arun(*RANGES[0], 10, TIMEZONE))
+    assert threads and threading.main_thread() not in threads
+
+
+class SyncCountingHttp(FakeGoogleHttp):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.delta_requests = 0
+
+    def request(self, uri, *args, **kwargs):
+        if "syncToken=" in uri:
+            self.delta_requests += 1
+        return super().request(uri, *args, **kwargs)
+
+
+def test_writes_make_the_next_listing_sync_again():
+    http = SyncCountingHttp(
+        {"me@example.com": calendar_events("me@example.com", 20, date(2024, 1, 1), 30)},
+        gmail_labels(1),
+    )
+    tool = GoogleCalendarListEvents(
+        api_resource=fake_service("calendar", "v3", http),
+        use_sync_mirror=True,
+        event_store_path=None,
+    )
+    engine = get_sync_engine(tool.api_resource, None)
+    engine.now = lambda: SYNC_NOW
+    engine.min_sync_interval = 3600
+
+    tool._run(*RANGES[0], 10, TIMEZONE)
+    tool._run(*RANGES[0], 10, TIMEZONE)
+    assert http.delta_requests == 0
+
+    mark_mirrors_stale(tool.api_resource)
+    tool._run(*RANGES[0], 10, TIMEZONE)
+    tool._run(*RANGES[0], 10, TIMEZONE)
+    assert http.delta_requests == 1
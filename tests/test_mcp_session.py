@@ -0,0 +1,74 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from autogen_core import CancellationToken
+from mcp import StdioServerParameters
+from tools.mcp_session import MCPSessionPool, PooledMCPToolAdapter
+
+SERVER = str(Path(__file__).parent / "fakes" / "mcp_server.py")
+
+
+def _params(*args):
+    return StdioServerParameters(command=sys.executable, args=[SERVER, *args])
+
+
+async def _pid(server):
+    result = await server.call_tool("pid", {})
+    return int(result.content[0].text)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_servers_are_shared_per_parameters_and_reused_across_calls():
+    async def main():
+        pool = MCPSessionPool()
+        server = pool.get(_params())
+        assert pool.get(_params()) is server
+        assert pool.get(_params("--other")) is not server
+
+        tools = {tool.name: tool for tool in await server.list_tools()}
+        echo = PooledMCPToolAdapter(server, tools["echo"])
+        results = await asyncio.gather(
+            *(
+                echo.run_json({"text": f"call {n}"}, CancellationToken())
+                for n in range(5)
+            )
+        )
+        pids = {await _pid(server) for _ in range(3)}
+        await pool.close()
+        return results, pids, server.restarts
+
+    results, pids, restarts = asyncio.run(main())
+
+    assert [result[0].text for result in results] == [f"call {n}" for n in range(5)]
+    assert len(pids) == 1
+    assert restarts == 0
+
+
+def test_close_stops_the_servers_and_empties_the_pool():
+    async def main():
+        pool = MCPSessionPool()
+        server = pool.get(_params())
+        pid = await _pid(server)
+
+        await pool.close()
+        stopped = not _alive(pid)
+
+        fresh = pool.get(_params())
+        new_pid = await _pid(fresh)
+        await pool.close()
+        return fresh is not server, pid, new_pid, stopped
+
+    replaced, pid, new_pid, stopped = asyncio.run(main())
+
+    assert stopped
+    assert replaced
+    assert new_pid != pid
@@ -0,0 +1,149 @@
+import asyncio
+from types import SimpleNamespace
+
+from agents.model_context import (
+    SummarizingChatCompletionContext,
+    close_pending_tool_calls,
+)
+from autogen_core import FunctionCall
+from autogen_core.models import (
+    AssistantMessage,
+    FunctionExecutionResult,
+    FunctionExecutionResultMessage,
+    SystemMessage,
+    UserMessage,
+)
+
+
+class FakeClient:
+    def __init__(self, summary="the summary", error=None):
+        self.summary = summary
+        self.error = error
+        self.calls = []
+
+    async def create(self, messages):
+        self.calls.append(messages)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(content=self.summary)
+
+
+def _turn(n, result="x" * 40):
+    call = FunctionCall(id=f"c{n}", name="tool", arguments="{}")
+    return [
+        UserMessage(content=f"request {n}", source="user"),
+        AssistantMessage(content=[call], source="aura"),
+        FunctionExecutionResultMessage(
+            content=[FunctionExecutionResult(call_id=call.id, content=result)]
+        ),
+        AssistantMessage(content=f"answer {n}", source="aura"),
+    ]
+
+
+async def _add_turns(context, turns):
+    for n in turns:
+        for message in _turn(n):
+            await context.add_message(message)
+    if context._summarizing is not None:
+        await context._summarizing
+
+
+def _requests(messages):
+    return [m.content for m in messages if isinstance(m, UserMessage)]
+
+
+def test_results_of_past_turns_are_cut_and_the_current_turn_is_kept():
+    async def main():
+        context = SummarizingChatCompletionContext(FakeClient(), stale_result_chars=10)
+        for message in _turn(1, "a" * 50) + _turn(2, "b" * 50)[:3]:
+            await context.add_message(message)
+        return await context.get_messages()
+
+    messages = asyncio.run(main())
+    results = [
+        m.content[0].content
+        for m in messages
+        if isinstance(m, FunctionExecutionResultMessage)
+    ]
+    assert results == ["a" * 9 + "…", "b" * 50]
+
+
+def test_small_conversations_are_not_summarized():
+    client = FakeClient()
+
+    async def main():
+        context = SummarizingChatCompletionContext(client, recent_turns=2)
+        await _add_turns(context, range(5))
+        return await context.get_messages()
+
+    messages = asyncio.run(main())
+    assert client.calls == []
+    assert _requests(messages) == [f"request {n}" for n in range(5)]
+
+
+def test_older_turns_are_folded_into_the_summary():
+    client = FakeClient()
+
+    async def main():
+        context = SummarizingChatCompletionContext(
+            client, token_budget=150, recent_turns=2
+        )
+        await _add_turns(context, range(4))
+        return context, await context.get_messages()
+
+    context, messages = asyncio.run(main())
+    assert len(client.calls) == 1
+    assert "request 0" in client.calls[0][1].content
+    assert isinstance(messages[0], SystemMessage)
+    assert "the summary" in messages[0].content
+    assert _requests(messages) == ["request 2", "request 3"]
+    assert asyncio.run(context.save_state())["summary"] == "the summary"
+
+
+def test_failed_summary_keeps_the_turns_and_drops_the_oldest_from_the_prompt():
+    async def main():
+        context = SummarizingChatCompletionContext(
+            FakeClient(error=RuntimeError("down")), token_budget=150, recent_turns=2
+        )
+        await _add_turns(context, range(4))
+        return context, await context.get_messages()
+
+    context, messages = asyncio.run(main())
+    assert context._summary is None
+    assert len(context._messages) == 16
+    assert not isinstance(messages[0], SystemMessage)
+    assert _requests(messages)[-1] == "request 3"
+    assert len(_requests(messages)) < 4
+
+
+def test_summary_is_discarded_when_the_context_was_cleared():
+    async def main():
+        context = SummarizingChatCompletionContext(
+            FakeClient(), token_budget=150, recent_turns=2
+        )
+        for n in range(4):
+            for message in _turn(n):
+                await context.add_message(message)
+        summarizing = context._summarizing
+        await context.clear()
+        await asyncio.sleep(0)
+        return context, summarizing
+
+    context, summarizing = asyncio.run(main())
+    assert summarizing is not None and summarizing.cancelled()
+    assert context._summary is None
+    assert context._messages == []
+
+
+def test_pending_tool_calls_are_answered():
+    async def main():
+        context = SummarizingChatCompletionContext(FakeClient())
+        for message in _turn(1)[:2]:
+            await context.add_message(message)
+        await close_pending_tool_calls(context, "cancelled")
+        return await context.get_messages()
+
+    messages = asyncio.run(main())
+    assert messages[-1].content == [
+        FunctionExecutionResult(call_id="c1", content="cancelled")
+    ]
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import httplib2
+import pytest
+from fakes.google_http import fake_service
+from tools.gmail.modify_email_labels import BATCH_MODIFY_LIMIT, GmailModifyEmailLabels
+
+
+class BatchModifyHttp:
+    """Records batchModify bodies and fails the chunks starting with ``fail``."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.bodies = []
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        assert uri.split("?")[0].endswith("/messages/batchModify")
+        body = json.loads(body)
+        self.bodies.append(body)
+        status = "500" if body["ids"][0] in self.fail else "200"
+        return httplib2.Response({"status": status}), b"{}"
+
+
+def _tool(http):
+    return GmailModifyEmailLabels(api_resource=fake_service("gmail", "v1", http))
+
+
+IDS = [f"m{i}" for i in range(2 * BATCH_MODIFY_LIMIT + 500)]
+
+
+@pytest.mark.parametrize("run", ["sync", "async"])
+def test_many_ids_are_modified_in_chunks_of_the_batch_limit(run):
+    http = BatchModifyHttp()
+    tool = _tool(http)
+    args = dict(message_id="m0", message_ids=IDS + ["m1"], add_labels=["Label_1"])
+
+    if run == "sync":
+        output = tool._run(**args)
+    else:
+        output = asyncio.run(tool._arun(**args))
+
+    chunks = sorted((body["ids"] for body in http.bodies), key=lambda ids: ids[0])
+    assert [len(ids) for ids in chunks] == [1000, 1000, 500]
+    # Duplicates are sent once, in the order given
+    assert [i for ids in chunks for i in ids] == IDS
+    assert all(body["addLabelIds"] == ["Label_1"] for body in http.bodies)
+    assert (
+        output.splitlines()[0]
+        == f"Modified labels for {len(IDS)} of {len(IDS)} messages."
+    )
+
+
+def test_a_failed_chunk_is_reported_without_failing_the_others():
+    http = BatchModifyHttp(fail=[IDS[BATCH_MODIFY_LIMIT]])
+
+    lines = asyncio.run(_tool(http)._arun(message_ids=IDS, remove_labels=["UNREAD"]))
+    lines = lines.splitlines()
+
+    assert lines[0] == f"Modified labels for {len(IDS) - 1000} of {len(IDS)} messages."
+    assert lines[1].endswith("labels modified successfully.")
+    assert lines[2].startswith("Chunk 2/3 (1000 messages, m1000..m1999): failed - ")
+    assert lines[3].endswith("labels modified successfully.")
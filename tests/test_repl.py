@@ -0,0 +1,89 @@
+import asyncio
+import signal
+
+import main
+import pytest
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import TextMessage
+from autogen_core import CancellationToken
+from utils.repl import Interrupted, Interrupts
+from utils.startup import StartupTimer
+
+
+class ScriptedInput:
+    """Answers each prompt with the next line, then ends the input."""
+
+    def __init__(self, *lines):
+        self.lines = list(lines)
+
+    async def __call__(self, prompt=""):
+        if not self.lines:
+            raise EOFError()
+        return self.lines.pop(0)
+
+
+class HangingAgent:
+    """Agent whose first turn runs until it is cancelled by Ctrl-C."""
+
+    def __init__(self):
+        self.turns = []
+        self.tokens = []
+        self.closed_turns = 0
+
+    async def on_messages_stream(self, messages, cancellation_token):
+        self.turns.append(messages[0].content)
+        self.tokens.append(cancellation_token)
+        if len(self.turns) == 1:
+            signal.raise_signal(signal.SIGINT)
+            await asyncio.Event().wait()
+        answer = TextMessage(source="aura", content=f"Answer to {messages[0].content}")
+        yield Response(chat_message=answer)
+
+    async def close_cancelled_turn(self):
+        self.closed_turns += 1
+
+
+def test_ctrl_c_cancels_the_running_turn_and_the_repl_keeps_going(monkeypatch, capsys):
+    agent = HangingAgent()
+    monkeypatch.setattr(main, "AsyncInput", lambda: ScriptedInput("slow", "fast"))
+
+    async def chat():
+        async def build():
+            return agent
+
+        await main.chat(asyncio.ensure_future(build()), StartupTimer())
+
+    asyncio.run(chat())
+
+    assert agent.turns == ["slow", "fast"]
+    assert agent.tokens[0].is_cancelled()
+    assert not agent.tokens[1].is_cancelled()
+    assert agent.closed_turns == 1
+    output = capsys.readouterr().out
+    assert "Turn cancelled." in output
+    assert "Answer to fast" in output
+    assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+
+
+def test_ctrl_c_outside_of_run_is_ignored():
+    async def main_loop():
+        with Interrupts() as interrupts:
+            signal.raise_signal(signal.SIGINT)
+            await asyncio.sleep(0)
+            return await interrupts.run(asyncio.sleep(0, "done"))
+
+    assert asyncio.run(main_loop()) == "done"
+
+
+def test_interrupted_work_cancels_its_token():
+    async def main_loop():
+        token = CancellationToken()
+        with Interrupts() as interrupts:
+            asyncio.get_running_loop().call_later(
+                0.01, signal.raise_signal, signal.SIGINT
+            )
+            with pytest.raises(Interrupted):
+                await interrupts.run(asyncio.Event().wait(), token)
+        return token
+
+    assert asyncio.run(main_loop()).is_cancelled()
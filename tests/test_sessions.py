@@ -0,0 +1,205 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import TextMessage
+from server.app import create_app
+from server.sessions import ServerBusy, SessionBusy, SessionManager, SessionNotFound
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def manager(monkeypatch, clock):
+    monkeypatch.setattr("agents.aura.create_agent", lambda backend: object())
+    return SessionManager(
+        backend=None,
+        max_sessions=3,
+        max_running_turns=1,
+        max_queued_turns=1,
+        idle_timeout=60,
+        clock=clock,
+    )
+
+
+def test_session_runs_one_turn_at_a_time(manager):
+    session = manager.create()
+
+    async def main():
+        async with manager.turn(session):
+            assert session.busy
+            with pytest.raises(SessionBusy):
+                async with manager.turn(session):
+                    pass
+        async with manager.turn(session):
+            pass
+
+    asyncio.run(main())
+    assert not session.busy
+    assert manager.stats() == {"sessions": 1, "running_turns": 0, "queued_turns": 0}
+
+
+def test_turns_wait_for_a_slot_and_beyond_the_queue_are_refused(manager):
+    first, second, third = manager.create(), manager.create(), manager.create()
+
+    async def main():
+        running = asyncio.Event()
+        release = asyncio.Event()
+        order = []
+
+        async def turn(session):
+            async with manager.turn(session):
+                order.append(session)
+                running.set()
+                await release.wait()
+
+        first_turn = asyncio.create_task(turn(first))
+        await running.wait()
+        queued_turn = asyncio.create_task(turn(second))
+        await asyncio.sleep(0)
+        assert manager.stats() == {"sessions": 3, "running_turns": 1, "queued_turns": 1}
+
+        with pytest.raises(ServerBusy):
+            async with manager.turn(third):
+                pass
+        assert not third.busy
+
+        release.set()
+        await asyncio.gather(first_turn, queued_turn)
+        return order
+
+    assert asyncio.run(main()) == [first, second]
+    assert manager.stats()["queued_turns"] == 0
+
+
+def test_idle_sessions_make_room_for_new_ones(manager, clock):
+    sessions = [manager.create() for _ in range(3)]
+    with pytest.raises(ServerBusy):
+        manager.create()
+
+    clock.now = 30
+
+    async def use():
+        async with manager.turn(sessions[0]):
+            pass
+
+    asyncio.run(use())
+    clock.now = 61
+    manager.create()
+
+    assert manager.get(sessions[0].id) is sessions[0]
+    for idle in sessions[1:]:
+        with pytest.raises(SessionNotFound):
+            manager.get(idle.id)
+
+
+def test_busy_sessions_are_never_closed_for_being_idle(manager, clock):
+    sessions = [manager.create() for _ in range(3)]
+
+    async def main():
+        async with manager.turn(sessions[0]) as token:
+            clock.now = 1000
+            manager.create()
+            assert manager.get(sessions[0].id) is sessions[0]
+            manager.close(sessions[0].id)
+            return token
+
+    token = asyncio.run(main())
+    assert token.is_cancelled()
+    with pytest.raises(SessionNotFound):
+        manager.get(sessions[0].id)
+
+
+def test_cancel_only_reports_running_turns(manager):
+    session = manager.create()
+    assert not session.cancel()
+
+    async def main():
+        async with manager.turn(session) as token:
+            assert session.cancel()
+            return token
+
+    assert asyncio.run(main()).is_cancelled()
+
+
+class StreamingAgent:
+    """Agent that streams a message, then waits for ``resume`` to stream more."""
+
+    def __init__(self):
+        self.resume = asyncio.Event()
+        self.closed_streams = 0
+        self.closed_turns = 0
+
+    async def on_messages_stream(self, messages, cancellation_token):
+        content = messages[0].content
+        try:
+            yield TextMessage(source="aura", content=f"Working on {content}")
+            await self.resume.wait()
+            for n in range(3):
+                yield TextMessage(source="aura", content=f"Step {n}")
+            yield Response(chat_message=TextMessage(source="aura", content="Done."))
+        finally:
+            self.closed_streams += 1
+
+    async def close_cancelled_turn(self):
+        self.closed_turns += 1
+
+
+class KeepRunningServer(TestServer):
+    """Test server that, like ``web.run_app``, lets handlers run on after a disconnect.
+
+    The next write of such a handler fails with ``ConnectionResetError``.
+    """
+
+    async def _make_runner(self, **kwargs):
+        return await super()._make_runner(**{**kwargs, "handler_cancellation": False})
+
+
+@pytest.mark.parametrize("server", [TestServer, KeepRunningServer])
+def test_a_client_leaving_mid_turn_frees_the_session(monkeypatch, manager, server):
+    agent = StreamingAgent()
+    monkeypatch.setattr("agents.aura.create_agent", lambda backend: agent)
+    session = manager.create()
+
+    async def main():
+        async with TestClient(server(create_app(manager))) as client:
+            url = f"/sessions/{session.id}/messages"
+            response = await client.post(url, json={"content": "first"})
+            first = json.loads(await response.content.readline())
+            assert first["content"] == "Working on first"
+
+            # Drop the connection, then let the turn write again
+            response.close()
+            await asyncio.sleep(0.1)
+            agent.resume.set()
+            for _ in range(50):
+                if not session.busy:
+                    break
+                await asyncio.sleep(0.02)
+
+            response = await client.post(url, json={"content": "second"})
+            lines = [json.loads(line) for line in (await response.text()).splitlines()]
+            return response.status, lines
+
+    status, lines = asyncio.run(main())
+
+    assert status == 200
+    assert lines[0]["content"] == "Working on second"
+    assert lines[-1]["type"] == "Response"
+    assert lines[-1]["chat_message"]["content"] == "Done."
+    assert agent.closed_streams == 2
+    assert agent.closed_turns == 1
+    assert not session.busy
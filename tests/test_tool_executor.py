@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from agents.tool_executor import ConcurrentToolAgent, ToolCallExecutor
+from autogen_core import CancellationToken, FunctionCall
+from autogen_core.tools import FunctionTool
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+
+def _run_all(executor, calls):
+    """Submit ``(tool name, coroutine function)`` pairs at once, like the agent."""
+
+    async def main():
+        return await asyncio.gather(*(executor.run(name, call) for name, call in calls))
+
+    return asyncio.run(main())
+
+
+def _recording(log, name, delay):
+    async def call():
+        log.append(f"{name} start")
+        await asyncio.sleep(delay)
+        log.append(f"{name} end")
+        return name
+
+    return call
+
+
+def test_results_come_back_in_call_order():
+    log = []
+    executor = ToolCallExecutor()
+    calls = [("read", _recording(log, f"c{n}", 0.03 - n * 0.01)) for n in range(3)]
+
+    assert _run_all(executor, calls) == ["c0", "c1", "c2"]
+    # The calls ran concurrently, so the shortest finished first
+    assert log[:3] == ["c0 start", "c1 start", "c2 start"]
+    assert log[3] == "c2 end"
+
+
+def test_writes_to_one_resource_run_one_at_a_time_in_submission_order():
+    log = []
+    executor = ToolCallExecutor(serialized={"create": "labels", "delete": "labels"})
+    calls = [
+        ("create", _recording(log, "create", 0.03)),
+        ("delete", _recording(log, "delete", 0.0)),
+        ("read", _recording(log, "read", 0.01)),
+    ]
+
+    _run_all(executor, calls)
+
+    assert log.index("create end") < log.index("delete start")
+    # Calls of other tools are not held back by the ordered writes
+    assert log.index("read end") < log.index("create end")
+
+
+def test_concurrency_is_bounded():
+    running, peak = 0, 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    _run_all(ToolCallExecutor(max_concurrency=2), [("read", call)] * 6)
+    assert peak == 2
+
+
+def test_slow_calls_time_out():
+    async def call():
+        await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError, match="'slow' did not finish within 0.01 seconds"):
+        _run_all(ToolCallExecutor(timeout=0.01), [("slow", call)])
+
+
+def test_agent_reports_a_timed_out_call_as_an_error_result():
+    async def slow() -> str:
+        await asyncio.sleep(1)
+        return "done"
+
+    async def main():
+        client = ReplayChatCompletionClient(["answer"])
+        client._model_info["function_calling"] = True
+        agent = ConcurrentToolAgent(
+            "aura",
+            model_client=client,
+            tools=[FunctionTool(slow, description="Slow tool.")],
+            tool_executor=ToolCallExecutor(timeout=0.01),
+        )
+        call = FunctionCall(id="c1", name="slow", arguments="{}")
+        return await agent._execute_tool_call(call, CancellationToken())
+
+    result = asyncio.run(main())
+    assert result.call_id == "c1"
+    assert result.content.startswith("Error: The tool 'slow' did not finish")
@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import (
+    TextMessage,
+    ToolCallExecutionEvent,
+    ToolCallRequestEvent,
+)
+from autogen_core import FunctionCall
+from autogen_core.models import FunctionExecutionResult, RequestUsage
+from utils import console
+from utils.turn_stats import TurnRecorder
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _usage(prompt, completion):
+    return RequestUsage(prompt_tokens=prompt, completion_tokens=completion)
+
+
+def _turn():
+    """``(time, message)`` pairs of a turn with two tool rounds."""
+    first = ToolCallRequestEvent(
+        source="aura",
+        content=[
+            FunctionCall(id="1", name="search", arguments="{}"),
+            FunctionCall(id="2", name="list_events", arguments="{}"),
+        ],
+        models_usage=_usage(100, 10),
+    )
+    first_results = ToolCallExecutionEvent(
+        source="aura",
+        content=[
+            FunctionExecutionResult(call_id="1", content="mail"),
+            FunctionExecutionResult(call_id="2", content="events"),
+        ],
+    )
+    second = ToolCallRequestEvent(
+        source="aura",
+        content=[FunctionCall(id="3", name="search", arguments="{}")],
+        models_usage=_usage(200, 5),
+    )
+    second_results = ToolCallExecutionEvent(
+        source="aura", content=[FunctionExecutionResult(call_id="3", content="mail")]
+    )
+    answer = TextMessage(source="aura", content="Done.", models_usage=_usage(300, 20))
+    inner = [first, first_results, second, second_results]
+    return [
+        (1.0, first),
+        (4.0, first_results),
+        (4.5, second),
+        (5.5, second_results),
+        (7.0, Response(chat_message=answer, inner_messages=inner)),
+    ]
+
+
+def test_tool_calls_are_counted_and_timed_per_tool():
+    clock = FakeClock()
+    recorder = TurnRecorder(clock)
+    for now, message in _turn():
+        clock.now = now
+        recorder.record(message)
+    stats = recorder.finish()
+
+    assert stats.duration == 7.0
+    assert stats.first_message == 1.0
+    assert stats.model_time == 1.0 + 0.5 + 1.5
+    assert stats.tool_time == 3.0 + 1.0
+    assert (stats.prompt_tokens, stats.completion_tokens) == (600, 35)
+    assert stats.messages == 4
+    search, list_events = stats.tools["search"], stats.tools["list_events"]
+    assert (search.calls, search.total, search.max) == (2, 4.0, 3.0)
+    # Parallel calls each take the latency of their batch
+    assert (list_events.calls, list_events.total) == (1, 3.0)
+
+
+def test_the_summary_lists_every_tool_and_the_stats_file_gets_a_line(
+    tmp_path, monkeypatch, capsys
+):
+    # Keep the summary on one line
+    monkeypatch.setenv("COLUMNS", "200")
+    clock = FakeClock()
+    monkeypatch.setattr(console, "TurnRecorder", lambda: TurnRecorder(clock))
+
+    async def stream():
+        for now, message in _turn():
+            clock.now = now
+            yield message
+
+    stats_file = tmp_path / "stats.jsonl"
+    asyncio.run(console.RichConsole(stream(), stats_file=str(stats_file)))
+
+    output = capsys.readouterr().out
+    assert "Tokens: 600/35" in output
+    assert "Tools: 4.00s" in output
+    rows = [line.split() for line in output.splitlines()]
+    assert ["search", "2", "4.00s", "3.00s"] in rows
+    assert ["list_events", "1", "3.00s", "3.00s"] in rows
+    (line,) = stats_file.read_text().splitlines()
+    assert json.loads(line)["tools"]["search"] == {"calls": 2, "total": 4.0, "max": 3.0}